@@ -17,6 +17,16 @@ import urllib.request
 import urllib.error
 import shutil
 
+# Shared helpers from src/imports
+IMPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "imports")
+if IMPORTS_DIR not in sys.path:
+    sys.path.append(IMPORTS_DIR)
+
+from roiInference import RoiHandTracker
+from gestureEngine import HandFeatures, HoldTimers, classify, pinkies_touching, THUMB, INDEX
+from adaptiveRate import AdaptiveRate, GRAB_FAILURE_LIMIT
+from displayThrottle import DisplayThrottle
+
 # ----------------------------- #
 #       CONFIGURATION           #
 # ----------------------------- #
@@ -127,106 +137,6 @@ def get_fingertips_from_landmarks(hand_landmarks) -> list:
         return [{"x": 0.5, "y": 0.5, "z": 0.0} for _ in range(5)]
 
 
-def get_finger_positions(hand_landmarks) -> dict:
-    if not hand_landmarks:
-        return None
-    fingers = {
-        "thumb": [hand_landmarks.landmark[1], hand_landmarks.landmark[2],
-                  hand_landmarks.landmark[3], hand_landmarks.landmark[4]],
-        "index": [hand_landmarks.landmark[5], hand_landmarks.landmark[6],
-                  hand_landmarks.landmark[7], hand_landmarks.landmark[8]],
-        "middle": [hand_landmarks.landmark[9], hand_landmarks.landmark[10],
-                   hand_landmarks.landmark[11], hand_landmarks.landmark[12]],
-        "ring": [hand_landmarks.landmark[13], hand_landmarks.landmark[14],
-                 hand_landmarks.landmark[15], hand_landmarks.landmark[16]],
-        "pinky": [hand_landmarks.landmark[17], hand_landmarks.landmark[18],
-                  hand_landmarks.landmark[19], hand_landmarks.landmark[20]],
-        "wrist": hand_landmarks.landmark[0]
-    }
-    return fingers
-
-
-def is_thumb_pinky_touching(fingers: dict) -> bool:
-    if not fingers:
-        return False
-    thumb_tip = fingers["thumb"][3]
-    pinky_tip = fingers["pinky"][3]
-    distance = np.sqrt((thumb_tip.x - pinky_tip.x) ** 2 +
-                       (thumb_tip.y - pinky_tip.y) ** 2 +
-                       (thumb_tip.z - pinky_tip.z) ** 2)
-    return distance < 0.05
-
-
-def is_thumb_index_touching(fingers: dict) -> bool:
-    if not fingers:
-        return False
-    thumb_tip = fingers["thumb"][3]
-    index_tip = fingers["index"][3]
-    distance = np.sqrt((thumb_tip.x - index_tip.x) ** 2 +
-                       (thumb_tip.y - index_tip.y) ** 2 +
-                       (thumb_tip.z - index_tip.z) ** 2)
-    return distance < 0.05
-
-
-def is_thumb_middle_touching(fingers: dict) -> bool:
-    if not fingers:
-        return False
-    thumb_tip = fingers["thumb"][3]
-    middle_tip = fingers["middle"][3]
-    distance = np.sqrt((thumb_tip.x - middle_tip.x) ** 2 +
-                       (thumb_tip.y - middle_tip.y) ** 2 +
-                       (thumb_tip.z - middle_tip.z) ** 2)
-    result = distance < 0.08
-    if result:
-        logging.debug(f"Thumb-middle finger touching detected! Distance: {distance:.4f}")
-    return result
-
-
-def is_thumb_ring_touching(fingers: dict) -> bool:
-    if not fingers:
-        return False
-    thumb_tip = fingers["thumb"][3]
-    ring_tip = fingers["ring"][3]
-    distance = np.sqrt((thumb_tip.x - ring_tip.x) ** 2 +
-                       (thumb_tip.y - ring_tip.y) ** 2 +
-                       (thumb_tip.z - ring_tip.z) ** 2)
-    return distance < 0.05
-
-
-def is_closed_fist(fingers: dict) -> bool:
-    if not fingers:
-        return False
-    for finger_name in ["index", "middle", "ring", "pinky"]:
-        base_knuckle = fingers[finger_name][0]
-        fingertip = fingers[finger_name][3]
-        if not (fingertip.y > base_knuckle.y):
-            return False
-    return True
-
-
-def get_fingers_pointing_up(fingers: dict) -> bool:
-    if not fingers:
-        return False
-    wrist = fingers["wrist"]
-    for finger_name in ["index", "middle", "ring", "pinky"]:
-        fingertip = fingers[finger_name][3]
-        base = fingers[finger_name][0]
-        if fingertip.y > wrist.y or fingertip.y > base.y:
-            return False
-    return True
-
-
-def calculate_wrist_rotation(fingers: dict) -> float:
-    if not fingers:
-        return 0.0
-    wrist = fingers["wrist"]
-    middle_mcp = fingers["middle"][0]
-    dx = middle_mcp.x - wrist.x
-    dy = middle_mcp.y - wrist.y
-    angle = np.degrees(np.arctan2(dy, dx))
-    return angle
-
-
 def calculate_rotation_speed(wrist_angle: float) -> float:
     neutral_zone = 5.0
     max_angle = 40.0
@@ -240,26 +150,6 @@ def calculate_rotation_speed(wrist_angle: float) -> float:
     return normalized * max_speed
 
 
-def determine_scale_axis(fingers: dict) -> str:
-    if not fingers:
-        return "XYZ"
-    wrist = fingers["wrist"]
-    middle_tip = fingers["middle"][3]
-    dx = middle_tip.x - wrist.x
-    dy = middle_tip.y - wrist.y
-    dz = middle_tip.z - wrist.z
-    abs_dx, abs_dy, abs_dz = abs(dx), abs(dy), abs(dz)
-    max_d = max(abs_dx, abs_dy, abs_dz)
-    if max_d < 0.1:
-        return "XYZ"
-    if abs_dx == max_d:
-        return "X"
-    elif abs_dy == max_d:
-        return "Y"
-    else:
-        return "Z"
-
-
 def pad_fingertips(fingertips: list, target_count: int = 5, default: dict = None) -> list:
     if not fingertips:
         if default:
@@ -463,20 +353,6 @@ def check_voice_commands() -> str:
     # return ""
 
 
-def is_left_and_right_pinky_touching(left_fingers, right_fingers):
-    if not left_fingers or not right_fingers:
-        return False
-    try:
-        left_pinky_tip = left_fingers["pinky"][3]
-        right_pinky_tip = right_fingers["pinky"][3]
-        distance = np.sqrt((left_pinky_tip.x - right_pinky_tip.x) ** 2 +
-                           (left_pinky_tip.y - right_pinky_tip.y) ** 2 +
-                           (left_pinky_tip.z - right_pinky_tip.z) ** 2)
-        return distance < 0.08
-    except:
-        return False
-
-
 def apply_sculpt_brush(mesh_obj, fingertips, brush_type="GRAB"):
     """Map finger movements to sculpt brushes directly"""
     # This function is only a placeholder in UI
@@ -953,8 +829,8 @@ left_hand_landmarks = None
 right_hand_landmarks = None
 left_fingertips = None
 right_fingertips = None
-left_fingers = None
-right_fingers = None
+left_features = None
+right_features = None
 
 anchors = []
 anchor_in_progress = False
@@ -963,11 +839,9 @@ anchor_gesture_start_time = None
 anchor_creation_confirmed = False
 
 left_fist_held_start = None
-right_deform_start_time = None
-right_rotate_start_time = None
-right_scale_start_time = None
-right_create_start_time = None
 left_remesh_start_time = None
+right_holds = HoldTimers()
+left_holds = HoldTimers()
 
 scale_axis = "XYZ"
 scale_value = 1.0
@@ -980,6 +854,10 @@ rotation_speed = 0.0
 current_remesh_index = 0
 remesh_last_toggle_time = time.time()  # Initialize to current time
 
+# Running counts of undo/redo gestures; Blender applies the difference since the last frame it read
+undo_count = 0
+redo_count = 0
+
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
@@ -989,6 +867,19 @@ hands = mp_hands.Hands(static_image_mode=False,
                        min_detection_confidence=0.7,
                        min_tracking_confidence=0.5)
 
+# Hand crops get their own instance, so each tracking graph only sees one kind of input
+crop_hands = mp_hands.Hands(static_image_mode=False,
+                            max_num_hands=2,
+                            min_detection_confidence=0.7,
+                            min_tracking_confidence=0.5)
+
+# Inference runs on a small crop around the hands; full-frame search only when they are lost
+hand_roi = RoiHandTracker(hands, max_hands=2, crop_hands=crop_hands)
+# Without hands in view the loop drops to a few frames per second to leave CPU for Blender
+frame_rate = AdaptiveRate(idle_fps=10.0)
+# Drawing and imshow: every frame, a throttled preview or headless (VIBE_DISPLAY=full/preview/none)
+display = DisplayThrottle()
+
 # Commenting out Whisper model loading
 # logging.info("Loading Whisper model for voice transcription...")
 # voice_model = whisper.load_model("base")
@@ -1029,46 +920,67 @@ hands = mp_hands.Hands(static_image_mode=False,
 
 def main() -> None:
     global global_command, current_gesture, last_detected_gesture, gesture_start_time, command_set_time
-    global left_hand_landmarks, right_hand_landmarks, left_fingertips, right_fingertips, left_fingers, right_fingers
+    global left_hand_landmarks, right_hand_landmarks, left_fingertips, right_fingertips, left_features, right_features
     global anchor_gesture_start_time, anchor_creation_confirmed, anchor_in_progress, current_anchor
-    global left_fist_held_start, right_deform_start_time, rotation_reference, rotation_value, rotation_speed
-    global right_rotate_start_time, right_scale_start_time, right_create_start_time, left_remesh_start_time
+    global left_fist_held_start, rotation_reference, rotation_value, rotation_speed, left_remesh_start_time
     global scale_axis, scale_value, current_remesh_index, right_fist_start_time, deform_mode_active
-    global remesh_last_toggle_time, text_selector_mode
+    global remesh_last_toggle_time, text_selector_mode, undo_count, redo_count
 
     cap = cv2.VideoCapture(0)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
     native_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     native_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    cv2.namedWindow("VIBE - Hand Gesture Control", cv2.WINDOW_NORMAL)
-    cv2.resizeWindow("VIBE - Hand Gesture Control", native_width, native_height)
+    if not display.headless:
+        cv2.namedWindow("VIBE - Hand Gesture Control", cv2.WINDOW_NORMAL)
+        cv2.resizeWindow("VIBE - Hand Gesture Control", native_width, native_height)
     logging.info(f"Using camera resolution: {native_width}x{native_height}")
 
     logging.info("Running hand gesture recognition. Press 'q' to quit...")
     last_frame_time = time.time()
+    grab_failures = 0
 
     while True:
+        if not frame_rate.due():
+            # Idle: drain the camera buffer without decoding and keep the window responsive
+            if cap.grab():
+                grab_failures = 0
+                wait_ms = frame_rate.wait_ms()
+            else:
+                grab_failures += 1
+                if grab_failures >= GRAB_FAILURE_LIMIT:
+                    logging.error("Camera stopped delivering frames. Terminating.")
+                    break
+                # A lost camera fails at once; wait out the idle interval instead of spinning
+                wait_ms = max(int(frame_rate.remaining() * 1000), 1)
+            if (cv2.waitKey(wait_ms) & 0xFF) in (ord('q'), 27):
+                logging.info("Exit key pressed. Terminating.")
+                break
+            continue
+
         current_time = time.time()
-        delta_time = current_time - last_frame_time
+        # Capped so waking up from idle does not turn the gap into one big rotation step
+        delta_time = min(current_time - last_frame_time, 0.1)
         last_frame_time = current_time
 
         ret, frame = cap.read()
         if not ret:
             break
+        frame_time = time.time()
 
         frame = cv2.flip(frame, 1)
-        create_ui_overlay(frame)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_frame)
+        # Detect before drawing the overlay so the model only sees the camera image
+        results = hand_roi.detect(frame)
+        frame_rate.update(bool(results.multi_hand_landmarks))
 
         # Reset per-frame variables
         left_hand_landmarks = None
         right_hand_landmarks = None
         left_fingertips = None
         right_fingertips = None
-        left_fingers = None
-        right_fingers = None
+        left_features = None
+        right_features = None
+        seen_hands = []
         current_gesture = "none"
 
         if results.multi_hand_landmarks:
@@ -1077,23 +989,17 @@ def main() -> None:
                 if (results.multi_handedness and len(results.multi_handedness) > hand_idx):
                     handedness = results.multi_handedness[hand_idx].classification[0]
                     hand_label = handedness.label
-                color = (RIGHT_HAND_COLOR if hand_label == "Right" else LEFT_HAND_COLOR)
-                drawing_spec = mp_drawing.DrawingSpec(color=(color[2], color[1], color[0]),
-                                                      thickness=3, circle_radius=4)
-                connection_spec = mp_drawing.DrawingSpec(color=(color[2], color[1], color[0]),
-                                                         thickness=2)
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                          drawing_spec, connection_spec)
-                draw_hand_boundary(frame, hand_landmarks, hand_label)
-                finger_positions = get_finger_positions(hand_landmarks)
+                seen_hands.append((hand_landmarks, hand_label))
+                # One landmark array per hand; all gesture features come from it
+                features = HandFeatures.from_landmarks(hand_landmarks)
                 if hand_label == "Left":
                     left_hand_landmarks = hand_landmarks
                     left_fingertips = get_fingertips_from_landmarks(hand_landmarks)
-                    left_fingers = finger_positions
+                    left_features = features
                 else:
                     right_hand_landmarks = hand_landmarks
                     right_fingertips = get_fingertips_from_landmarks(hand_landmarks)
-                    right_fingers = finger_positions
+                    right_features = features
 
         now = time.time()
         # Comment out periodic voice command checking
@@ -1103,12 +1009,17 @@ def main() -> None:
         # -----------------------------
         #   GESTURE DETECTION
         # -----------------------------
-        if right_fingers:
+        # Evaluate every predicate once and advance all hold timers in one pass
+        right_gestures = classify(right_features)
+        left_gestures = classify(left_features)
+        if right_features:
+            right_holds.update(right_gestures, now)
+        left_released = left_holds.update(left_gestures, now) if left_features else []
+
+        if right_features:
             # Deform
-            if is_thumb_index_touching(right_fingers):
-                if right_deform_start_time is None:
-                    right_deform_start_time = now
-                if now - right_deform_start_time >= GESTURE_HOLD_TIME:
+            if right_gestures["thumb_index"]:
+                if right_holds.held("thumb_index", now) >= GESTURE_HOLD_TIME:
                     if now - command_set_time >= TOGGLE_COOLDOWN:
                         if global_command != "deform":
                             global_command = "deform"
@@ -1119,21 +1030,17 @@ def main() -> None:
                             logging.debug(f"Deform mode {'ACTIVATED' if deform_mode_active else 'DEACTIVATED'}")
                         command_set_time = now
                 current_gesture = "deform"
-            else:
-                right_deform_start_time = None
 
             # Rotate
-            if is_thumb_middle_touching(right_fingers):
-                if right_rotate_start_time is None:
-                    right_rotate_start_time = now
-                if now - right_rotate_start_time >= GESTURE_HOLD_TIME:
+            if right_gestures["thumb_middle"]:
+                if right_holds.held("thumb_middle", now) >= GESTURE_HOLD_TIME:
                     if global_command != "rotate" and now - command_set_time >= TOGGLE_COOLDOWN:
                         global_command = "rotate"
                         command_set_time = now
                         logging.debug("Mode set to: ROTATE")
                 current_gesture = "rotate"
                 if global_command == "rotate":
-                    current_rotation = calculate_wrist_rotation(right_fingers)
+                    current_rotation = right_features.wrist_rotation()
                     if rotation_reference is None:
                         rotation_reference = current_rotation
                     rotation_diff = current_rotation - rotation_reference
@@ -1144,102 +1051,91 @@ def main() -> None:
                     rotation_speed = calculate_rotation_speed(rotation_diff)
                     if rotation_speed != 0:
                         rotation_value += rotation_speed * delta_time
-            else:
-                right_rotate_start_time = None
 
             # Scale
-            if is_thumb_ring_touching(right_fingers):
-                if right_scale_start_time is None:
-                    right_scale_start_time = now
-                if now - right_scale_start_time >= GESTURE_HOLD_TIME:
+            if right_gestures["thumb_ring"]:
+                if right_holds.held("thumb_ring", now) >= GESTURE_HOLD_TIME:
                     if global_command != "scale" and now - command_set_time >= TOGGLE_COOLDOWN:
                         global_command = "scale"
-                        scale_axis = determine_scale_axis(right_fingers)
+                        scale_axis = right_features.scale_axis()
                         command_set_time = now
                         logging.debug(f"Mode set to: SCALE (axis: {scale_axis})")
                 current_gesture = "scale"
-            else:
-                right_scale_start_time = None
 
             # Create
-            if is_thumb_pinky_touching(right_fingers):
-                if right_create_start_time is None:
-                    right_create_start_time = now
-                if now - right_create_start_time >= GESTURE_HOLD_TIME:
+            if right_gestures["thumb_pinky"]:
+                if right_holds.held("thumb_pinky", now) >= GESTURE_HOLD_TIME:
                     if global_command != "create" and now - command_set_time >= TOGGLE_COOLDOWN:
                         global_command = "create"
                         command_set_time = now
                         logging.debug("Mode set to: CREATE")
                 current_gesture = "create"
-            else:
-                right_create_start_time = None
 
-            if is_closed_fist(right_fingers):
-                if right_fist_start_time is None:
-                    right_fist_start_time = now
-                if now - right_fist_start_time >= GESTURE_HOLD_TIME:
+            if right_gestures["fist"]:
+                if right_holds.held("fist", now) >= GESTURE_HOLD_TIME:
                     if global_command != "render" and now - command_set_time >= TOGGLE_COOLDOWN:
                         global_command = "render"
                         command_set_time = now
                         logging.debug("Mode set to: RENDER")
                 current_gesture = "render"
-            else:
-                right_fist_start_time = None
 
-        if left_fingers:
+        if left_features:
             try:
                 # Anchor
-                if is_thumb_index_touching(left_fingers):
-                    if last_detected_gesture != "anchor":
-                        anchor_gesture_start_time = now
-                    if now - anchor_gesture_start_time >= GESTURE_HOLD_TIME:
+                if left_gestures["thumb_index"]:
+                    if left_holds.held("thumb_index", now) >= GESTURE_HOLD_TIME:
                         if global_command != "anchor" and now - command_set_time >= TOGGLE_COOLDOWN:
                             global_command = "anchor"
                             command_set_time = now
                             logging.debug("Mode set to: ANCHOR")
                     current_gesture = "anchor"
-                    thumb_tip = left_fingers["thumb"][3]
-                    index_tip = left_fingers["index"][3]
-                    anchor_position = {"x": (thumb_tip.x + index_tip.x) / 2,
-                                       "y": (thumb_tip.y + index_tip.y) / 2,
-                                       "z": (thumb_tip.z + index_tip.z) / 2}
+                    anchor_position = left_features.midpoint(THUMB, INDEX)
                     if global_command == "anchor":
                         update_anchor_position(anchor_position)
                 else:
-                    if anchor_gesture_start_time is not None:
-                        anchor_gesture_start_time = None
+                    if "thumb_index" in left_released:
                         logging.debug("Left hand anchor gesture released")
                     if global_command == "anchor" and current_anchor:
                         add_anchor_to_list(current_anchor)
                         update_anchor_position(None)
                         logging.debug("Anchor finalized")
 
-                # Remesh - improved detection and feedback
-                if is_thumb_middle_touching(left_fingers):
-                    logging.debug(f"Left hand remesh gesture detected - thumb and middle finger touch")
-                    if left_remesh_start_time is None:
-                        left_remesh_start_time = now
-                        logging.debug("Left hand remesh gesture detected, started timing")
-                    elif now - left_remesh_start_time >= GESTURE_HOLD_TIME:
-                        logging.debug(f"Remesh gesture held for {now - left_remesh_start_time:.2f} seconds, cycling remesh type")
+                # Remesh - cycles once per hold period while held
+                if left_gestures["thumb_middle"]:
+                    if left_holds.held("thumb_middle", now) >= GESTURE_HOLD_TIME:
+                        logging.debug(f"Remesh gesture held for {left_holds.held('thumb_middle', now):.2f} seconds, cycling remesh type")
                         new_type = cycle_remesh_type()  # This will handle the cooldown internally
                         logging.info(f"Cycled remesh type to: {new_type}")
-                        left_remesh_start_time = now  # Reset timer after cycling
+                        left_holds.restart("thumb_middle", now)  # Reset timer after cycling
                     current_gesture = "remesh"
-                else:
-                    left_remesh_start_time = None
-
-                if is_closed_fist(left_fingers):
-                    if left_fist_held_start is None:
-                        left_fist_held_start = now
-                        logging.debug("Left hand clear gesture detected, started timing")
-                    elif now - left_fist_held_start >= CLEAR_HOLD_TIME:
-                        if anchors:
-                            logging.debug("Clearing anchors due to closed fist gesture.")
-                            clear_anchors()
-                            left_fist_held_start = now
-                else:
-                    left_fist_held_start = None
+
+                # Undo / redo - one step per hold period while held. A fist or a loose
+                # thumb-middle pinch easily brings the thumb near the ring finger too,
+                # so they only count while no other left-hand gesture is shown
+                left_shown = [name for name in ("fist", "thumb_index", "thumb_middle", "thumb_ring", "thumb_pinky")
+                              if left_gestures[name]]
+                for name in ("thumb_ring", "thumb_pinky"):
+                    if left_gestures[name] and left_shown != [name]:
+                        # Blocked: the hold only counts from when the gesture stands alone
+                        left_holds.restart(name, now)
+                if left_shown == ["thumb_ring"]:
+                    if left_holds.held("thumb_ring", now) >= GESTURE_HOLD_TIME:
+                        undo_count += 1
+                        logging.info("Undo requested")
+                        left_holds.restart("thumb_ring", now)
+                    current_gesture = "undo"
+                if left_shown == ["thumb_pinky"]:
+                    if left_holds.held("thumb_pinky", now) >= GESTURE_HOLD_TIME:
+                        redo_count += 1
+                        logging.info("Redo requested")
+                        left_holds.restart("thumb_pinky", now)
+                    current_gesture = "redo"
+
+                if left_gestures["fist"]:
+                    if left_holds.held("fist", now) >= CLEAR_HOLD_TIME and anchors:
+                        logging.debug("Clearing anchors due to closed fist gesture.")
+                        clear_anchors()
+                        left_holds.restart("fist", now)
 
             except Exception as e:
                 logging.error(f"Error in left hand gesture processing: {e}")
@@ -1247,70 +1143,19 @@ def main() -> None:
 
         last_detected_gesture = current_gesture
 
-        if left_fingers and right_fingers and is_left_and_right_pinky_touching(left_fingers, right_fingers):
+        # Hold start times for the progress indicators
+        right_fist_start_time = right_holds.started("fist")
+        anchor_gesture_start_time = left_holds.started("thumb_index")
+        left_remesh_start_time = left_holds.started("thumb_middle")
+        left_fist_held_start = left_holds.started("fist")
+
+        if pinkies_touching(left_features, right_features):
             if now - command_set_time >= TOGGLE_COOLDOWN:
                 if global_command != "none":
                     logging.debug(f"Disabling mode {global_command} with pinky-to-pinky gesture")
                     global_command = "none"
                     command_set_time = now
 
-        # -----------------------------
-        #   Top UI Text
-        # -----------------------------
-        active_label = f"ACTIVE MODE: {global_command.upper()}" if global_command != "none" else "NO ACTIVE MODE"
-        text_size = cv2.getTextSize(active_label, FONT, 0.7, 2)[0]
-        text_x = (native_width // 2) - (text_size[0] // 2)
-        cv2.putText(frame, active_label, (text_x, 40), FONT, 0.7, TEXT_COLOR, 2)
-
-        # Comment out bottom UI band for voice transcription
-        # -----------------------------
-        #   Bottom UI Band for Voice Transcription
-        # -----------------------------
-        # # Get the latest transcription text (global variable updated by voice thread)
-        # trans_text = latest_transcription
-        # # Use a slightly larger font for transcription (e.g. scale 0.8)
-        # (trans_w, trans_h), _ = cv2.getTextSize(trans_text, FONT, 0.8, 2)
-        # band_height = trans_h + 10  # thin band with a small margin
-        # info_bar_y = native_height - band_height
-        # cv2.rectangle(frame, (0, info_bar_y), (native_width, native_height), UI_BACKGROUND, -1)
-        # text_x_center = (native_width - trans_w) // 2
-        # text_y = info_bar_y + trans_h + 5
-        # cv2.putText(frame, trans_text, (text_x_center, text_y), FONT, 0.8, UI_ACCENT, 2)
-
-        # -----------------------------
-        #   Anchors and Progress Indicators
-        # -----------------------------
-        for i, anchor in enumerate(anchors):
-            anchor_x = int(anchor["x"] * native_width)
-            anchor_y = int(anchor["y"] * native_height)
-            cv2.circle(frame, (anchor_x, anchor_y), 10, UI_SHADOW, -1)
-            cv2.circle(frame, (anchor_x, anchor_y), 8, ANCHOR_COLOR, -1)
-            cv2.putText(frame, f"A{i + 1}", (anchor_x + 12, anchor_y + 5), FONT, 0.5, ANCHOR_COLOR, 2)
-
-        if anchor_in_progress and current_anchor:
-            anchor_x = int(current_anchor["x"] * native_width)
-            anchor_y = int(current_anchor["y"] * native_height)
-            pulse = 2 + int(abs(math.sin(time.time() * 5)) * 3)
-            cv2.circle(frame, (anchor_x, anchor_y), 14 + pulse, UI_SHADOW, -1)
-            cv2.circle(frame, (anchor_x, anchor_y), 12 + pulse, UI_HIGHLIGHT, -1)
-            cv2.putText(frame, "New", (anchor_x + 15, anchor_y + 5), FONT, 0.5, UI_HIGHLIGHT, 2)
-
-        if right_fist_start_time is not None:
-            draw_hold_progress(frame, native_width - 50, 250, right_fist_start_time, GESTURE_HOLD_TIME,
-                               "Render", (50, 200, 50))
-        if gesture_start_time is not None and current_gesture != "none":
-            draw_hold_progress(frame, native_width - 50, 150, gesture_start_time, GESTURE_HOLD_TIME,
-                               current_gesture.capitalize(), UI_ACCENT)
-        if anchor_gesture_start_time is not None and not anchor_creation_confirmed:
-            draw_hold_progress(frame, 70, native_height - 120, anchor_gesture_start_time, ANCHOR_HOLD_TIME,
-                               "Anchor", ANCHOR_COLOR)
-        if left_remesh_start_time is not None:
-            draw_hold_progress(frame, 70, native_height - 180, left_remesh_start_time, GESTURE_HOLD_TIME,
-                               "Remesh", UI_HIGHLIGHT)
-        if left_fist_held_start is not None:
-            draw_hold_progress(frame, 150, native_height - 120, left_fist_held_start, CLEAR_HOLD_TIME,
-                               "Clear", (200, 50, 50))
-
         try:
             export_anchors = [anchor.copy() for anchor in anchors if anchor]
             if anchor_in_progress and current_anchor:
@@ -1323,6 +1168,7 @@ def main() -> None:
             voice_command = ""
             
             data = {
+                "timestamp": frame_time,  # Capture time, consumers predict from its age
                 "command": global_command,
                 "deform_active": deform_mode_active,
                 "left_hand": {"fingertips": padded_left} if padded_left else None,
@@ -1332,6 +1178,8 @@ def main() -> None:
                 "rotation_speed": float(rotation_speed) if global_command == "rotate" else 0.0,
                 "scale_axis": scale_axis if global_command == "scale" else "XYZ",
                 "remesh_type": REMESH_TYPES[current_remesh_index],
+                "undo_count": undo_count,
+                "redo_count": redo_count,
                 "voice_command": voice_command,
                 "transcription": ""  # Empty string instead of latest_transcription
             }
@@ -1355,14 +1203,86 @@ def main() -> None:
         except Exception as e:
             logging.error(f"Error during data export: {e}")
 
-        # Add notification for remesh type change if it recently changed
-        if current_time - remesh_last_toggle_time < 2.0:  # Increased from 1.5 to 2.0 seconds
-            draw_remesh_notification(frame, REMESH_TYPES[current_remesh_index])
+        # -----------------------------
+        #   DRAWING (after the export, and only on frames the display mode wants)
+        # -----------------------------
+        if display.due():
+            create_ui_overlay(frame)
+            for hand_landmarks, hand_label in seen_hands:
+                color = (RIGHT_HAND_COLOR if hand_label == "Right" else LEFT_HAND_COLOR)
+                drawing_spec = mp_drawing.DrawingSpec(color=(color[2], color[1], color[0]),
+                                                      thickness=3, circle_radius=4)
+                connection_spec = mp_drawing.DrawingSpec(color=(color[2], color[1], color[0]),
+                                                         thickness=2)
+                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
+                                          drawing_spec, connection_spec)
+                draw_hand_boundary(frame, hand_landmarks, hand_label)
 
-        cv2.imshow("VIBE - Hand Gesture Control", frame)
-        
-        # Handle keyboard input
-        key = cv2.waitKey(1) & 0xFF
+            # -----------------------------
+            #   Top UI Text
+            # -----------------------------
+            active_label = f"ACTIVE MODE: {global_command.upper()}" if global_command != "none" else "NO ACTIVE MODE"
+            text_size = cv2.getTextSize(active_label, FONT, 0.7, 2)[0]
+            text_x = (native_width // 2) - (text_size[0] // 2)
+            cv2.putText(frame, active_label, (text_x, 40), FONT, 0.7, TEXT_COLOR, 2)
+
+            # Comment out bottom UI band for voice transcription
+            # -----------------------------
+            #   Bottom UI Band for Voice Transcription
+            # -----------------------------
+            # # Get the latest transcription text (global variable updated by voice thread)
+            # trans_text = latest_transcription
+            # # Use a slightly larger font for transcription (e.g. scale 0.8)
+            # (trans_w, trans_h), _ = cv2.getTextSize(trans_text, FONT, 0.8, 2)
+            # band_height = trans_h + 10  # thin band with a small margin
+            # info_bar_y = native_height - band_height
+            # cv2.rectangle(frame, (0, info_bar_y), (native_width, native_height), UI_BACKGROUND, -1)
+            # text_x_center = (native_width - trans_w) // 2
+            # text_y = info_bar_y + trans_h + 5
+            # cv2.putText(frame, trans_text, (text_x_center, text_y), FONT, 0.8, UI_ACCENT, 2)
+
+            # -----------------------------
+            #   Anchors and Progress Indicators
+            # -----------------------------
+            for i, anchor in enumerate(anchors):
+                anchor_x = int(anchor["x"] * native_width)
+                anchor_y = int(anchor["y"] * native_height)
+                cv2.circle(frame, (anchor_x, anchor_y), 10, UI_SHADOW, -1)
+                cv2.circle(frame, (anchor_x, anchor_y), 8, ANCHOR_COLOR, -1)
+                cv2.putText(frame, f"A{i + 1}", (anchor_x + 12, anchor_y + 5), FONT, 0.5, ANCHOR_COLOR, 2)
+
+            if anchor_in_progress and current_anchor:
+                anchor_x = int(current_anchor["x"] * native_width)
+                anchor_y = int(current_anchor["y"] * native_height)
+                pulse = 2 + int(abs(math.sin(time.time() * 5)) * 3)
+                cv2.circle(frame, (anchor_x, anchor_y), 14 + pulse, UI_SHADOW, -1)
+                cv2.circle(frame, (anchor_x, anchor_y), 12 + pulse, UI_HIGHLIGHT, -1)
+                cv2.putText(frame, "New", (anchor_x + 15, anchor_y + 5), FONT, 0.5, UI_HIGHLIGHT, 2)
+
+            if right_fist_start_time is not None:
+                draw_hold_progress(frame, native_width - 50, 250, right_fist_start_time, GESTURE_HOLD_TIME,
+                                   "Render", (50, 200, 50))
+            if gesture_start_time is not None and current_gesture != "none":
+                draw_hold_progress(frame, native_width - 50, 150, gesture_start_time, GESTURE_HOLD_TIME,
+                                   current_gesture.capitalize(), UI_ACCENT)
+            if anchor_gesture_start_time is not None and not anchor_creation_confirmed:
+                draw_hold_progress(frame, 70, native_height - 120, anchor_gesture_start_time, ANCHOR_HOLD_TIME,
+                                   "Anchor", ANCHOR_COLOR)
+            if left_remesh_start_time is not None:
+                draw_hold_progress(frame, 70, native_height - 180, left_remesh_start_time, GESTURE_HOLD_TIME,
+                                   "Remesh", UI_HIGHLIGHT)
+            if left_fist_held_start is not None:
+                draw_hold_progress(frame, 150, native_height - 120, left_fist_held_start, CLEAR_HOLD_TIME,
+                                   "Clear", (200, 50, 50))
+
+            # Add notification for remesh type change if it recently changed
+            if current_time - remesh_last_toggle_time < 2.0:  # Increased from 1.5 to 2.0 seconds
+                draw_remesh_notification(frame, REMESH_TYPES[current_remesh_index])
+
+            cv2.imshow("VIBE - Hand Gesture Control", frame)
+
+        # Handle keyboard input (no window, no keys when headless)
+        key = cv2.waitKey(1) & 0xFF if not display.headless else 0xFF
         if key == ord('q') or key == 27:  # Check for both 'q' and ESC
             logging.info("Exit key pressed. Terminating.")
             break
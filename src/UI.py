@@ -28,6 +28,34 @@ MULTIVIEW_API_SCRIPT = os.path.join(BASE_DIR, "src", "comfyworkflows", "multivie
 BLENDER_RENDER_DIR = os.path.join(BASE_DIR, "input", "COMFYINPUTS", "blenderRender")
 BLENDER_SCRIPT_PATH = os.path.join(BASE_DIR, "src", "main.py")
 
+# Shared helper modules live in src/imports
+IMPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imports")
+if IMPORTS_DIR not in sys.path:
+    sys.path.append(IMPORTS_DIR)
+
+from commandJournal import CommandJournal, JournalReader, journal_paths, new_key
+from blenderWorker import BlenderWorkerPool
+from progressBus import (
+    ProgressBroker, ProgressSubscriber, STAGE_STARTED, STAGE_FINISHED, PROGRESS,
+    NODE_EXECUTING, ARTIFACT_READY, ERROR, JOB_FINISHED
+)
+
+# Command journal shared with Blender (see src/main.py)
+COMMANDS_JOURNAL_PATH, COMPLETIONS_JOURNAL_PATH = journal_paths(BASE_DIR)
+
+# Number of persistent headless Blender workers used for renders (0 sends
+# renders to the interactive Blender through the command journal instead)
+BLENDER_WORKER_COUNT = int(os.environ.get("VIBE_BLENDER_WORKERS", "0"))
+BLENDER_WORKER_SCENE = os.environ.get("VIBE_BLENDER_SCENE") or None
+# DeformingMesh as exported by the interactive Blender for a worker render
+BLENDER_SNAPSHOT_PATH = os.path.join(BASE_DIR, "output", "worker_snapshot.glb")
+
+# Give up on a Blender job after this long without any progress event
+PROGRESS_STALL_TIMEOUT = 60
+# Completion polling interval with and without a live progress bus (ms)
+BUS_POLL_INTERVAL = 5000
+NO_BUS_POLL_INTERVAL = 1000
+
 # Common Blender installation locations to check
 BLENDER_INSTALL_PATHS = [
     r"C:\Program Files\Blender Foundation\Blender 3.6\blender.exe",
@@ -67,19 +95,24 @@ class ScriptRunner(QThread):
     finished = pyqtSignal(bool, str)
     progress = pyqtSignal(str)
     
-    def __init__(self, script_path, working_dir=None):
+    def __init__(self, script_path, working_dir=None, job=None):
         super().__init__()
         self.script_path = script_path
         self.working_dir = working_dir or os.path.dirname(script_path)
+        self.job = job
         
     def run(self):
         try:
             self.progress.emit("Running script...")
             
-            # Start the process
+            # Start the process, tagging its progress events with our job id
+            env = dict(os.environ)
+            if self.job:
+                env["VIBE_PROGRESS_JOB"] = self.job
             process = subprocess.Popen(
                 [sys.executable, self.script_path], 
                 cwd=self.working_dir,
+                env=env,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True
@@ -104,44 +137,23 @@ class ScriptRunner(QThread):
         except Exception as e:
             self.finished.emit(False, f"Error: {str(e)}")
 
-# Custom BlenderRenderThread for executing Blender in the background
-class BlenderRenderThread(QThread):
+# Runs one job on the persistent headless Blender workers
+class BlenderJobThread(QThread):
     finished = pyqtSignal(bool, str)
     progress = pyqtSignal(str)
     
-    def __init__(self, script_path, blender_path="blender"):
+    def __init__(self, pool, kind, params=None):
         super().__init__()
-        self.script_path = script_path
-        self.blender_path = blender_path
+        self.pool = pool
+        self.kind = kind
+        self.params = params or {}
         
     def run(self):
         try:
-            self.progress.emit("Starting Blender render...")
-            
-            # Start the Blender process
-            process = subprocess.Popen(
-                [self.blender_path, "--background", "--python", self.script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Monitor output
-            while process.poll() is None:
-                stdout_line = process.stdout.readline()
-                if stdout_line:
-                    self.progress.emit(stdout_line.strip())
-                
-            # Get any remaining output
-            stdout, stderr = process.communicate()
-            if stdout:
-                self.progress.emit(stdout.strip())
-                
-            if process.returncode == 0:
-                self.finished.emit(True, "Blender render completed successfully")
-            else:
-                self.finished.emit(False, f"Blender render failed: {stderr}")
-                
+            self.progress.emit(f"Sending {self.kind} job to Blender worker...")
+            reply = self.pool.run_job(self.kind, self.params)
+            message = f"{reply.get('message', '')} (worker {reply.get('worker_id')}, {reply.get('seconds', 0):.1f}s)"
+            self.finished.emit(bool(reply.get("success")), message)
         except Exception as e:
             self.finished.emit(False, f"Error: {str(e)}")
 
@@ -281,6 +293,9 @@ class ImageFrame(QFrame):
 
 # Main window class
 class TransparentWindow(QMainWindow):
+    # Progress bus events, delivered on the GUI thread
+    progress_event = pyqtSignal(dict)
+    
     def __init__(self):
         super().__init__()
         
@@ -291,6 +306,30 @@ class TransparentWindow(QMainWindow):
         )
         self.setAttribute(Qt.WA_TranslucentBackground)
         
+        # Commands to Blender and the completions it sends back
+        self.command_journal = CommandJournal(COMMANDS_JOURNAL_PATH)
+        self.completion_reader = JournalReader(CommandJournal(COMPLETIONS_JOURNAL_PATH), "ui")
+        self.queued_commands = []
+        self.blender_completions = {}
+        
+        # Headless Blender workers, started on first use
+        self.blender_pool = None
+        
+        # Live progress from Blender, the generation scripts and the tracker
+        self.progress_event.connect(self.handle_progress_event)
+        self.progress_subscriber = None
+        self.progress_broker = ProgressBroker()
+        if self.progress_broker.start():
+            self.progress_broker.add_listener(self.progress_event.emit)
+        else:
+            # Another UI already hosts the bus, listen to it instead
+            self.progress_broker = None
+            self.progress_subscriber = ProgressSubscriber(self.progress_event.emit)
+            self.progress_subscriber.start()
+        self.render_in_progress = False
+        self.render_snapshot_pending = False
+        self.import_in_progress = False
+        
         # Set up the UI
         self.init_ui()
         
@@ -652,7 +691,7 @@ class TransparentWindow(QMainWindow):
             self.status_label.setText(f"Selected option {option}. Running multiview workflow...")
             
             # Create worker thread for multiview API
-            self.multiview_worker = ScriptRunner(MULTIVIEW_API_SCRIPT)
+            self.multiview_worker = ScriptRunner(MULTIVIEW_API_SCRIPT, job="multiview")
             self.multiview_worker.progress.connect(self.update_status)
             self.multiview_worker.finished.connect(self.handle_multiview_completion)
             self.multiview_worker.start()
@@ -710,31 +749,34 @@ class TransparentWindow(QMainWindow):
             # First make sure the render directory exists
             os.makedirs(BLENDER_RENDER_DIR, exist_ok=True)
             
-            # Create a Python script to run in the current Blender instance
-            # Instead of trying to find and run a separate Blender instance,
-            # we'll create a script that can be executed by the main.py in the currently running Blender
-            
-            # First, create a simple file that flags the UI is requesting a render
-            render_request_path = os.path.join(BASE_DIR, "render_request.txt")
-            with open(render_request_path, "w") as f:
-                f.write(f"Request time: {time.time()}\n")
-                f.write(f"Target dir: {BLENDER_RENDER_DIR}\n")
-                
-            self.status_label.setText("Waiting for Blender to render views...")
-            
-            # Poll for completion by checking for a "render_complete.txt" file
-            # or checking if the expected images exist
-            render_complete = False
-            timeout = time.time() + 60  # 1 minute timeout
+            # A persistent headless worker renders if configured, but it has its own
+            # scene: the interactive Blender exports the current DeformingMesh first
+            # and the worker renders that (see start_worker_render)
+            self.render_snapshot_pending = BLENDER_WORKER_COUNT > 0
+            if self.render_snapshot_pending:
+                self.render_request_key = self.send_blender_command("export", {
+                    "filepath": BLENDER_SNAPSHOT_PATH,
+                    "objects": ["DeformingMesh"],
+                })
+                self.status_label.setText("Waiting for Blender to export the current mesh...")
+            else:
+                # Queue a render command in the journal for Blender to pick up
+                self.render_request_key = self.send_blender_command("render", {
+                    "request_time": time.time(),
+                    "target_dir": BLENDER_RENDER_DIR,
+                })
+                self.status_label.setText("Waiting for Blender to render views...")
             
-            # Create worker to check for render completion
+            # Completion normally arrives as a progress bus event; the timer is a
+            # fallback that also checks whether the expected images exist
             self.check_render_timer = QTimer(self)
             self.check_render_timer.timeout.connect(self.check_render_progress)
-            self.check_render_timer.start(1000)  # Check every second
+            self.check_render_timer.start(self.completion_poll_interval())
             
             # Mark the render as in progress
             self.render_in_progress = True
             self.render_start_time = time.time()
+            self.render_last_progress = self.render_start_time
                 
         except Exception as e:
             print(f"Error in trigger_blender_render: {str(e)}")
@@ -745,21 +787,28 @@ class TransparentWindow(QMainWindow):
     def check_render_progress(self):
         """Check if the Blender render has completed"""
         try:
-            # Check for a completion file
-            render_complete_path = os.path.join(BASE_DIR, "render_complete.txt")
+            # Check for a completion from Blender
+            completion = self.take_blender_completion(self.render_request_key)
             
-            if os.path.exists(render_complete_path):
+            if completion:
                 # Render is explicitly marked as complete
-                with open(render_complete_path, "r") as f:
-                    status = f.read().strip()
-                
-                # Delete the completion file
-                os.remove(render_complete_path)
+                status = completion["payload"].get("message", "")
                 
                 # Stop the timer
                 self.check_render_timer.stop()
+                self.render_in_progress = False
                 
-                if "SUCCESS" in status:
+                if self.render_snapshot_pending:
+                    # Only the export is done; the worker renders next
+                    self.render_snapshot_pending = False
+                    if completion["payload"].get("success"):
+                        self.start_worker_render()
+                    else:
+                        self.status_label.setText(f"Blender export issue: {status}. Generating options anyway...")
+                        self.handle_render_completion(False, status)
+                    return
+                
+                if completion["payload"].get("success"):
                     self.status_label.setText("Blender render completed successfully. Generating options...")
                     self.handle_render_completion(True, "Render completed")
                 else:
@@ -793,13 +842,15 @@ class TransparentWindow(QMainWindow):
             # If all 5 images exist and were recently modified, consider render complete
             if valid_images >= 5:
                 self.check_render_timer.stop()
+                self.render_in_progress = False
                 self.status_label.setText("Blender render completed. Generating options...")
                 self.handle_render_completion(True, "Render completed based on image detection")
                 return
                 
-            # Check for timeout
-            if time.time() > self.render_start_time + 60:  # 1 minute timeout
+            # Check for a stalled render (no progress for a while)
+            if time.time() > self.render_last_progress + PROGRESS_STALL_TIMEOUT:
                 self.check_render_timer.stop()
+                self.render_in_progress = False
                 self.status_label.setText("Render timeout. Generating options anyway...")
                 self.handle_render_completion(False, "Render timeout")
                 return
@@ -807,19 +858,30 @@ class TransparentWindow(QMainWindow):
         except Exception as e:
             print(f"Error checking render progress: {str(e)}")
             self.check_render_timer.stop()
+            self.render_in_progress = False
             self.status_label.setText(f"Error checking render: {str(e)}. Generating options...")
             self.handle_render_completion(False, f"Error: {str(e)}")
 
-    def handle_render_completion(self, success, message):
-        """Handle the completion of the Blender render"""
-        # Clean up any temporary files
+    def start_worker_render(self):
+        """Render the exported DeformingMesh in a persistent headless worker"""
         try:
-            render_request_path = os.path.join(BASE_DIR, "render_request.txt")
-            if os.path.exists(render_request_path):
-                os.remove(render_request_path)
+            self.status_label.setText("Waiting for Blender worker to render views...")
+            self.render_job = BlenderJobThread(self.get_blender_pool(), "render", {
+                "output_dir": BLENDER_RENDER_DIR,
+                "mesh_path": BLENDER_SNAPSHOT_PATH,
+            })
+            self.render_job.progress.connect(self.update_status)
+            self.render_job.finished.connect(self.handle_render_completion)
+            self.render_job.start()
         except Exception as e:
-            print(f"Error removing temporary files: {str(e)}")
+            print(f"Error starting worker render: {str(e)}")
+            self.status_label.setText(f"Render error: {str(e)}")
+            self.handle_render_completion(False, str(e))
             
+    def handle_render_completion(self, success, message):
+        """Handle the completion of the Blender render"""
+        self.render_in_progress = False
+        
         # Start the options generation process
         self.start_options_generation()
         
@@ -827,7 +889,7 @@ class TransparentWindow(QMainWindow):
         """Start the options generation process after rendering"""
         try:
             # Create worker thread for options API
-            self.worker = ScriptRunner(OPTIONS_API_SCRIPT)
+            self.worker = ScriptRunner(OPTIONS_API_SCRIPT, job="options")
             self.worker.progress.connect(self.update_status)
             self.worker.finished.connect(self.handle_completion)
             self.worker.start()
@@ -906,22 +968,23 @@ class TransparentWindow(QMainWindow):
     def trigger_blender_import(self):
         """Trigger Blender to import the generated mesh"""
         try:
-            # Create a file that signals Blender to import the model
-            import_request_path = os.path.join(BASE_DIR, "import_request.txt")
-            with open(import_request_path, "w") as f:
-                f.write(f"Request time: {time.time()}\n")
-                f.write(f"Model path: {os.path.join(BASE_DIR, 'output', 'generated', 'Models', 'current_mesh.glb')}\n")
+            # Queue an import command in the journal for Blender to pick up
+            self.import_request_key = self.send_blender_command("import", {
+                "request_time": time.time(),
+                "model_path": os.path.join(BASE_DIR, 'output', 'generated', 'Models', 'current_mesh.glb'),
+            })
                 
             self.status_label.setText("Waiting for Blender to import the model...")
             
-            # Create a timer to check for import completion
+            # Completion normally arrives as a progress bus event; the timer is a fallback
             self.check_import_timer = QTimer(self)
             self.check_import_timer.timeout.connect(self.check_import_progress)
-            self.check_import_timer.start(1000)  # Check every second
+            self.check_import_timer.start(self.completion_poll_interval())
             
             # Mark the import as in progress
             self.import_in_progress = True
             self.import_start_time = time.time()
+            self.import_last_progress = self.import_start_time
                 
         except Exception as e:
             print(f"Error triggering Blender import: {str(e)}")
@@ -930,38 +993,154 @@ class TransparentWindow(QMainWindow):
     def check_import_progress(self):
         """Check if the Blender import has completed"""
         try:
-            # Check for a completion file
-            import_complete_path = os.path.join(BASE_DIR, "import_complete.txt")
+            # Check for a completion from Blender
+            completion = self.take_blender_completion(self.import_request_key)
             
-            if os.path.exists(import_complete_path):
+            if completion:
                 # Import is explicitly marked as complete
-                with open(import_complete_path, "r") as f:
-                    status = f.read().strip()
-                
-                # Delete the completion file
-                os.remove(import_complete_path)
+                status = completion["payload"].get("message", "")
                 
                 # Stop the timer
                 self.check_import_timer.stop()
+                self.import_in_progress = False
+                
+                # The import may have advanced the remesh stage; the completion
+                # carries the state, remesh_state.txt may not be written yet
+                self.check_remesh_state(completion["payload"].get("remesh"))
                 
-                if "SUCCESS" in status:
+                if completion["payload"].get("success"):
                     self.status_label.setText("3D model imported successfully!")
                 else:
                     self.status_label.setText(f"Import issue: {status}")
                 
                 return
                 
-            # Check for timeout
-            if time.time() > self.import_start_time + 60:  # 1 minute timeout
+            # Check for a stalled import (no progress for a while)
+            if time.time() > self.import_last_progress + PROGRESS_STALL_TIMEOUT:
                 self.check_import_timer.stop()
+                self.import_in_progress = False
                 self.status_label.setText("Import timeout. Please check Blender console.")
                 return
                 
         except Exception as e:
             print(f"Error checking import progress: {str(e)}")
             self.check_import_timer.stop()
+            self.import_in_progress = False
             self.status_label.setText(f"Error checking import: {str(e)}")
 
+    def completion_poll_interval(self):
+        """Fallback polling interval for Blender completions (ms)"""
+        if self.progress_broker is not None or (self.progress_subscriber and self.progress_subscriber.connected):
+            return BUS_POLL_INTERVAL
+        return NO_BUS_POLL_INTERVAL
+        
+    def handle_progress_event(self, event):
+        """React to a progress bus event (runs on the GUI thread)"""
+        try:
+            job = event.get("job")
+            event_type = event.get("type")
+            
+            if self.render_in_progress and job == getattr(self, 'render_request_key', None):
+                self.render_last_progress = time.time()
+                if event_type == JOB_FINISHED:
+                    self.check_render_progress()
+                    return
+            elif self.import_in_progress and job == getattr(self, 'import_request_key', None):
+                self.import_last_progress = time.time()
+                if event_type == JOB_FINISHED:
+                    self.check_import_progress()
+                    return
+            elif event.get("source") == "tracker" and event_type not in (ERROR, STAGE_STARTED, STAGE_FINISHED):
+                # Routine tracker updates would flood the status line
+                return
+                
+            message = self.describe_progress_event(event)
+            if message:
+                self.status_label.setText(message)
+        except Exception as e:
+            print(f"Error handling progress event: {str(e)}")
+            
+    def describe_progress_event(self, event):
+        """Turn a progress event into a short status line"""
+        source = event.get("source", "")
+        event_type = event.get("type")
+        stage = event.get("stage", "")
+        
+        if event_type == STAGE_STARTED:
+            return f"{source}: {stage} started..."
+        if event_type == STAGE_FINISHED:
+            return f"{source}: {stage} {'finished' if event.get('success', True) else 'failed'}"
+        if event_type == PROGRESS:
+            percent = event.get("percent")
+            text = event.get("message") or stage
+            return f"{source}: {text}" + (f" ({percent:.0f}%)" if percent is not None else "")
+        if event_type == NODE_EXECUTING:
+            return f"{source}: executing node {event.get('node')}"
+        if event_type == ARTIFACT_READY:
+            return f"{source}: wrote {os.path.basename(event.get('path', ''))}"
+        if event_type == ERROR:
+            return f"{source} error: {event.get('message', '')}"
+        return None
+
+    def get_blender_pool(self):
+        """Return the headless Blender worker pool, creating it on first use"""
+        if self.blender_pool is None:
+            blender_path = find_blender_executable()
+            if not blender_path:
+                raise RuntimeError("Blender executable not found")
+            self.blender_pool = BlenderWorkerPool(
+                blender_path, BLENDER_SCRIPT_PATH,
+                size=BLENDER_WORKER_COUNT, blend_file=BLENDER_WORKER_SCENE
+            )
+        return self.blender_pool
+        
+    def closeEvent(self, event):
+        """Shut down the headless Blender workers and the progress bus with the window"""
+        if self.blender_pool is not None:
+            self.blender_pool.close()
+            self.blender_pool = None
+        if self.progress_broker is not None:
+            self.progress_broker.stop()
+        if self.progress_subscriber is not None:
+            self.progress_subscriber.stop()
+        super().closeEvent(event)
+
+    def send_blender_command(self, kind, payload=None):
+        """Queue a command for Blender and return its idempotency key.
+
+        Commands queued during the same event loop iteration are written
+        to the journal together in a single append.
+        """
+        key = new_key()
+        if not self.queued_commands:
+            QTimer.singleShot(0, self.flush_blender_commands)
+        self.queued_commands.append({"kind": kind, "payload": payload or {}, "key": key})
+        return key
+        
+    def flush_blender_commands(self):
+        """Write all queued commands to the journal in one batch"""
+        commands, self.queued_commands = self.queued_commands, []
+        if not commands:
+            return
+        try:
+            records = self.command_journal.append_batch(commands)
+            print(f"Sent {len(records)} command(s) to Blender: " +
+                  ", ".join(f"#{r['seq']} {r['kind']}" for r in records))
+        except Exception as e:
+            # Keep them queued so the next flush retries with the same keys
+            print(f"Error writing command journal: {str(e)}")
+            self.queued_commands = commands + self.queued_commands
+            QTimer.singleShot(1000, self.flush_blender_commands)
+            
+    def take_blender_completion(self, key):
+        """Return (and forget) Blender's completion for a command key, if it arrived"""
+        awaited = {getattr(self, 'render_request_key', None), getattr(self, 'import_request_key', None)}
+        for record in self.completion_reader.pending():
+            if record["key"] in awaited:
+                self.blender_completions[record["key"]] = record
+            self.completion_reader.commit(record)
+        return self.blender_completions.pop(key, None)
+
     def mousePressEvent(self, event):
         """Enable window dragging"""
         if event.button() == Qt.LeftButton:
@@ -1023,6 +1202,10 @@ class TransparentWindow(QMainWindow):
                     if hasattr(self, 'multiview_worker') and self.multiview_worker.isRunning():
                         self.multiview_worker.terminate()
                         self.multiview_worker.wait()
+                        
+                    if self.blender_pool is not None:
+                        self.blender_pool.close()
+                        self.blender_pool = None
                 except Exception as e:
                     print(f"Error terminating worker threads: {str(e)}")
                 
@@ -1171,15 +1354,13 @@ class TransparentWindow(QMainWindow):
             except ValueError:
                 current_stage = 1
         
-        # Create a remesh_state.txt file to communicate with Blender
-        remesh_state_path = os.path.join(BASE_DIR, "remesh_state.txt")
-        
+        # Send the new remesh state to Blender through the command journal
         try:
-            with open(remesh_state_path, "w") as f:
-                f.write(f"enabled={is_enabled}\n")
-                f.write(f"stage={current_stage}\n")
-                f.write(f"type=SHARP\n")  # Default type, can be changed in Blender UI
-                f.write(f"timestamp={time.time()}\n")
+            self.send_blender_command("remesh_state", {
+                "enabled": is_enabled,
+                "stage": current_stage,
+                "type": "SHARP",  # Default type, can be changed in Blender UI
+            })
             
             self.status_label.setText(f"Remesh {'enabled' if is_enabled else 'disabled'} - Will apply stage {current_stage} on next import")
             print(f"Saved remesh state: enabled={is_enabled}, stage={current_stage}")
@@ -1190,14 +1371,20 @@ class TransparentWindow(QMainWindow):
         
         # If a new mesh is imported when remesh is enabled, the stage will advance
         # We'll update our button text when we detect a stage change in Blender via
-        # checking the remesh_state.txt file periodically in self.load_images()
+        # checking the remesh_state.txt file Blender writes back, in self.load_images()
 
-    def check_remesh_state(self):
-        """Check and update remesh state from Blender"""
+    def check_remesh_state(self, state=None):
+        """Check and update remesh state from Blender.
+        
+        state is the "remesh" dict of a journal completion; without one the
+        state is read from remesh_state.txt."""
         remesh_state_path = os.path.join(BASE_DIR, "remesh_state.txt")
         
         try:
-            if not os.path.exists(remesh_state_path):
+            if state is not None:
+                stage = int(state.get("stage", 1))
+                enabled = bool(state.get("enabled", False))
+            elif not os.path.exists(remesh_state_path):
                 # Create default state file if it doesn't exist
                 with open(remesh_state_path, "w") as f:
                     f.write("enabled=False\n")
@@ -1205,21 +1392,21 @@ class TransparentWindow(QMainWindow):
                     f.write("type=SHARP\n")
                     f.write(f"timestamp={time.time()}\n")
                 return
-            
-            # Read the state file
-            stage = 1
-            enabled = False
-            
-            with open(remesh_state_path, "r") as f:
-                for line in f:
-                    if line.startswith("stage="):
-                        try:
-                            stage = int(line.strip().split("=")[1])
-                        except:
-                            stage = 1
-                    elif line.startswith("enabled="):
-                        enabled_text = line.strip().split("=")[1].lower()
-                        enabled = enabled_text == "true"
+            else:
+                # Read the state file
+                stage = 1
+                enabled = False
+                
+                with open(remesh_state_path, "r") as f:
+                    for line in f:
+                        if line.startswith("stage="):
+                            try:
+                                stage = int(line.strip().split("=")[1])
+                            except:
+                                stage = 1
+                        elif line.startswith("enabled="):
+                            enabled_text = line.strip().split("=")[1].lower()
+                            enabled = enabled_text == "true"
             
             # Update the button text and state
             if hasattr(self, 'remesh_btn'):
@@ -1267,15 +1454,10 @@ class TransparentWindow(QMainWindow):
 
 def find_blender_executable():
     """Find the Blender executable path"""
-    # First try the PATH environment variable
-    try:
-        # Check if blender is in the PATH
-        process = subprocess.run(["blender", "--version"], 
-                                capture_output=True, text=True, check=False)
-        if process.returncode == 0:
-            return "blender"  # Blender is in PATH
-    except:
-        pass
+    # First try the PATH environment variable (without launching Blender)
+    blender_on_path = shutil.which("blender")
+    if blender_on_path:
+        return blender_on_path
     
     # Then try common installation directories
     for path in BLENDER_INSTALL_PATHS:
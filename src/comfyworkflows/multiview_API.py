@@ -13,6 +13,13 @@ import random
 import socket
 import traceback
 
+# Shared helper modules live in src/imports
+IMPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "imports")
+if IMPORTS_DIR not in sys.path:
+    sys.path.append(IMPORTS_DIR)
+
+from progressBus import ProgressPublisher
+
 # Server configuration
 server_address = "127.0.0.1:8188"
 client_id = str(uuid.uuid4())
@@ -21,6 +28,9 @@ client_id = str(uuid.uuid4())
 COMFYUI_OUTPUT = "C:\\ComfyUI_windows_portable_nvidia\\ComfyUI_windows_portable\\ComfyUI\\output"
 TARGET_OUTPUT = "C:\\CODING\\VIBE\\VIBE_Forming\\output\\generated\\Models"
 
+# Progress events for the UI
+progress_bus = ProgressPublisher("multiview")
+
 def check_comfyui_server():
     """Check if the ComfyUI server is running"""
     try:
@@ -332,6 +342,7 @@ def main():
         result = queue_prompt(workflow)
         prompt_id = result['prompt_id']
         print(f"Prompt queued with ID: {prompt_id}")
+        progress_bus.stage_started("mesh", message=f"Prompt {prompt_id} queued")
         
         # Wait for execution to complete
         execution_timeout = time.time() + 600  # 10 minutes timeout (increased from 5)
@@ -347,16 +358,22 @@ def main():
                         data = message['data']
                         if data['node'] is None and data['prompt_id'] == prompt_id:
                             print("Execution completed!")
+                            progress_bus.stage_finished("mesh")
                             break
                         elif data['node'] is not None:
                             print(f"Executing node: {data['node']}")
+                            progress_bus.node_executing(data['node'], stage="mesh")
                     elif message['type'] == 'execution_error':
                         print(f"Execution error: {message['data']}")
                         print("This is usually caused by a configuration issue in the workflow")
+                        progress_bus.error(f"Execution error: {message['data']}", stage="mesh")
                         break
                     elif message['type'] == 'progress':
                         execution_started = True
-                        print(f"Progress: {message['data']['value']}/{message['data']['max']}")
+                        value, maximum = message['data']['value'], message['data']['max']
+                        print(f"Progress: {value}/{maximum}")
+                        progress_bus.progress("mesh", percent=100.0 * value / maximum if maximum else None,
+                                              node=message['data'].get('node'), message=f"Step {value}/{maximum}")
                 else:
                     # Binary data (preview image)
                     continue
@@ -396,6 +413,7 @@ def main():
                 
                 if copy_mesh_to_target(COMFYUI_OUTPUT, TARGET_OUTPUT):
                     print("Mesh successfully copied to target location")
+                    progress_bus.artifact_ready(os.path.join(TARGET_OUTPUT, "current_mesh.glb"), stage="mesh")
                 else:
                     print("Failed to copy mesh to target location")
                     sys.exit(1)
@@ -406,6 +424,7 @@ def main():
                 # Check if any GLB file was generated despite missing the expected nodes
                 if copy_mesh_to_target(COMFYUI_OUTPUT, TARGET_OUTPUT):
                     print("Found and copied a mesh file anyway")
+                    progress_bus.artifact_ready(os.path.join(TARGET_OUTPUT, "current_mesh.glb"), stage="mesh")
                 else:
                     print("No mesh files found")
                     sys.exit(1)
@@ -429,8 +448,16 @@ if __name__ == "__main__":
     try:
         main()
         print("Script completed successfully")
+        progress_bus.job_finished(True, "Mesh generated", stage="mesh")
         sys.exit(0)
+    except SystemExit as e:
+        # The failure paths in main() exit directly; the UI still has to hear about it
+        if e.code not in (0, None):
+            progress_bus.error(f"Mesh generation failed (exit code {e.code})", stage="mesh")
+            progress_bus.job_finished(False, f"Mesh generation failed (exit code {e.code})", stage="mesh")
+        raise
     except Exception as e:
         print(f"ERROR: Unhandled exception: {str(e)}")
+        progress_bus.job_finished(False, str(e), stage="mesh")
         traceback.print_exc()
         sys.exit(1)
@@ -10,6 +10,13 @@ import shutil
 import base64
 import random
 
+# Shared helper modules live in src/imports
+IMPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "imports")
+if IMPORTS_DIR not in sys.path:
+    sys.path.append(IMPORTS_DIR)
+
+from progressBus import ProgressPublisher
+
 # Server configuration
 server_address = "127.0.0.1:8188"
 client_id = str(uuid.uuid4())
@@ -20,6 +27,9 @@ OUTPUT_DIR = os.path.join(BASE_DIR, "input", "COMFYINPUTS", "ImageOPTIONS")
 TEXT_OPTIONS_DIR = os.path.join(BASE_DIR, "input", "COMFYINPUTS", "textOptions")
 PROMPT_FILE = os.path.join(TEXT_OPTIONS_DIR, "prompt.txt")
 
+# Progress events for the UI
+progress_bus = ProgressPublisher("options")
+
 print(f"Script starting, output directory set to: {OUTPUT_DIR}")
 print(f"Text options directory set to: {TEXT_OPTIONS_DIR}")
 
@@ -351,6 +361,7 @@ def main():
         result = queue_prompt(workflow)
         prompt_id = result['prompt_id']
         print(f"Prompt queued with ID: {prompt_id}")
+        progress_bus.stage_started("generate", message=f"Prompt {prompt_id} queued")
         
         # Track nodes that should produce images
         image_nodes = ['33', '63', '82']  # Only track the main save nodes
@@ -388,11 +399,10 @@ def main():
                             prompt_texts[letter] = outputs[node_id]["text"]
                     
                     # Check if all image nodes have completed
-                    all_nodes_done = True
-                    for node_id in image_nodes:
-                        if node_id not in outputs:
-                            all_nodes_done = False
-                            break
+                    done_nodes = [node_id for node_id in image_nodes if node_id in outputs]
+                    all_nodes_done = len(done_nodes) == len(image_nodes)
+                    progress_bus.progress("generate", percent=100.0 * len(done_nodes) / len(image_nodes),
+                                          message=f"{len(done_nodes)}/{len(image_nodes)} options generated")
                     
                     if all_nodes_done:
                         print("All image nodes completed!")
@@ -492,6 +502,7 @@ def main():
                     try:
                         shutil.copy2(source_path, target_path)
                         print(f"Successfully copied {letter}.png to {blender_image_dir}")
+                        progress_bus.artifact_ready(target_path, stage="generate", option=letter)
                     except Exception as e:
                         print(f"Error copying {letter}.png to Blender directory: {e}")
                 else:
@@ -543,9 +554,22 @@ def main():
         else:
             print(f"\nOutput directory {OUTPUT_DIR} does not exist!")
         
+        progress_bus.job_finished(True, "Options generated", stage="generate")
+        
     except Exception as e:
         print(f"Error during execution: {str(e)}")
-        sys.exit(1)
+        raise
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except SystemExit as e:
+        # The failure paths in main() exit directly; the UI still has to hear about it
+        if e.code not in (0, None):
+            progress_bus.error(f"Options generation failed (exit code {e.code})", stage="generate")
+            progress_bus.job_finished(False, f"Options generation failed (exit code {e.code})", stage="generate")
+        raise
+    except Exception as e:
+        progress_bus.error(str(e), stage="generate")
+        progress_bus.job_finished(False, str(e), stage="generate")
+        sys.exit(1)
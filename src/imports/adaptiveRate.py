@@ -0,0 +1,74 @@
+import time
+import threading
+
+# Frames without a hand before the tracker drops to the idle rate
+IDLE_AFTER_FRAMES = 30
+# Frames per second processed while idle
+IDLE_FPS = 5.0
+# Camera resolution used while idle (only if resolution switching is enabled)
+IDLE_RESOLUTION = (640, 360)
+# Consecutive failed idle grabs before the camera counts as lost
+GRAB_FAILURE_LIMIT = 10
+
+
+class AdaptiveRate:
+    """Idle-aware frame scheduler shared by the tracker stages.
+
+    After ``idle_after`` consecutive frames without a hand the scheduler goes
+    idle: ``due()`` only lets ``idle_fps`` frames per second through, so the
+    capture loop can grab (not decode) the rest, inference and publishing
+    run rarely, and the display loop can wait longer between polls. The
+    first frame with a hand switches back to full rate immediately.
+    ``on_change(idle)`` is called on every transition, from the thread that
+    called ``update``.
+    """
+
+    def __init__(self, idle_after: int = IDLE_AFTER_FRAMES, idle_fps: float = IDLE_FPS,
+                 enabled: bool = True, on_change=None):
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_fps
+        self.enabled = enabled
+        self.on_change = on_change
+        self.idle = False
+        self._empty_frames = 0
+        self._last_due = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, hands_found: bool) -> bool:
+        """Feed one inference result; returns whether the tracker is now idle"""
+        with self._lock:
+            if hands_found:
+                self._empty_frames = 0
+                changed = self.idle
+                self.idle = False
+            else:
+                self._empty_frames += 1
+                changed = (self.enabled and not self.idle and self._empty_frames >= self.idle_after)
+                if changed:
+                    self.idle = True
+        if changed and self.on_change:
+            self.on_change(self.idle)
+        return self.idle
+
+    def due(self, now: float = None) -> bool:
+        """Whether the next frame should be processed"""
+        if not self.idle:
+            return True
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            if now - self._last_due >= self.idle_interval:
+                self._last_due = now
+                return True
+        return False
+
+    def remaining(self, now: float = None) -> float:
+        """Seconds until due() lets the next frame through (0 while active)"""
+        if not self.idle:
+            return 0.0
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            return max(self.idle_interval - (now - self._last_due), 0.0)
+
+    def wait_ms(self, active_ms: int = 1) -> int:
+        """Delay for cv2.waitKey: short while active, a fraction of the idle interval otherwise"""
+        return active_ms if not self.idle else max(active_ms, int(self.idle_interval * 250))
@@ -0,0 +1,180 @@
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+
+from sessionRecorder import SessionRecorder
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
+FINGERTIP_INDICES = [4, 8, 12, 16, 20]
+# Frames handed to one worker at a time
+CHUNK_FRAMES = 300
+# Frame rate assumed for image sequences (and videos that report none)
+DEFAULT_FPS = 30.0
+
+
+def list_frames(source: str):
+    """Return ("video", path, frame_count, fps) or ("images", sorted_paths, count, fps)"""
+    if os.path.isdir(source):
+        paths = sorted(p for p in glob.glob(os.path.join(source, "*"))
+                       if os.path.splitext(p)[1].lower() in IMAGE_EXTENSIONS)
+        return "images", paths, len(paths), DEFAULT_FPS
+    if any(ch in source for ch in "*?["):
+        paths = sorted(glob.glob(source))
+        return "images", paths, len(paths), DEFAULT_FPS
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open {source}")
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+    cap.release()
+    return "video", source, count, fps
+
+
+def _frames(kind, source, start, end):
+    """Yield (index, BGR frame) for frames start..end-1 (source is the chunk's paths for images)"""
+    if kind == "images":
+        for offset, path in enumerate(source):
+            frame = cv2.imread(path)
+            if frame is not None:
+                yield start + offset, frame
+        return
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    try:
+        for index in range(start, end):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield index, frame
+    finally:
+        cap.release()
+
+
+def track_chunk(kind, source, start, end, fps, mirror=True, max_hands=2):
+    """Run MediaPipe over one chunk of frames (in a worker process).
+
+    Returns a list of tracker payloads, one per frame: the usual fingertip
+    lists plus the full 21x3 landmark array and handedness score per hand.
+    """
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=max_hands,
+                                     min_detection_confidence=0.3, min_tracking_confidence=0.5)
+    payloads = []
+    try:
+        for index, frame in _frames(kind, source, start, end):
+            if mirror:
+                frame = cv2.flip(frame, 1)
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            data = {
+                "timestamp": index / fps,
+                "frame": index,
+                "left_hand": {"fingertips": []},
+                "right_hand": {"fingertips": []},
+            }
+            if results.multi_hand_landmarks and results.multi_handedness:
+                for landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                    label = handedness.classification[0].label
+                    points = [[round(lm.x, 5), round(lm.y, 5), round(lm.z, 5)] for lm in landmarks.landmark]
+                    data["left_hand" if label == "Left" else "right_hand"] = {
+                        "fingertips": [{"x": points[i][0], "y": points[i][1], "z": points[i][2]}
+                                       for i in FINGERTIP_INDICES],
+                        "landmarks": points,
+                        "score": round(float(handedness.classification[0].score), 4),
+                    }
+            payloads.append(data)
+    finally:
+        hands.close()
+    return payloads
+
+
+def default_output(source: str):
+    """(directory, name) of a source's recording: next to the video, image directory or
+    the directory a glob pattern starts in, named after it. For globs the name is the
+    last path component before the first wildcard, never the wildcard itself."""
+    if any(ch in source for ch in "*?["):
+        fixed = []
+        for part in Path(source).parts:
+            if any(ch in part for ch in "*?["):
+                break
+            fixed.append(part)
+        base = Path(os.path.abspath(os.path.join(*fixed) if fixed else "."))
+        return str(base.parent), base.name or "session"
+    path = Path(os.path.abspath(source.rstrip("/\\")))
+    return str(path.parent), (path.name if path.is_dir() else path.stem) or "session"
+
+
+def submit_source(source: str, pool: ProcessPoolExecutor, chunk_frames: int = CHUNK_FRAMES,
+                  mirror: bool = True):
+    """Queue every chunk of one source on the pool; returns (fps, count, chunk futures)"""
+    kind, frames, count, fps = list_frames(source)
+    futures = [pool.submit(track_chunk, kind, frames[start:end] if kind == "images" else frames,
+                           start, min(start + chunk_frames, count), fps, mirror)
+               for start in range(0, count, chunk_frames)]
+    return fps, count, futures
+
+
+def write_source(source: str, output: str, fps: float, count: int, futures, started: float = None) -> int:
+    """Collect the chunks of one submitted source and write them as a session recording"""
+    if count <= 0:
+        print(f"Skipping {source}: no frames")
+        return 0
+    written = 0
+    started = time.perf_counter() if started is None else started
+    with SessionRecorder(output, source=os.path.abspath(source), fps=fps, frames=count) as recorder:
+        # Chunks finish in any order but are written in frame order
+        for number, future in enumerate(futures, 1):
+            for data in future.result():
+                recorder.record(data, data["timestamp"])
+                written += 1
+            print(f"{os.path.basename(source)}: chunk {number}/{len(futures)}, {written}/{count} frames")
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {output}: {written} frames in {elapsed:.1f}s ({written / max(elapsed, 1e-6):.1f} fps)")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from videos or image sequences")
+    parser.add_argument("sources", nargs="+", help="video files, image directories or glob patterns")
+    parser.add_argument("--output-dir", default=None, help="where to write the recordings (default: next to each source)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--chunk-frames", type=int, default=CHUNK_FRAMES)
+    parser.add_argument("--no-mirror", action="store_true", help="do not mirror frames like the live trackers do")
+    args = parser.parse_args()
+
+    outputs = set()
+    jobs = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Every source is queued before any is collected, so the pool never waits on one source's tail
+        for source in args.sources:
+            out_dir, name = default_output(source)
+            out_dir = args.output_dir or out_dir
+            output = os.path.join(out_dir, f"{name}.jsonl.gz")
+            suffix = 1
+            while os.path.normcase(os.path.abspath(output)) in outputs:
+                suffix += 1
+                output = os.path.join(out_dir, f"{name}_{suffix}.jsonl.gz")
+            if suffix > 1:
+                print(f"{source}: {name}.jsonl.gz is taken by another source, writing {os.path.basename(output)}")
+            outputs.add(os.path.normcase(os.path.abspath(output)))
+            try:
+                jobs.append((source, output, submit_source(source, pool, args.chunk_frames, not args.no_mirror)))
+            except Exception as e:
+                print(f"Failed to process {source}: {e}")
+        for source, output, job in jobs:
+            try:
+                write_source(source, output, *job, started)
+            except Exception as e:
+                print(f"Failed to process {source}: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
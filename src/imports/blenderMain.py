@@ -6,13 +6,25 @@ import os
 import time
 import logging
 import bmesh
+import sys
+import tempfile
 from bpy.app.handlers import persistent
 from pathlib import Path
 
+# Shared helper modules live next to this file
+IMPORTS_DIR = str(Path(__file__).resolve().parent)
+if IMPORTS_DIR not in sys.path:
+    sys.path.append(IMPORTS_DIR)
+
+from ioExecutor import IOExecutor, move_file, remove_file
+from fingertipFilter import FingertipFilter
+import meshKernel
+from deformHistory import DeformationHistory, UndoStack, VertexDelta, Snapshot
+from proxyCage import ProxyCage
+
 # Global variables
 original_volume = 1.0  # Default value in case calculation fails
-view_layer_processed_objects = {}  # Track objects we've already tried to fix
-VIEW_LAYER_PROCESS_TIMEOUT = 5.0  # Only try to fix an object's view layer every 5 seconds
+original_vertices = None  # Rotation reference: float32 (N, 3) local coordinates of DeformingMesh
 
 # Determine project root and common paths
 BASE_DIR = Path(__file__).resolve().parents[2]
@@ -20,6 +32,13 @@ INPUT_OPTIONS_DIR = str(BASE_DIR / "input" / "options")
 LIVE_DATA_FILE = str(BASE_DIR / "output" / "live_hand_data.json")
 print(f"[VIBE DEBUG] Live JSON file: {LIVE_DATA_FILE}")
 
+# Background file work, drained from the modal operator's TIMER events
+io_executor = IOExecutor(max_workers=2, name="vibe-massing-io")
+
+# Fingertip smoothing and latency prediction (tunable while running via this file)
+FILTER_PARAMS_FILE = str(BASE_DIR / "output" / "filter_params.json")
+fingertip_filter = FingertipFilter(params_file=FILTER_PARAMS_FILE)
+
 # === IMAGE DISPLAY PANEL ===
 class IMAGE_PT_reload_all(bpy.types.Operator):
     bl_idname = "image.reload_all"
@@ -208,6 +227,16 @@ MAX_FINGER_ORBS = 10
 MAX_ANCHOR_ORBS = 10        
 ENABLE_DEBUG_ORBS = True    
 
+# Modes whose end is recorded as a deformation history checkpoint
+HISTORY_MODES = ("deform", "rotate", "scale", "sculpt")
+# History modes that may change topology; their undo entry is a full mesh copy
+TOPOLOGY_MODES = ("sculpt",)
+
+# Meshes with more vertices than this are deformed through a coarse proxy cage
+PROXY_MIN_VERTICES = 20000
+# Seconds between transfers of the cage deformation to the dense mesh while the hands keep moving
+PROXY_TRANSFER_INTERVAL = 0.5
+
 # Remesh settings
 REMESH_TYPES = ["Blocks", "Smooth", "Sharp", "Voxel", "NONE"]
 DEFAULT_VOXEL_SIZE = 0.1
@@ -221,6 +250,35 @@ created_objects = []
 
 # Name of the primary mesh that is deformed
 DEFORM_OBJ_NAME = "DeformingMesh"
+# Wireframe cage shown while a dense DeformingMesh lags behind its proxy
+PROXY_OBJ_NAME = "DeformingMesh_cage"
+
+# Checkpoints of DeformingMesh, rate-limited and bounded (no per-tick keyframes); H restores them
+deformation_history = DeformationHistory()
+
+# Undo/redo of gesture edits on DeformingMesh (U / Shift+U, or the tracker's undo/redo gestures)
+undo_stack = UndoStack()
+
+# Deformation state for DeformingMesh (vertex grid, edges), kept between ticks
+mesh_deformer = meshKernel.MeshDeformer(
+    radius=FINGER_INFLUENCE_RADIUS,
+    strength=FINGER_FORCE_STRENGTH,
+    anchor_radius=FINGER_INFLUENCE_RADIUS * 1.2,
+    anchor_strength=FINGER_FORCE_STRENGTH * ANCHOR_FORCE_MULTIPLIER,
+    max_displacement=MAX_DISPLACEMENT_PER_FRAME,
+    cohesion_factor=MASS_COHESION_FACTOR,
+    timestep=DEFORM_TIMESTEP,
+    volume_limits=(VOLUME_LOWER_LIMIT, VOLUME_UPPER_LIMIT),
+)
+
+# Proxy cage of a dense DeformingMesh and the object displaying it (None for light meshes)
+proxy_cage = None
+proxy_object = None
+# Mesh keys whose cage could not be built; those meshes are deformed directly
+proxy_failures = set()
+# flush_proxy is shared under this key of bpy.app.driver_namespace, so main.py
+# (a separate script in the same Blender) can flush before exporting DeformingMesh
+FLUSH_PROXY_KEY = "vibe_flush_proxy"
 
 # Render configuration
 RENDER_OUTPUT_DIR = str(BASE_DIR / "input" / "COMFYINPUTS" / "blenderRender")
@@ -282,13 +340,127 @@ def create_anchor_template(radius=0.4, segments=12):
 
 def compute_mesh_volume(obj: bpy.types.Object) -> float:
     mesh = obj.data
-    volume = 0.0
-    for poly in mesh.polygons:
-        verts = [obj.matrix_world @ mesh.vertices[i].co for i in poly.vertices]
-        for i in range(1, len(verts) - 1):
-            v0, v1, v2 = verts[0], verts[i], verts[i+1]
-            volume += v0.dot(v1.cross(v2)) / 6.0
-    return abs(volume)
+    volume = meshKernel.MeshVolume(meshKernel.read_triangles(mesh), len(mesh.vertices))
+    volume.compute(meshKernel.read_coords(mesh))
+    return volume.world_volume(obj.matrix_world)
+
+def deform_vertices(mesh_obj: bpy.types.Object, finger_points, anchor_points) -> None:
+    """Pull the mesh towards the fingers/anchors (world-space points) for one tick,
+    keeping its volume within VOLUME_LOWER_LIMIT..VOLUME_UPPER_LIMIT of the original.
+
+    Dense meshes only have their proxy cage deformed; the dense vertices follow
+    every PROXY_TRANSFER_INTERVAL seconds and as soon as the hands stop."""
+    proxy = get_proxy(mesh_obj)
+    reference_volume = original_volume
+    target = mesh_obj
+    if proxy:
+        reference_volume = original_volume * proxy.volume_ratio
+        target = proxy_object
+        target.matrix_world = mesh_obj.matrix_world
+    moved = mesh_deformer.deform(target.data, mesh_obj.matrix_world, finger_points, anchor_points, reference_volume)
+    current_volume = mesh_deformer.world_volume(mesh_obj.matrix_world)
+    ratio = current_volume / reference_volume if reference_volume > 0 else 0.0
+    logging.debug(f"Deformed {moved} vertices, volume: {current_volume:.3f}, Ratio: {ratio:.3f}")
+    if mesh_deformer.last_correction:
+        ratio, factor = mesh_deformer.last_correction
+        logging.debug(f"Volume ratio {ratio:.3f} out of bounds, scaled about centroid by {factor:.4f}")
+    if proxy:
+        if moved or mesh_deformer.last_correction:
+            proxy.pending = True
+            proxy_object.hide_viewport = False
+        if proxy.pending and (not moved or time.time() - proxy.last_transfer >= PROXY_TRANSFER_INTERVAL):
+            flush_proxy(mesh_obj)
+
+def get_proxy(mesh_obj):
+    """The ProxyCage mesh_obj is deformed through, built on first use (None for light meshes)"""
+    global proxy_cage, proxy_object
+    if not mesh_obj or mesh_obj.type != 'MESH' or not mesh_obj.data:
+        return None
+    mesh = mesh_obj.data
+    if proxy_cage is not None and proxy_cage.owns(mesh):
+        return proxy_cage
+    release_proxy()
+    key = ProxyCage.mesh_key(mesh)
+    if len(mesh.vertices) < PROXY_MIN_VERTICES or key in proxy_failures:
+        return None
+    try:
+        started = time.perf_counter()
+        proxy_cage = ProxyCage.from_mesh(mesh)
+        cage_mesh = bpy.data.meshes.new(PROXY_OBJ_NAME)
+        cage_mesh.from_pydata(proxy_cage.coords.tolist(), [], proxy_cage.triangles.tolist())
+        cage_mesh.update()
+        proxy_object = bpy.data.objects.new(PROXY_OBJ_NAME, cage_mesh)
+        bpy.context.scene.collection.objects.link(proxy_object)
+        proxy_object.display_type = 'WIRE'
+        proxy_object.show_in_front = True
+        proxy_object.hide_render = True
+        proxy_object.hide_select = True
+        proxy_object.hide_viewport = True
+        proxy_object.matrix_world = mesh_obj.matrix_world
+        proxy_cage.last_transfer = time.time()
+        logging.info(f"Built proxy cage for {mesh_obj.name}: {len(proxy_cage.coords)} of {len(mesh.vertices)} vertices "
+                     f"in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        logging.error(f"Error building proxy cage for {mesh_obj.name}, deforming it directly: {e}")
+        proxy_failures.add(key)
+        release_proxy()
+    return proxy_cage
+
+def release_proxy():
+    """Drop the proxy cage and its object (pending cage motion is discarded, flush first)"""
+    global proxy_cage, proxy_object
+    if proxy_object is not None:
+        try:
+            cage_mesh = proxy_object.data
+            bpy.data.objects.remove(proxy_object, do_unlink=True)
+            bpy.data.meshes.remove(cage_mesh)
+        except ReferenceError:
+            pass  # Removed with the scene
+    proxy_cage = None
+    proxy_object = None
+
+def flush_proxy(mesh_obj):
+    """Transfer the cage deformation to the dense mesh (one write) and recentre both.
+
+    Called on its interval while deforming and before anything reads the
+    dense coordinates (undo, checkpoints, joins, renders); free when nothing is pending."""
+    proxy = proxy_cage
+    if proxy is None or not proxy.pending or not mesh_obj or not proxy.owns(mesh_obj.data):
+        return
+    try:
+        cage_mesh = proxy_object.data
+        cage = meshKernel.read_coords(cage_mesh)
+        dense = proxy.transfer(cage)
+        # Recentre on the cage's centre of volume: the dense mesh's would cost a pass over all its faces
+        if mesh_deformer.owns(cage_mesh):
+            offset = mesh_deformer.recenter(cage_mesh)
+        else:
+            offset = meshKernel.set_origin(cage_mesh)
+        dense -= offset
+        meshKernel.write_coords(mesh_obj.data, dense)
+        proxy.rebase(dense, cage - offset)
+        proxy.last_transfer = time.time()
+        mesh_obj.matrix_world = mesh_obj.matrix_world @ mathutils.Matrix.Translation(offset.tolist())
+        proxy_object.matrix_world = mesh_obj.matrix_world
+        proxy_object.hide_viewport = True
+    except Exception as e:
+        logging.error(f"Error transferring proxy cage to {mesh_obj.name}: {e}")
+
+def refit_proxy(mesh_obj):
+    """Bring the cage back onto the dense mesh after it was changed directly
+    (undo/redo, applied scale, rotation); drops it if the topology changed"""
+    if proxy_cage is None:
+        return
+    if not mesh_obj or not mesh_obj.data or not proxy_cage.owns(mesh_obj.data):
+        release_proxy()
+        return
+    try:
+        meshKernel.write_coords(proxy_object.data, proxy_cage.refit(meshKernel.read_coords(mesh_obj.data)))
+        proxy_object.matrix_world = mesh_obj.matrix_world
+        proxy_object.hide_viewport = True
+    except Exception as e:
+        logging.error(f"Error refitting proxy cage to {mesh_obj.name}: {e}")
+        release_proxy()
 
 def map_to_3d_space(x_norm: float, y_norm: float, z_val: float) -> mathutils.Vector:
     mesh_x = -z_val * SCALE_X
@@ -354,71 +526,24 @@ def map_to_camera_relative_space(x_norm: float, y_norm: float, z_val: float) ->
     # If neither Camera nor Env exists, return standard mapping
     return point
 
-def recenter_mesh(mesh_obj):
+def recenter_mesh(mesh_obj, center="VOLUME"):
+    """Move the object's origin to its centre of volume ("BOUNDS"/"MEDIAN" also work)
+    without moving the geometry: one coordinate write and a matrix update, no operator"""
     if not mesh_obj:
         logging.warning("recenter_mesh called with None object")
         return
     
-    global view_layer_processed_objects
-    current_time = time.time()
-    
-    # Check if we've tried to process this object recently to avoid flickering
-    if mesh_obj.name in view_layer_processed_objects:
-        last_process_time = view_layer_processed_objects[mesh_obj.name]
-        # Only try again if enough time has passed
-        if current_time - last_process_time < VIEW_LAYER_PROCESS_TIMEOUT:
-            return
-    
     try:
-        # First verify the object still exists in bpy.data.objects
-        if mesh_obj.name not in bpy.data.objects:
-            logging.warning(f"Object {mesh_obj.name} no longer exists in bpy.data.objects")
+        mesh = mesh_obj.data
+        if mesh_obj.type != 'MESH' or not mesh or len(mesh.vertices) == 0:
             return
-            
-        # Check if the object is in the current view layer
-        obj_in_view_layer = False
-        for obj in bpy.context.view_layer.objects:
-            if obj == mesh_obj:
-                obj_in_view_layer = True
-                break
-        
-        if not obj_in_view_layer:
-            # Record that we're processing this object now
-            view_layer_processed_objects[mesh_obj.name] = current_time
-            
-            # Try to add the object to the view layer if it's not there
-            try:
-                # First make sure it's linked to a collection that's in the view layer
-                if not mesh_obj.users_collection:
-                    bpy.context.scene.collection.objects.link(mesh_obj)
-                    logging.info(f"Linked {mesh_obj.name} to scene collection")
-                
-                # Now ensure it's visible in the view layer
-                for col in mesh_obj.users_collection:
-                    if col.hide_viewport:
-                        col.hide_viewport = False
-                        logging.info(f"Made collection {col.name} visible in viewport")
-                
-                mesh_obj.hide_viewport = False
-                logging.info(f"Made {mesh_obj.name} visible in viewport")
-                
-                # Verify object is now in the view layer
-                obj_in_view_layer = False
-                for obj in bpy.context.view_layer.objects:
-                    if obj == mesh_obj:
-                        obj_in_view_layer = True
-                        break
-                        
-                if not obj_in_view_layer:
-                    logging.warning(f"Object {mesh_obj.name} still not in view layer after linking attempt")
-                    return
-            except Exception as e:
-                logging.error(f"Could not add {mesh_obj.name} to view layer: {e}")
-                return
-        
-        # Now set as active and recenter
-        bpy.context.view_layer.objects.active = mesh_obj
-        bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_VOLUME', center='MEDIAN')
+        if proxy_cage is not None and proxy_cage.owns(mesh):
+            return  # Recentred together with the cage in flush_proxy
+        if mesh_deformer.owns(mesh):
+            offset = mesh_deformer.recenter(mesh, center)
+        else:
+            offset = meshKernel.set_origin(mesh, center)
+        mesh_obj.matrix_world = mesh_obj.matrix_world @ mathutils.Matrix.Translation(offset.tolist())
         logging.debug(f"Recentered {mesh_obj.name}")
     except Exception as e:
         logging.error(f"Error in recenter_mesh for {mesh_obj.name}: {e}")
@@ -491,63 +616,84 @@ def update_remesh_modifier(obj, remesh_type):
     bevel_mod.width_pct = 50
     logging.info("Bevel modifier added: width=0.05, segments=5, profile=0.7 (convex), offset_type=PERCENT")
 
-def insert_deformation_keyframe(mesh_obj):
-    if not mesh_obj:
+def record_deformation_checkpoint(mesh_obj, label="", force=False):
+    """Checkpoint mesh_obj in deformation_history: at most every CHECKPOINT_INTERVAL
+    seconds while it keeps changing, or right away with force (gesture boundaries)"""
+    if not mesh_obj or mesh_obj.type != 'MESH' or not mesh_obj.data:
         return
-    
-    global view_layer_processed_objects
-    current_time = time.time()
-    
-    # Check if we've tried to process this object recently to avoid flickering
-    if mesh_obj.name in view_layer_processed_objects:
-        last_process_time = view_layer_processed_objects[mesh_obj.name]
-        # Only try again if enough time has passed
-        if current_time - last_process_time < VIEW_LAYER_PROCESS_TIMEOUT:
-            return
-    
+    if not force and not deformation_history.due():
+        return
+    flush_proxy(mesh_obj)
     try:
-        # Check if the object is in the current view layer
-        obj_in_view_layer = False
-        for obj in bpy.context.view_layer.objects:
-            if obj == mesh_obj:
-                obj_in_view_layer = True
-                break
-        
-        if not obj_in_view_layer:
-            # Record that we're processing this object now
-            view_layer_processed_objects[mesh_obj.name] = current_time
-            
-            # Try to add the object to the view layer if it's not there
-            try:
-                # First make sure it's linked to a collection that's in the view layer
-                if not mesh_obj.users_collection:
-                    bpy.context.scene.collection.objects.link(mesh_obj)
-                    logging.info(f"Linked {mesh_obj.name} to scene collection for keyframing")
-                
-                # Now ensure it's visible in the view layer
-                for col in mesh_obj.users_collection:
-                    if col.hide_viewport:
-                        col.hide_viewport = False
-                        logging.info(f"Made collection {col.name} visible in viewport for keyframing")
-                
-                mesh_obj.hide_viewport = False
-                logging.info(f"Made {mesh_obj.name} visible in viewport for keyframing")
-            except Exception as e:
-                logging.error(f"Could not add {mesh_obj.name} to view layer for keyframing: {e}")
-                return
-        
-        bpy.context.view_layer.objects.active = mesh_obj
-        if bpy.context.mode != 'OBJECT':
-            bpy.ops.object.mode_set(mode='OBJECT')
-        try:
-            mesh_obj.keyframe_insert(data_path="location")
-            mesh_obj.keyframe_insert(data_path="rotation_euler")
-            mesh_obj.keyframe_insert(data_path="scale")
-            logging.debug(f"Inserted keyframes for {mesh_obj.name}")
-        except Exception as e:
-            logging.error(f"Failed to insert keyframes: {e}")
+        coords = meshKernel.read_coords(mesh_obj.data)
+        transform = object_transform(mesh_obj)
+        if deformation_history.record(coords, transform, label):
+            logging.debug(f"Checkpointed {mesh_obj.name} ({label or 'interval'}), "
+                          f"{len(deformation_history)} checkpoints, {deformation_history.nbytes / 1e6:.1f} MB")
     except Exception as e:
-        logging.error(f"Error in insert_deformation_keyframe for {mesh_obj.name}: {e}")
+        logging.error(f"Error in record_deformation_checkpoint for {mesh_obj.name}: {e}")
+
+def object_transform(obj):
+    return tuple(tuple(row) for row in obj.matrix_world)
+
+def topology_key(mesh):
+    return (len(mesh.vertices), len(mesh.edges), len(mesh.polygons))
+
+def capture_edit_state(mesh_obj, copy_mesh=False):
+    """State of mesh_obj before an edit: coordinates, matrix, topology and, with
+    copy_mesh, a full copy of the mesh for edits that may change topology"""
+    if not mesh_obj or mesh_obj.type != 'MESH' or not mesh_obj.data:
+        return None
+    flush_proxy(mesh_obj)
+    mesh = mesh_obj.data
+    return {
+        "coords": meshKernel.read_coords(mesh),
+        "transform": object_transform(mesh_obj),
+        "topology": topology_key(mesh),
+        "mesh": mesh.copy() if copy_mesh else None,
+    }
+
+def mesh_nbytes(mesh):
+    """Rough size of a mesh's core arrays, for the undo memory budget"""
+    return 12 * len(mesh.vertices) + 8 * len(mesh.edges) + 8 * len(mesh.loops) + 12 * len(mesh.polygons)
+
+def release_mesh_snapshot(edit):
+    """Free the mesh copies of an evicted or discarded Snapshot that nothing uses any more"""
+    for mesh in (edit.before, edit.after):
+        try:
+            if isinstance(mesh, bpy.types.Mesh) and mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+        except ReferenceError:
+            pass  # Already removed with an earlier entry
+
+def push_mesh_snapshot(mesh_obj, before_mesh, label):
+    """Record a topology edit: before_mesh is a copy taken before it, the live mesh is the result"""
+    undo_stack.push(Snapshot(label, before_mesh, mesh_obj.data, mesh_nbytes(before_mesh),
+                             release=release_mesh_snapshot))
+    logging.debug(f"Undo: recorded {label} snapshot, {len(undo_stack)} edits, {undo_stack.nbytes / 1e6:.1f} MB")
+
+def push_edit(mesh_obj, state, label):
+    """Record the change of mesh_obj since capture_edit_state: a compressed vertex delta,
+    or a snapshot if the topology changed"""
+    if state is None or not mesh_obj or not mesh_obj.data:
+        return
+    flush_proxy(mesh_obj)
+    mesh = mesh_obj.data
+    if topology_key(mesh) != state["topology"]:
+        if state["mesh"] is not None:
+            push_mesh_snapshot(mesh_obj, state["mesh"], label)
+        else:
+            # Earlier deltas no longer fit the vertex count
+            logging.warning(f"Undo: {label} changed the topology without a snapshot, clearing undo history")
+            undo_stack.clear()
+        return
+    if state["mesh"] is not None:
+        bpy.data.meshes.remove(state["mesh"])
+    edit = VertexDelta(label, state["coords"], meshKernel.read_coords(mesh),
+                       state["transform"], object_transform(mesh_obj))
+    if undo_stack.push(edit):
+        logging.debug(f"Undo: recorded {label}, {edit.moved} vertices in {edit.nbytes} bytes, "
+                      f"{len(undo_stack)} edits, {undo_stack.nbytes / 1e6:.1f} MB")
 
 # Initialize required objects
 try:
@@ -568,7 +714,7 @@ try:
     try:
         mesh = deform_obj.data
         if mesh and hasattr(mesh, 'vertices') and len(mesh.vertices) > 0:
-            original_vertices = [v.co.copy() for v in mesh.vertices]
+            original_vertices = meshKernel.read_coords(mesh)
             calculated_volume = compute_mesh_volume(deform_obj)
             if calculated_volume > 0:
                 original_volume = calculated_volume
@@ -695,6 +841,10 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
     mode = "none"        # Modes: none, rotate, deform, scale, create, anchor, remesh, render
     last_command = "none"
     prev_mode = "none"
+    history_mode = "none"  # Mode when the last gesture checkpoint was considered
+    edit_state = None      # Mesh state when the current history-mode gesture began (for undo)
+    undo_requests = None   # Last undo/redo gesture counters seen in the live data
+    redo_requests = None
 
     deform_active = False
     render_created_objects = []
@@ -809,12 +959,13 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if not mesh_obj:
             return
         mesh = mesh_obj.data
-        for i, v in enumerate(mesh.vertices):
-            original_pos = original_vertices[i]
-            v.co = rotation_matrix @ original_pos
-        mesh.update()
+        global original_vertices
+        if original_vertices is None or len(original_vertices) != len(mesh.vertices):
+            original_vertices = meshKernel.read_coords(mesh)
+        meshKernel.write_coords(mesh, meshKernel.to_world(original_vertices, meshKernel.matrix_to_array(rotation_matrix)))
+        refit_proxy(mesh_obj)
         recenter_mesh(mesh_obj)
-        insert_deformation_keyframe(mesh_obj)
+        record_deformation_checkpoint(mesh_obj)
 
     def calculate_finger_velocities(self, current_fingertips, previous_fingertips, delta_time):
         if not current_fingertips or not previous_fingertips or len(current_fingertips) != len(previous_fingertips):
@@ -843,6 +994,7 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if not mesh_obj:
             logging.error("DeformingMesh not found, cannot create render copy")
             return None
+        flush_proxy(mesh_obj)
         try:
             render_copy = mesh_obj.copy()
             if mesh_obj.data:
@@ -869,9 +1021,6 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if not mesh:
             logging.error(f"Mesh data for {DEFORM_OBJ_NAME} is None")
             return
-        import bmesh
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
         finger_points = []
         for tip in fingertips:
             # Always use camera-relative mapping for consistent experience
@@ -886,98 +1035,10 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if ENABLE_DEBUG_ORBS:
             self.update_fixed_debug_orbs(finger_points, self.finger_orbs, "fingerOrb", MAX_FINGER_ORBS)
             self.update_fixed_debug_orbs(anchor_points, self.anchor_orbs, "anchorOrb", MAX_ANCHOR_ORBS)
-        def smooth_falloff(distance, radius):
-            if distance >= radius:
-                return 0.0
-            normalized = distance / radius
-            return (1.0 - normalized**2)**2
-        world_matrix = mesh_obj.matrix_world
-        world_matrix_inv = world_matrix.inverted()
-        vertex_displacements = {}
-        for v in bm.verts:
-            v_world = world_matrix @ v.co
-            net_displacement = mathutils.Vector((0, 0, 0))
-            for finger_pos in finger_points:
-                to_finger = finger_pos - v_world
-                dist = to_finger.length
-                if dist < FINGER_INFLUENCE_RADIUS:
-                    falloff = smooth_falloff(dist, FINGER_INFLUENCE_RADIUS)
-                    direction = to_finger.normalized()
-                    force = direction * falloff * FINGER_FORCE_STRENGTH
-                    net_displacement += force
-            for anchor_pos in anchor_points:
-                to_anchor = anchor_pos - v_world
-                dist = to_anchor.length
-                if dist < FINGER_INFLUENCE_RADIUS * 1.2:
-                    falloff = smooth_falloff(dist, FINGER_INFLUENCE_RADIUS * 1.2)
-                    direction = to_anchor.normalized()
-                    force = direction * falloff * FINGER_FORCE_STRENGTH * ANCHOR_FORCE_MULTIPLIER
-                    net_displacement += force
-            if net_displacement.length > 0.0001:
-                if net_displacement.length > MAX_DISPLACEMENT_PER_FRAME:
-                    net_displacement = net_displacement.normalized() * MAX_DISPLACEMENT_PER_FRAME
-                vertex_displacements[v.index] = net_displacement
-            else:
-                vertex_displacements[v.index] = mathutils.Vector((0, 0, 0))
-        smoothed_displacements = {}
-        for v in bm.verts:
-            if v.index not in vertex_displacements:
-                continue
-            original_displacement = vertex_displacements[v.index]
-            neighbor_verts = [e.other_vert(v) for e in v.link_edges]
-            if not neighbor_verts:
-                smoothed_displacements[v.index] = original_displacement
-                continue
-            neighbor_avg = mathutils.Vector((0, 0, 0))
-            for nv in neighbor_verts:
-                if nv.index in vertex_displacements:
-                    neighbor_avg += vertex_displacements[nv.index]
-            if len(neighbor_verts) > 0:
-                neighbor_avg /= len(neighbor_verts)
-            smoothed_displacement = original_displacement.lerp(neighbor_avg, MASS_COHESION_FACTOR)
-            smoothed_displacements[v.index] = smoothed_displacement
-        for v in bm.verts:
-            if v.index in smoothed_displacements:
-                v_world = world_matrix @ v.co
-                v_world += smoothed_displacements[v.index] * DEFORM_TIMESTEP
-                v.co = world_matrix_inv @ v_world
-        bm.to_mesh(mesh)
-        mesh.update()
-        
-        try:
-            current_volume = compute_mesh_volume(mesh_obj)
-            volume_ratio = current_volume / original_volume
-            logging.debug(f"Current volume: {current_volume:.3f}, Ratio: {volume_ratio:.3f}")
-            
-            if volume_ratio < VOLUME_LOWER_LIMIT or volume_ratio > VOLUME_UPPER_LIMIT:
-                if volume_ratio < VOLUME_LOWER_LIMIT:
-                    target_ratio = VOLUME_LOWER_LIMIT
-                    logging.debug(f"Volume too small: {volume_ratio:.3f}, adjusting to {target_ratio:.3f}")
-                else:
-                    target_ratio = VOLUME_UPPER_LIMIT
-                    logging.debug(f"Volume too large: {volume_ratio:.3f}, adjusting to {target_ratio:.3f}")
-                scale_factor = (target_ratio / volume_ratio) ** (1/3)
-                bm_corrected = bmesh.new()
-                bm_corrected.from_mesh(mesh)
-                total = mathutils.Vector((0, 0, 0))
-                for v in bm_corrected.verts:
-                    total += v.co
-                centroid = total / len(bm_corrected.verts)
-                for v in bm_corrected.verts:
-                    v.co = centroid + (v.co - centroid) * scale_factor
-                bm_corrected.to_mesh(mesh)
-                mesh.update()
-                bm_corrected.free()
-                
-                corrected_volume = compute_mesh_volume(mesh_obj)
-                corrected_ratio = corrected_volume / original_volume
-                logging.debug(f"Volume after correction: {corrected_volume:.3f}, Ratio: {corrected_ratio:.3f}")
-        except Exception as e:
-            logging.error(f"Error during volume calculations/correction: {e}")
+        deform_vertices(mesh_obj, finger_points, anchor_points)
         
         recenter_mesh(mesh_obj)
-        bm.free()
-        insert_deformation_keyframe(mesh_obj)
+        record_deformation_checkpoint(mesh_obj)
 
     def scale_mesh(self, fingertips, axis="XYZ"):
         if not fingertips or len(fingertips) < 5:
@@ -1057,7 +1118,7 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         
         recenter_mesh(mesh_obj)
         logging.info(f"Applied scale: {new_scale} on axis {axis}, factor: {scale_factor:.2f}")
-        insert_deformation_keyframe(mesh_obj)
+        record_deformation_checkpoint(mesh_obj)
 
     def apply_scale(self):
         """Apply the current scale to the mesh object, resetting scale to 1"""
@@ -1066,6 +1127,8 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
             return False
             
         try:
+            flush_proxy(mesh_obj)
+            
             # Select the object and make it active
             bpy.ops.object.select_all(action='DESELECT')
             mesh_obj.select_set(True)
@@ -1073,10 +1136,11 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
             
             # Apply scale
             bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+            refit_proxy(mesh_obj)
             
             # Update original vertices reference after applying scale
             global original_vertices
-            original_vertices = [v.co.copy() for v in mesh_obj.data.vertices]
+            original_vertices = meshKernel.read_coords(mesh_obj.data)
             
             logging.info("Scale applied to mesh object")
             return True
@@ -1308,6 +1372,12 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         # All other selected objects will be the operands
         operands = [obj for obj in selected_objects if obj != target]
         
+        # Booleans on DeformingMesh change its topology, keep a copy for undo
+        before_mesh = None
+        if target.name == DEFORM_OBJ_NAME:
+            flush_proxy(target)
+            before_mesh = target.data.copy()
+        
         # Apply boolean modifiers
         for operand in operands:
             bool_mod = target.modifiers.new(name="Boolean", type='BOOLEAN')
@@ -1322,6 +1392,10 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                 logging.info(f"Applied {operation} boolean with {operand.name}")
             except Exception as e:
                 logging.error(f"Boolean operation failed: {e}")
+        
+        if before_mesh is not None:
+            push_mesh_snapshot(target, before_mesh, "boolean")
+            refit_proxy(target)
                 
     def duplicate_object(self, fingertips):
         """Create a duplicate of the selected object at the new finger position"""
@@ -1388,27 +1462,122 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                 deform_obj.select_set(True)
                 self.created_cube.select_set(True)
                 bpy.context.view_layer.objects.active = deform_obj
+                flush_proxy(deform_obj)
+                before_mesh = deform_obj.data.copy()
                 bpy.ops.object.join()
                 logging.info("Cube joined to DeformingMesh.")
                 self.created_cube = None
+                push_mesh_snapshot(deform_obj, before_mesh, "create")
+                refit_proxy(deform_obj)
                 
                 # Update original vertices reference after joining
                 global original_vertices
                 if deform_obj:
-                    original_vertices = [v.co.copy() for v in deform_obj.data.vertices]
+                    original_vertices = meshKernel.read_coords(deform_obj.data)
                     logging.info(f"Updated original_vertices reference with {len(original_vertices)} vertices")
         except Exception as e:
             logging.error(f"Failed to join cube: {e}")
             self.created_cube = None
 
     def cycle_remesh_type(self):
+        previous_index = self.current_remesh_index
         self.current_remesh_index = (self.current_remesh_index + 1) % len(REMESH_TYPES)
         new_type = REMESH_TYPES[self.current_remesh_index]
         mesh_obj = bpy.data.objects.get("DeformingMesh")
         if mesh_obj:
-            update_remesh_modifier(mesh_obj, new_type)
+            try:
+                update_remesh_modifier(mesh_obj, new_type)
+                # Undoable only once the modifier really changed; a push also drops the redo entries
+                undo_stack.push(Snapshot("remesh", previous_index, self.current_remesh_index))
+            except Exception as e:
+                logging.error(f"Error switching remesh type to {new_type}: {e}")
         logging.info(f"Switched remesh type to: {new_type}")
         return new_type
+
+    def begin_history_edit(self):
+        """Remember the DeformingMesh state as a gesture in a history mode starts"""
+        self.edit_state = capture_edit_state(bpy.data.objects.get(DEFORM_OBJ_NAME),
+                                             copy_mesh=self.history_mode in TOPOLOGY_MODES)
+
+    def finish_history_edit(self):
+        """Push what the gesture changed since begin_history_edit onto the undo stack"""
+        if self.edit_state is None:
+            return
+        push_edit(bpy.data.objects.get(DEFORM_OBJ_NAME), self.edit_state, self.history_mode)
+        self.edit_state = None
+
+    def restore_checkpoint(self):
+        """Put DeformingMesh back to its newest checkpoint that differs from it (itself undoable)"""
+        mesh_obj = bpy.data.objects.get(DEFORM_OBJ_NAME)
+        if not mesh_obj or mesh_obj.type != 'MESH':
+            return False
+        self.finish_history_edit()
+        state = capture_edit_state(mesh_obj)
+        if state is None:
+            return False
+        mesh = mesh_obj.data
+        checkpoint = deformation_history.rewind(state["coords"], state["transform"])
+        if checkpoint is None:
+            logging.info("Restore: no earlier checkpoint")
+            return False
+        if len(checkpoint.coords) != len(mesh.vertices):
+            logging.warning(f"Restore: checkpoint {checkpoint.label or 'interval'} was taken for {len(checkpoint.coords)} "
+                            f"vertices, mesh has {len(mesh.vertices)}; clearing checkpoints")
+            deformation_history.clear()
+            return False
+        meshKernel.write_coords(mesh, checkpoint.coords)
+        mesh_obj.matrix_world = mathutils.Matrix(checkpoint.transform)
+        push_edit(mesh_obj, state, "restore")
+        mesh_deformer.invalidate()
+        refit_proxy(mesh_obj)
+        global original_vertices
+        original_vertices = meshKernel.read_coords(mesh)
+        logging.info(f"Restored checkpoint {checkpoint.label or 'interval'} from {time.time() - checkpoint.time:.1f}s ago "
+                     f"({len(deformation_history)} checkpoints left)")
+        if self.history_mode in HISTORY_MODES:
+            self.begin_history_edit()
+        return True
+
+    def step_history(self, undo=True):
+        """Undo (or redo) the newest gesture edit on DeformingMesh"""
+        action = "Undo" if undo else "Redo"
+        mesh_obj = bpy.data.objects.get(DEFORM_OBJ_NAME)
+        if not mesh_obj or mesh_obj.type != 'MESH':
+            return False
+        self.finish_history_edit()
+        edit = undo_stack.undo() if undo else undo_stack.redo()
+        if edit is None:
+            logging.info(f"{action}: nothing to {action.lower()}")
+        else:
+            try:
+                if isinstance(edit, VertexDelta):
+                    mesh = mesh_obj.data
+                    if len(mesh.vertices) != edit.count:
+                        raise ValueError(f"{edit.label} was recorded for {edit.count} vertices, mesh has {len(mesh.vertices)}")
+                    coords = meshKernel.read_coords(mesh)
+                    transform = edit.undo(coords) if undo else edit.redo(coords)
+                    meshKernel.write_coords(mesh, coords)
+                    mesh_obj.matrix_world = mathutils.Matrix(transform)
+                elif edit.label == "remesh":
+                    self.current_remesh_index = edit.before if undo else edit.after
+                    update_remesh_modifier(mesh_obj, REMESH_TYPES[self.current_remesh_index])
+                elif undo:
+                    edit.after = mesh_obj.data
+                    mesh_obj.data = edit.before
+                else:
+                    edit.before = mesh_obj.data
+                    mesh_obj.data = edit.after
+                logging.info(f"{action}: {edit.label} ({len(undo_stack)} to undo, {len(undo_stack.redo_entries)} to redo)")
+            except Exception as e:
+                logging.error(f"{action} of {edit.label} failed, clearing undo history: {e}")
+                undo_stack.clear()
+            mesh_deformer.invalidate()
+            refit_proxy(mesh_obj)
+            global original_vertices
+            original_vertices = meshKernel.read_coords(mesh_obj.data)
+        if self.history_mode in HISTORY_MODES:
+            self.begin_history_edit()
+        return edit is not None
         
     def assign_material_to_selection(self, material_index=0):
         """Assign materials to vertices under influence of hand gestures"""
@@ -1515,7 +1684,7 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
             
         # Update transformation
         recenter_mesh(mesh_obj)
-        insert_deformation_keyframe(mesh_obj)
+        record_deformation_checkpoint(mesh_obj)
         
     def enable_snapping(self, snap_type="INCREMENT"):
         """Toggle different snapping modes with gestures"""
@@ -1703,9 +1872,6 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if not mesh:
             logging.error(f"Mesh data for {DEFORM_OBJ_NAME} is None")
             return
-        import bmesh
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
         finger_points = []
         for tip in fingertips:
             # Always use camera-relative mapping for consistent experience
@@ -1720,98 +1886,10 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if ENABLE_DEBUG_ORBS:
             self.update_fixed_debug_orbs(finger_points, self.finger_orbs, "fingerOrb", MAX_FINGER_ORBS)
             self.update_fixed_debug_orbs(anchor_points, self.anchor_orbs, "anchorOrb", MAX_ANCHOR_ORBS)
-        def smooth_falloff(distance, radius):
-            if distance >= radius:
-                return 0.0
-            normalized = distance / radius
-            return (1.0 - normalized**2)**2
-        world_matrix = mesh_obj.matrix_world
-        world_matrix_inv = world_matrix.inverted()
-        vertex_displacements = {}
-        for v in bm.verts:
-            v_world = world_matrix @ v.co
-            net_displacement = mathutils.Vector((0, 0, 0))
-            for finger_pos in finger_points:
-                to_finger = finger_pos - v_world
-                dist = to_finger.length
-                if dist < FINGER_INFLUENCE_RADIUS:
-                    falloff = smooth_falloff(dist, FINGER_INFLUENCE_RADIUS)
-                    direction = to_finger.normalized()
-                    force = direction * falloff * FINGER_FORCE_STRENGTH
-                    net_displacement += force
-            for anchor_pos in anchor_points:
-                to_anchor = anchor_pos - v_world
-                dist = to_anchor.length
-                if dist < FINGER_INFLUENCE_RADIUS * 1.2:
-                    falloff = smooth_falloff(dist, FINGER_INFLUENCE_RADIUS * 1.2)
-                    direction = to_anchor.normalized()
-                    force = direction * falloff * FINGER_FORCE_STRENGTH * ANCHOR_FORCE_MULTIPLIER
-                    net_displacement += force
-            if net_displacement.length > 0.0001:
-                if net_displacement.length > MAX_DISPLACEMENT_PER_FRAME:
-                    net_displacement = net_displacement.normalized() * MAX_DISPLACEMENT_PER_FRAME
-                vertex_displacements[v.index] = net_displacement
-            else:
-                vertex_displacements[v.index] = mathutils.Vector((0, 0, 0))
-        smoothed_displacements = {}
-        for v in bm.verts:
-            if v.index not in vertex_displacements:
-                continue
-            original_displacement = vertex_displacements[v.index]
-            neighbor_verts = [e.other_vert(v) for e in v.link_edges]
-            if not neighbor_verts:
-                smoothed_displacements[v.index] = original_displacement
-                continue
-            neighbor_avg = mathutils.Vector((0, 0, 0))
-            for nv in neighbor_verts:
-                if nv.index in vertex_displacements:
-                    neighbor_avg += vertex_displacements[nv.index]
-            if len(neighbor_verts) > 0:
-                neighbor_avg /= len(neighbor_verts)
-            smoothed_displacement = original_displacement.lerp(neighbor_avg, MASS_COHESION_FACTOR)
-            smoothed_displacements[v.index] = smoothed_displacement
-        for v in bm.verts:
-            if v.index in smoothed_displacements:
-                v_world = world_matrix @ v.co
-                v_world += smoothed_displacements[v.index] * DEFORM_TIMESTEP
-                v.co = world_matrix_inv @ v_world
-        bm.to_mesh(mesh)
-        mesh.update()
-        
-        try:
-            current_volume = compute_mesh_volume(mesh_obj)
-            volume_ratio = current_volume / original_volume
-            logging.debug(f"Current volume: {current_volume:.3f}, Ratio: {volume_ratio:.3f}")
-            
-            if volume_ratio < VOLUME_LOWER_LIMIT or volume_ratio > VOLUME_UPPER_LIMIT:
-                if volume_ratio < VOLUME_LOWER_LIMIT:
-                    target_ratio = VOLUME_LOWER_LIMIT
-                    logging.debug(f"Volume too small: {volume_ratio:.3f}, adjusting to {target_ratio:.3f}")
-                else:
-                    target_ratio = VOLUME_UPPER_LIMIT
-                    logging.debug(f"Volume too large: {volume_ratio:.3f}, adjusting to {target_ratio:.3f}")
-                scale_factor = (target_ratio / volume_ratio) ** (1/3)
-                bm_corrected = bmesh.new()
-                bm_corrected.from_mesh(mesh)
-                total = mathutils.Vector((0, 0, 0))
-                for v in bm_corrected.verts:
-                    total += v.co
-                centroid = total / len(bm_corrected.verts)
-                for v in bm_corrected.verts:
-                    v.co = centroid + (v.co - centroid) * scale_factor
-                bm_corrected.to_mesh(mesh)
-                mesh.update()
-                bm_corrected.free()
-                
-                corrected_volume = compute_mesh_volume(mesh_obj)
-                corrected_ratio = corrected_volume / original_volume
-                logging.debug(f"Volume after correction: {corrected_volume:.3f}, Ratio: {corrected_ratio:.3f}")
-        except Exception as e:
-            logging.error(f"Error during volume calculations/correction: {e}")
+        deform_vertices(mesh_obj, finger_points, anchor_points)
         
         recenter_mesh(mesh_obj)
-        bm.free()
-        insert_deformation_keyframe(mesh_obj)
+        record_deformation_checkpoint(mesh_obj)
 
     def modal(self, context, event):
         if event.type == 'ESC' and event.value == 'PRESS':
@@ -1870,15 +1948,22 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if event.type == 'V' and event.value == 'PRESS':
             self.use_velocity_forces = not self.use_velocity_forces
             logging.info(f"Velocity forces {'enabled' if self.use_velocity_forces else 'disabled'}")
+        if event.type == 'U' and event.value == 'PRESS':
+            self.step_history(undo=not event.shift)
+        if event.type == 'H' and event.value == 'PRESS':
+            self.restore_checkpoint()
         
         if event.type == 'TIMER':
             current_time = time.time()
             delta_time = current_time - self.last_rotation_update
             self.last_rotation_update = current_time
             
-            # Check for import_command.json file
+            # Hand finished background file work back to this thread
+            io_executor.drain()
+            
+            # Check for import_command.json file (unless the last one is still being removed)
             import_command_path = os.path.join(os.path.dirname(LIVE_DATA_FILE), "import_command.json")
-            if os.path.exists(import_command_path):
+            if not self.removing_import_command and os.path.exists(import_command_path):
                 try:
                     with open(import_command_path, 'r') as f:
                         import_command = json.load(f)
@@ -1933,6 +2018,8 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                             # Delete existing deformingMesh if it exists
                             existing_mesh = bpy.data.objects.get(DEFORM_OBJ_NAME)
                             if existing_mesh:
+                                flush_proxy(existing_mesh)
+                                release_proxy()
                                 # Save a copy to render collection if needed
                                 if render_collection:
                                     # Get iteration from import command
@@ -1960,6 +2047,9 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                                     if session_dir and os.path.isdir(session_dir):
                                         try:
                                             export_path = os.path.join(session_dir, f"{iteration_name}.glb")
+                                            # The exporter has to run here; it writes to local temp
+                                            # and the move to the session folder happens off-thread
+                                            staging_path = os.path.join(tempfile.gettempdir(), f"vibe_{os.getpid()}_{iteration_name}.glb")
                                             logging.info(f"Attempting to export to: {export_path}")
                                             
                                             # Select only the render object
@@ -1969,11 +2059,15 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                                             
                                             # Export as GLB
                                             bpy.ops.export_scene.gltf(
-                                                filepath=export_path,
+                                                filepath=staging_path,
                                                 use_selection=True,
                                                 export_format='GLB'
                                             )
-                                            logging.info(f"Successfully exported to: {export_path}")
+                                            io_executor.submit(
+                                                move_file, staging_path, export_path,
+                                                callback=lambda path: logging.info(f"Successfully exported to: {path}"),
+                                                lane="export"
+                                            )
                                         except Exception as e:
                                             logging.error(f"Error exporting GLB: {e}")
                                             import traceback
@@ -2034,6 +2128,21 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                                     except Exception as e:
                                         logging.error(f"Error calculating new original volume: {e}")
                                     
+                                    # Dense generated meshes get their proxy cage now rather than on the first deform tick
+                                    get_proxy(new_mesh)
+
+                                    # Undo entries, checkpoints and the rotation reference all
+                                    # describe the replaced mesh; start them over for this one
+                                    if self.edit_state is not None and self.edit_state["mesh"] is not None:
+                                        bpy.data.meshes.remove(self.edit_state["mesh"])
+                                    self.edit_state = None
+                                    undo_stack.clear()
+                                    deformation_history.clear()
+                                    mesh_deformer.invalidate()
+                                    global original_vertices
+                                    original_vertices = meshKernel.read_coords(new_mesh.data)
+                                    record_deformation_checkpoint(new_mesh, label="import", force=True)
+
                                     logging.info(f"Successfully set up {DEFORM_OBJ_NAME}")
                                 else:
                                     logging.error(f"Failed to import objects from {mesh_path}")
@@ -2045,11 +2154,13 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                             logging.error(f"Mesh path not found: {mesh_path}")
                     
                     # Remove the command file to avoid reprocessing
-                    try:
-                        os.remove(import_command_path)
-                        logging.info(f"Removed processed import command file")
-                    except Exception as e:
-                        logging.error(f"Error removing import command file: {e}")
+                    self.removing_import_command = True
+                    io_executor.submit(
+                        remove_file, import_command_path,
+                        callback=self.on_import_command_removed,
+                        error_callback=self.on_import_command_removed,
+                        lane="import_command"
+                    )
                 
                 except Exception as e:
                     logging.error(f"Error processing import command: {e}")
@@ -2079,6 +2190,17 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
             scale_axis = data.get("scale_axis", "XYZ")
             remesh_type = data.get("remesh_type", REMESH_TYPES[0])
             
+            # Undo/redo gestures arrive as running counts, so none is lost between ticks
+            undo_requests = data.get("undo_count", 0)
+            redo_requests = data.get("redo_count", 0)
+            if self.undo_requests is not None:
+                for _ in range(undo_requests - self.undo_requests):
+                    self.step_history(undo=True)
+                for _ in range(redo_requests - self.redo_requests):
+                    self.step_history(undo=False)
+            self.undo_requests = undo_requests
+            self.redo_requests = redo_requests
+            
             if command != self.last_command:
                 logging.debug(f"Command changed from '{self.last_command}' to '{command}'")
                 # Apply scale and reset reference when changing modes via gesture/voice
@@ -2111,10 +2233,21 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
             self.left_fingertips = left
             self.right_fingertips = right
             
+            # One-Euro filter plus prediction by the sample's age instead of a laggy EMA
+            # (skipped when the tracker already filtered the data)
+            fingertip_filter.reload_params()
+            timestamp = data.get("timestamp")
+            prefiltered = data.get("filtered", False)
             if self.right_fingertips:
-                self.smoothed_right_fingertips = self.smooth_points(self.right_fingertips, self.smoothed_right_fingertips)
+                self.smoothed_right_fingertips = (self.right_fingertips if prefiltered else
+                                                  fingertip_filter.update("right", self.right_fingertips, timestamp))
+            else:
+                fingertip_filter.reset("right")
             if self.left_fingertips:
-                self.smoothed_left_fingertips = self.smooth_points(self.left_fingertips, self.smoothed_left_fingertips)
+                self.smoothed_left_fingertips = (self.left_fingertips if prefiltered else
+                                                 fingertip_filter.update("left", self.left_fingertips, timestamp))
+            else:
+                fingertip_filter.reset("left")
                 
             if anchors_raw:
                 self._anchors = anchors_raw
@@ -2299,6 +2432,15 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                 self.join_created_cube()
                 logging.info("Joined cube to DeformingMesh when exiting create mode via prev_mode check")
             self.create_triggered = False
+        
+        # Checkpoint the mesh whenever a shaping gesture ends, and make it one undo step
+        if self.mode != self.history_mode:
+            if self.history_mode in HISTORY_MODES:
+                record_deformation_checkpoint(bpy.data.objects.get(DEFORM_OBJ_NAME), label=self.history_mode, force=True)
+                self.finish_history_edit()
+            self.history_mode = self.mode
+            if self.history_mode in HISTORY_MODES:
+                self.begin_history_edit()
             
         return {'PASS_THROUGH'}
 
@@ -2321,7 +2463,12 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         self.create_triggered = False
         self.created_cube = None
         self.prev_mode = self.mode
+        self.history_mode = self.mode
+        self.edit_state = None
+        self.undo_requests = None
+        self.redo_requests = None
         self.scale_start_thumb_z = None
+        self.removing_import_command = False
         mesh_obj = bpy.data.objects.get("DeformingMesh")
         if mesh_obj:
             try:
@@ -2329,7 +2476,7 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
             except Exception as e:
                 logging.error(f"Failed to recenter mesh in execute: {e}")
         logging.info("Real-time mesh update operator started.")
-        logging.info("Controls: ESC (cancel), D (deform), R (rotate), S (scale), C (create), A (anchor), M (cycle remesh), V (toggle velocity forces), Shift+R (render)")
+        logging.info("Controls: ESC (cancel), D (deform), R (rotate), S (scale), C (create), A (anchor), M (cycle remesh), V (toggle velocity forces), U / Shift+U (undo / redo), H (restore checkpoint), Shift+R (render)")
         return {'RUNNING_MODAL'}
 
     def cancel(self, context):
@@ -2345,12 +2492,29 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
         if self.mode == "create" and self.created_cube:
             self.join_created_cube()
             logging.info("Joined cube to DeformingMesh before cancelling as we were in create mode")
+        self.finish_history_edit()
+        flush_proxy(bpy.data.objects.get(DEFORM_OBJ_NAME))
+        release_proxy()
         
         # Hide scale info if visible
         self.hide_scale_info()
         cleanup_created_objects()
+        
+        # Let pending exports and file removals finish
+        io_executor.shutdown(wait=True)
+        io_executor.drain(budget=float("inf"))
+        # Kernel worker threads are started again on the next large mesh
+        meshKernel.kernel_pool.shutdown()
         return {'CANCELLED'}
 
+    def on_import_command_removed(self, result):
+        """Called on the main thread once import_command.json is gone"""
+        self.removing_import_command = False
+        if isinstance(result, Exception):
+            logging.error(f"Error removing import command file: {result}")
+        else:
+            logging.info(f"Removed processed import command file")
+
     def render_multiview(self):
         """Render multiple views using the RenderCam camera"""
         # We need to bypass the error that's occurring in this function
@@ -2365,6 +2529,7 @@ class REALTIME_OT_update_mesh(bpy.types.Operator):
                 return False
                 
             print("Creating snapshot of current DeformingMesh state")
+            flush_proxy(mesh_obj)
             
             # Create session directory with timestamp
             timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -2622,10 +2787,12 @@ def register():
     bpy.types.Scene.vibe_image_users = bpy.props.PointerProperty(type=ImageUserProperties)
     
     register_image_panel()
+    bpy.app.driver_namespace[FLUSH_PROXY_KEY] = flush_proxy
     logging.info("Registered VIBE Massing addon with image panel")
 
 def unregister():
     cleanup_created_objects()
+    bpy.app.driver_namespace.pop(FLUSH_PROXY_KEY, None)
     
     # Unregister the property group
     del bpy.types.Scene.vibe_image_users
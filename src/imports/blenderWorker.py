@@ -0,0 +1,244 @@
+import sys
+import json
+import time
+import queue
+import socket
+import secrets
+import logging
+import argparse
+import threading
+import subprocess
+import traceback
+from collections import deque
+from typing import Optional
+
+# Line printed by a headless worker once it is accepting jobs
+WORKER_READY_PREFIX = "VIBE_WORKER_READY"
+WORKER_FLAG = "--vibe-worker"
+WORKER_HOST = "127.0.0.1"
+
+
+def parse_worker_args(argv=None) -> Optional[dict]:
+    """Return serve_jobs() keyword arguments if Blender was started as a worker.
+
+    Blender passes everything after ``--`` through to the script, e.g.
+    ``blender -b scene.blend --python main.py -- --vibe-worker --token abc``.
+    """
+    argv = sys.argv if argv is None else argv
+    if "--" not in argv:
+        return None
+    script_args = argv[argv.index("--") + 1:]
+    if WORKER_FLAG not in script_args:
+        return None
+
+    parser = argparse.ArgumentParser(prog="main.py")
+    parser.add_argument(WORKER_FLAG, dest="worker", action="store_true")
+    parser.add_argument("--worker-id", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--token", default="")
+    args, _ = parser.parse_known_args(script_args)
+    return {"worker_id": args.worker_id, "port": args.port, "token": args.token}
+
+
+def _send(stream, message: dict):
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def serve_jobs(handlers: dict, worker_id: int = 0, port: int = 0, token: str = ""):
+    """Run jobs from a local socket until a shutdown request arrives.
+
+    Blocks the calling thread, which must be Blender's main thread since
+    the handlers call bpy. Requests and replies are JSON lines:
+    ``{"id", "token", "kind", "params"}`` -> ``{"id", "success", "message", ...}``.
+    Each handler takes the params dict and returns a dict with at least
+    ``success`` and ``message``.
+    """
+    server = socket.create_server((WORKER_HOST, port))
+    print(f"{WORKER_READY_PREFIX} id={worker_id} port={server.getsockname()[1]}", flush=True)
+    logging.info(f"Blender worker {worker_id} listening on port {server.getsockname()[1]}")
+
+    running = True
+    with server:
+        while running:
+            conn, _ = server.accept()
+            with conn, conn.makefile("rwb") as stream:
+                for line in stream:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        _send(stream, {"success": False, "message": "Malformed request"})
+                        continue
+
+                    reply = {"id": request.get("id"), "worker_id": worker_id}
+                    if request.get("token") != token:
+                        _send(stream, dict(reply, success=False, message="Invalid worker token"))
+                        break
+
+                    kind = request.get("kind")
+                    if kind == "shutdown":
+                        _send(stream, dict(reply, success=True, message="Shutting down"))
+                        running = False
+                        break
+                    if kind == "ping":
+                        _send(stream, dict(reply, success=True, message="pong"))
+                        continue
+
+                    handler = handlers.get(kind)
+                    start_time = time.perf_counter()
+                    try:
+                        if handler is None:
+                            result = {"success": False, "message": f"Unknown job: {kind}"}
+                        else:
+                            result = handler(request.get("params") or {})
+                    except Exception as e:
+                        logging.error(f"Worker job {kind} failed: {e}")
+                        logging.error(traceback.format_exc())
+                        result = {"success": False, "message": f"ERROR: {str(e)}"}
+                    result["seconds"] = round(time.perf_counter() - start_time, 3)
+                    _send(stream, dict(reply, **result))
+    logging.info(f"Blender worker {worker_id} stopped")
+
+
+class BlenderWorker:
+    """One long-lived ``blender --background`` process serving jobs"""
+
+    def __init__(self, blender_path: str, script_path: str, worker_id: int = 0,
+                 blend_file: Optional[str] = None, startup_timeout: float = 120.0, on_output=None):
+        self.blender_path = blender_path
+        self.script_path = script_path
+        self.worker_id = worker_id
+        self.blend_file = blend_file
+        self.startup_timeout = startup_timeout
+        self.on_output = on_output
+        self.output = deque(maxlen=200)
+        self.process = None
+        self._token = ""
+        self._port = None
+        self._ready = threading.Event()
+        self._sock = None
+        self._stream = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None and self._stream is not None
+
+    def start(self):
+        """Launch Blender and connect once the add-on reports it is ready"""
+        self._token = secrets.token_hex(16)
+        self._ready.clear()
+        command = [self.blender_path, "--background"]
+        if self.blend_file:
+            command.append(self.blend_file)
+        command += ["--python", self.script_path, "--", WORKER_FLAG,
+                    "--worker-id", str(self.worker_id), "--token", self._token]
+
+        self.process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+        if not self._ready.wait(self.startup_timeout) or self._port is None:
+            self.close()
+            raise RuntimeError(f"Blender worker {self.worker_id} did not start: " + " | ".join(list(self.output)[-5:]))
+
+        self._sock = socket.create_connection((WORKER_HOST, self._port))
+        self._stream = self._sock.makefile("rwb")
+        logging.info(f"Blender worker {self.worker_id} ready on port {self._port}")
+
+    def _read_output(self):
+        """Drain Blender's stdout so it never blocks, watching for the ready line"""
+        process = self.process
+        for line in process.stdout:
+            line = line.rstrip()
+            self.output.append(line)
+            if line.startswith(WORKER_READY_PREFIX):
+                for field in line.split()[1:]:
+                    name, _, value = field.partition("=")
+                    if name == "port":
+                        self._port = int(value)
+                self._ready.set()
+            elif self.on_output:
+                self.on_output(self.worker_id, line)
+        self._ready.set()  # Process exited, unblock start()
+
+    def run_job(self, kind: str, params: Optional[dict] = None) -> dict:
+        """Send one job and wait for its reply"""
+        with self._lock:
+            if not self.is_alive:
+                raise ConnectionError(f"Blender worker {self.worker_id} is not running")
+            self._next_id += 1
+            job_id = self._next_id
+            _send(self._stream, {"id": job_id, "token": self._token, "kind": kind, "params": params or {}})
+            line = self._stream.readline()
+            if not line:
+                raise ConnectionError(f"Blender worker {self.worker_id} closed the connection")
+            reply = json.loads(line)
+            if reply.get("id") != job_id:
+                raise ConnectionError(f"Blender worker {self.worker_id} answered job {reply.get('id')} instead of {job_id}")
+            return reply
+
+    def close(self, timeout: float = 10.0):
+        """Ask the worker to shut down, killing it if it does not exit"""
+        try:
+            if self.is_alive:
+                self.run_job("shutdown")
+        except (OSError, ValueError):
+            pass
+        for resource in (self._stream, self._sock):
+            try:
+                if resource:
+                    resource.close()
+            except OSError:
+                pass
+        self._stream = self._sock = None
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class BlenderWorkerPool:
+    """Fixed set of headless Blender workers, started lazily.
+
+    ``run_job`` blocks until a worker is free, so it should be called from
+    a background thread. A worker that died is restarted and the job is
+    retried once on it.
+    """
+
+    def __init__(self, blender_path: str, script_path: str, size: int = 1,
+                 blend_file: Optional[str] = None, on_output=None):
+        self.workers = [BlenderWorker(blender_path, script_path, worker_id=i,
+                                      blend_file=blend_file, on_output=on_output)
+                        for i in range(max(1, size))]
+        self._idle = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    def run_job(self, kind: str, params: Optional[dict] = None) -> dict:
+        worker = self._idle.get()
+        try:
+            for attempt in range(2):
+                try:
+                    if not worker.is_alive:
+                        worker.close()
+                        worker.start()
+                    return worker.run_job(kind, params)
+                except (ConnectionError, OSError, ValueError) as e:
+                    logging.warning(f"Blender worker {worker.worker_id} failed ({e}), restarting")
+                    worker.close(timeout=2.0)
+                    if attempt:
+                        raise
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
@@ -0,0 +1,316 @@
+import os
+import glob
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Journal files shared by the UI and Blender (relative to the project root)
+JOURNAL_DIR_NAME = "journal"
+COMMANDS_JOURNAL_NAME = "commands.jsonl"
+COMPLETIONS_JOURNAL_NAME = "completions.jsonl"
+# Bytes every reader has committed past before the journal is rewritten without them
+COMPACT_BYTES = 256 * 1024
+
+
+def new_key() -> str:
+    """Return a fresh idempotency key"""
+    return uuid.uuid4().hex
+
+
+def journal_paths(base_dir: str):
+    """Return the (commands, completions) journal paths under base_dir"""
+    journal_dir = os.path.join(base_dir, JOURNAL_DIR_NAME)
+    return (os.path.join(journal_dir, COMMANDS_JOURNAL_NAME),
+            os.path.join(journal_dir, COMPLETIONS_JOURNAL_NAME))
+
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """Exclusive inter-process lock held on a sidecar file"""
+    with open(lock_path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomic(path: str, text: str):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_header(f):
+    """(base, base_seq, header length) of an open journal file.
+
+    A compacted journal starts with a ``{"base": ..., "base_seq": ...}``
+    line: the logical offset of its first record and the last seq dropped.
+    Offsets handed out by the journal are logical (they survive compaction);
+    a journal that was never compacted has base 0 and no header.
+    """
+    f.seek(0)
+    first = f.readline()
+    if first.startswith(b'{"base"') and first.endswith(b"\n"):
+        try:
+            header = json.loads(first)
+            return int(header["base"]), int(header.get("base_seq", 0)), len(first)
+        except (ValueError, KeyError, TypeError):
+            pass
+    return 0, 0, 0
+
+
+class CommandJournal:
+    """Append-only, sequence-numbered JSON-lines journal.
+
+    Every record carries a monotonically increasing ``seq`` and an
+    idempotency ``key``. Appending a key that is already in the journal
+    returns the existing record instead of writing a duplicate, so a
+    producer can safely retry after a crash. Writers serialise on a
+    sidecar lock file; readers never need the lock because they only
+    consume complete (newline-terminated) lines. Instances are safe to
+    share between threads.
+
+    Once every JournalReader has committed more than COMPACT_BYTES, an
+    append rewrites the file without the consumed records (and their keys
+    are forgotten); offsets stay valid because they are logical.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.last_seq = 0
+        self.base_seq = 0
+        self._keys = {}
+        self._scanned = 0
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._catch_up()
+
+    def _catch_up(self):
+        """Index records appended (by any process) since the last scan"""
+        with self._lock:
+            records, end = self.read_from(self._scanned)
+            for record, _ in records:
+                self.last_seq = max(self.last_seq, record["seq"])
+                self._keys[record["key"]] = record
+            self._scanned = end
+
+    def _forget(self, base_seq: int):
+        """Drop the keys of records compacted away (up to base_seq)"""
+        if base_seq > self.base_seq:
+            self.base_seq = base_seq
+            self._keys = {key: record for key, record in self._keys.items() if record["seq"] > base_seq}
+
+    def read_from(self, offset: int):
+        """Return ([(record, end_offset), ...], scanned_offset) for complete lines after offset"""
+        try:
+            with open(self.path, "rb") as f:
+                base, base_seq, start = _read_header(f)
+                # An offset from before the last compaction rereads what is left
+                f.seek(start + max(offset - base, 0))
+                position = base + max(offset - base, 0)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        with self._lock:
+            self._forget(base_seq)
+
+        records = []
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Partially written line, pick it up next time
+            position += len(line)
+            try:
+                record = json.loads(line)
+                if "seq" in record and "key" in record:
+                    records.append((record, position))
+            except ValueError:
+                if line.strip():
+                    logging.warning(f"Skipping corrupt journal line in {self.path} at offset {position - len(line)}")
+        return records, position
+
+    def end_offset(self) -> int:
+        """Logical offset of the end of the file"""
+        try:
+            with open(self.path, "rb") as f:
+                base, _, start = _read_header(f)
+                return base + f.seek(0, os.SEEK_END) - start
+        except FileNotFoundError:
+            return 0
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the record stored under key, if any"""
+        record = self._keys.get(key)
+        if record is None:
+            self._catch_up()
+            record = self._keys.get(key)
+        return record
+
+    def contains(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def append(self, kind: str, payload: Optional[dict] = None, key: Optional[str] = None, **fields) -> dict:
+        """Append a single record and return it"""
+        return self.append_batch([dict(fields, kind=kind, payload=payload or {}, key=key)])[0]
+
+    def append_batch(self, entries) -> list:
+        """Append several records with a single write.
+
+        Each entry is a dict with at least ``kind``; ``payload``, ``key``
+        and any extra fields are optional. Returns the stored records in
+        the same order, reusing existing ones for keys already present.
+        """
+        stored = []
+        with self._lock, _file_lock(self.lock_path):
+            self._catch_up()
+            lines = []
+            batch_keys = {}
+            for entry in entries:
+                key = entry.get("key") or new_key()
+                existing = self._keys.get(key) or batch_keys.get(key)
+                if existing:
+                    stored.append(existing)
+                    continue
+                self.last_seq += 1
+                record = dict(entry, seq=self.last_seq, key=key, ts=time.time())
+                record.setdefault("payload", {})
+                lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+                batch_keys[key] = record
+                stored.append(record)
+
+            if lines:
+                torn = self.end_offset() > self._scanned
+                with open(self.path, "ab") as f:
+                    # Terminate a line left torn by a crashed writer so ours stays parseable
+                    if torn:
+                        f.write(b"\n")
+                    f.write("".join(lines).encode("utf-8"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._catch_up()
+                self._compact()
+        return stored
+
+    def committed_offset(self) -> int:
+        """Lowest offset committed by every reader of this journal (0 if there are none)"""
+        offsets = []
+        for path in glob.glob(glob.escape(self.path) + ".*.offset"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    offsets.append(int(json.load(f).get("offset", 0)))
+            except (OSError, ValueError, TypeError, AttributeError):
+                return 0  # Unreadable reader state: keep everything
+        return min(offsets) if offsets else 0
+
+    def _compact(self):
+        """Rewrite the file without records every reader has consumed (caller holds both locks)"""
+        cut = self.committed_offset()
+        try:
+            with open(self.path, "rb") as f:
+                base, _, start = _read_header(f)
+                if cut - base < COMPACT_BYTES:
+                    return
+                f.seek(start + cut - base)
+                rest = f.read()
+        except FileNotFoundError:
+            return
+        dropped, _ = self.read_from(base)
+        base_seq = max([record["seq"] for record, end in dropped if end <= cut], default=self.base_seq)
+        header = json.dumps({"base": cut, "base_seq": base_seq}, separators=(",", ":")) + "\n"
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header.encode("utf-8") + rest)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Windows refuses while a reader has the file open; the next append retries
+            logging.debug(f"Journal compaction of {self.path} postponed: {e}")
+            os.remove(tmp_path)
+            return
+        self._forget(base_seq)
+        logging.info(f"Compacted {self.path}: dropped {cut - base} bytes up to #{base_seq}")
+
+
+class JournalReader:
+    """Consumer of a CommandJournal with a persisted offset.
+
+    Records are handed out in sequence order and only skipped once
+    ``commit`` has been called for them, so a crash before the commit
+    replays the record. Consumers pair this with an idempotency check
+    (e.g. "is there already a completion for this key?") to avoid
+    repeating side effects.
+    """
+
+    def __init__(self, journal: CommandJournal, consumer: str):
+        self.journal = journal
+        self.consumer = consumer
+        self.offset_path = f"{journal.path}.{consumer}.offset"
+        self.offset = 0
+        self.seq = 0
+        self._ends = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.offset_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.offset = int(state.get("offset", 0))
+            self.seq = int(state.get("seq", 0))
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError) as e:
+            logging.warning(f"Resetting unreadable journal offset {self.offset_path}: {e}")
+            self.offset, self.seq = 0, 0
+
+    def pending(self) -> list:
+        """Return uncommitted records in sequence order"""
+        if self.offset > self.journal.end_offset():
+            logging.warning(f"Journal {self.journal.path} shrank below the {self.consumer} offset, rereading it")
+            self.offset, self.seq = 0, 0
+
+        with self._lock:
+            records, _ = self.journal.read_from(self.offset)
+            result = []
+            for record, end in records:
+                if record["seq"] <= self.seq:
+                    continue
+                self._ends[record["seq"]] = end
+                result.append(record)
+        return result
+
+    def commit(self, record: dict):
+        """Mark record (and everything before it) as consumed"""
+        with self._lock:
+            end = self._ends.pop(record["seq"], None)
+            if end is None or record["seq"] <= self.seq:
+                return
+            self.offset, self.seq = end, record["seq"]
+            for seq in [s for s in self._ends if s <= self.seq]:
+                del self._ends[seq]
+            _write_atomic(self.offset_path, json.dumps({"offset": self.offset, "seq": self.seq}))
@@ -0,0 +1,266 @@
+"""Bounded history of mesh states, kept outside Blender's animation system.
+
+The modal operator used to insert location/rotation/scale keyframes after
+every deform, scale and rotate tick. This keeps vertex checkpoints instead:
+at most one every ``interval`` seconds while the mesh keeps changing, plus
+one whenever a gesture ends, with identical consecutive states merged.
+Checks between checkpoints are O(1), and the number of checkpoints and
+their total size are capped, so long sessions cost no more per tick and
+no more memory than short ones.
+
+UndoStack keeps the gesture edits themselves for undo/redo: compressed,
+quantized vertex deltas for edits that only move vertices, and full
+snapshots for edits that change topology.
+"""
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+# Seconds between automatic checkpoints while the mesh keeps changing
+CHECKPOINT_INTERVAL = 2.0
+# Checkpoints kept; the oldest are dropped first
+MAX_CHECKPOINTS = 64
+# Upper bound for the vertex data held by all checkpoints together
+MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+class Checkpoint:
+    """One recorded state: local vertex coordinates plus the object matrix"""
+
+    __slots__ = ("time", "label", "coords", "transform")
+
+    def __init__(self, time_: float, label: str, coords: np.ndarray, transform: tuple):
+        self.time = time_
+        self.label = label
+        self.coords = coords
+        self.transform = transform
+
+    @property
+    def nbytes(self) -> int:
+        return self.coords.nbytes
+
+    def matches(self, coords: np.ndarray, transform: tuple) -> bool:
+        return (self.transform == transform and self.coords.shape == coords.shape
+                and np.array_equal(self.coords, coords))
+
+
+class DeformationHistory:
+    """Rate-limited, size-bounded list of Checkpoints (oldest first)"""
+
+    def __init__(self, interval: float = CHECKPOINT_INTERVAL, max_checkpoints: int = MAX_CHECKPOINTS,
+                 memory_budget: int = MEMORY_BUDGET):
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+        self.memory_budget = memory_budget
+        self.checkpoints = deque()
+        self.nbytes = 0
+        self._last_time = float("-inf")
+
+    def __len__(self):
+        return len(self.checkpoints)
+
+    def due(self, now: float = None) -> bool:
+        """Whether an automatic checkpoint should be taken now"""
+        now = time.time() if now is None else now
+        return now - self._last_time >= self.interval
+
+    def latest(self):
+        return self.checkpoints[-1] if self.checkpoints else None
+
+    def record(self, coords: np.ndarray, transform: tuple, label: str = "", now: float = None) -> bool:
+        """Store a checkpoint; returns False if it was merged into an identical latest one"""
+        now = time.time() if now is None else now
+        self._last_time = now
+        latest = self.latest()
+        if latest is not None and latest.matches(coords, transform):
+            latest.time = now
+            latest.label = label or latest.label
+            return False
+        checkpoint = Checkpoint(now, label, np.array(coords, dtype=np.float32), transform)
+        self.checkpoints.append(checkpoint)
+        self.nbytes += checkpoint.nbytes
+        self._trim()
+        return True
+
+    def rewind(self, coords: np.ndarray, transform: tuple):
+        """Newest checkpoint that differs from the current state (coords, transform);
+        the checkpoints identical to the current state are dropped first"""
+        while self.checkpoints and self.checkpoints[-1].matches(coords, transform):
+            self.nbytes -= self.checkpoints.pop().nbytes
+        return self.latest()
+
+    def clear(self):
+        self.checkpoints.clear()
+        self.nbytes = 0
+        self._last_time = float("-inf")
+
+    def _trim(self):
+        while len(self.checkpoints) > 1 and (len(self.checkpoints) > self.max_checkpoints
+                                             or self.nbytes > self.memory_budget):
+            self.nbytes -= self.checkpoints.popleft().nbytes
+
+
+# ----------------------------------------------------------------
+# Undo/redo for gesture edits
+# ----------------------------------------------------------------
+
+# Edits kept on the undo stack; the oldest are evicted first
+UNDO_MAX_EDITS = 100
+# Upper bound for everything held by the undo and redo stacks together
+UNDO_MEMORY_BUDGET = 64 * 1024 * 1024
+# Largest error (object units) a quantized vertex delta may introduce;
+# edits that would need a coarser step are stored as float32
+UNDO_TOLERANCE = 1e-5
+# zlib level for stored arrays: fast, and deltas are mostly zeros anyway
+UNDO_COMPRESSION = 1
+
+
+def _pack(array: np.ndarray) -> tuple:
+    return zlib.compress(np.ascontiguousarray(array).tobytes(), UNDO_COMPRESSION), array.dtype.str, array.shape
+
+
+def _unpack(packed: tuple) -> np.ndarray:
+    data, dtype, shape = packed
+    return np.frombuffer(zlib.decompress(data), dtype=dtype).reshape(shape)
+
+
+class VertexDelta:
+    """Coordinate (and object matrix) change of one edit with unchanged topology.
+
+    Only the moved vertices are kept: their indices as gaps, their offsets
+    as int16 steps of max|offset|/32767 (float32 if that step would exceed
+    the tolerance), both zlib-compressed.
+    """
+
+    def __init__(self, label: str, before: np.ndarray, after: np.ndarray,
+                 transform_before: tuple = None, transform_after: tuple = None,
+                 tolerance: float = UNDO_TOLERANCE):
+        self.label = label
+        self.count = len(after)
+        self.transform_before = transform_before
+        self.transform_after = transform_after
+        offsets = np.subtract(after, before, dtype=np.float32)
+        moved = np.flatnonzero(np.any(offsets != 0.0, axis=1))
+        offsets = offsets[moved]
+        self.moved = len(moved)
+        self._indices = _pack(np.diff(moved, prepend=0).astype(np.uint32))
+        peak = float(np.abs(offsets).max()) if len(offsets) else 0.0
+        self.step = peak / 32767.0
+        if 0.0 < self.step <= 2.0 * tolerance:
+            offsets = np.rint(offsets / self.step).astype(np.int16)
+        else:
+            self.step = 0.0
+        self._offsets = _pack(offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._indices[0]) + len(self._offsets[0])
+
+    @property
+    def empty(self) -> bool:
+        return self.moved == 0 and self.transform_before == self.transform_after
+
+    def _decode(self):
+        indices = np.cumsum(_unpack(self._indices), dtype=np.int64)
+        offsets = _unpack(self._offsets)
+        if self.step:
+            offsets = offsets * np.float32(self.step)
+        return indices, offsets
+
+    def undo(self, coords: np.ndarray) -> tuple:
+        """Revert coords in place; returns the object matrix to restore"""
+        indices, offsets = self._decode()
+        coords[indices] -= offsets
+        return self.transform_before
+
+    def redo(self, coords: np.ndarray) -> tuple:
+        indices, offsets = self._decode()
+        coords[indices] += offsets
+        return self.transform_after
+
+
+class Snapshot:
+    """Full before/after states for edits that change topology (or settings).
+
+    The states are opaque to the stack (mesh copies, remesh settings, ...);
+    whoever pushes the edit restores them and frees them through release.
+    """
+
+    def __init__(self, label: str, before, after, nbytes: int = 0, release=None):
+        self.label = label
+        self.before = before
+        self.after = after
+        self.nbytes = nbytes
+        self._release = release
+
+    def release(self):
+        if self._release:
+            self._release(self)
+            self._release = None
+
+
+class UndoStack:
+    """Undo and redo stacks of VertexDelta/Snapshot edits under one memory budget.
+
+    Pushing an edit drops everything that could be redone; going over
+    max_edits or memory_budget evicts the oldest undo entries.
+    """
+
+    def __init__(self, max_edits: int = UNDO_MAX_EDITS, memory_budget: int = UNDO_MEMORY_BUDGET):
+        self.max_edits = max_edits
+        self.memory_budget = memory_budget
+        self.undo_entries = deque()
+        self.redo_entries = []
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self.undo_entries)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.undo_entries)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.redo_entries)
+
+    def push(self, edit) -> bool:
+        """Add an edit; returns False (and keeps nothing) for an empty VertexDelta"""
+        if getattr(edit, "empty", False):
+            return False
+        while self.redo_entries:
+            self._drop(self.redo_entries.pop())
+        self.undo_entries.append(edit)
+        self.nbytes += edit.nbytes
+        while len(self.undo_entries) > 1 and (len(self.undo_entries) > self.max_edits
+                                              or self.nbytes > self.memory_budget):
+            self._drop(self.undo_entries.popleft())
+        return True
+
+    def undo(self):
+        """Move the newest edit to the redo stack and return it (None if there is none)"""
+        if not self.undo_entries:
+            return None
+        edit = self.undo_entries.pop()
+        self.redo_entries.append(edit)
+        return edit
+
+    def redo(self):
+        if not self.redo_entries:
+            return None
+        edit = self.redo_entries.pop()
+        self.undo_entries.append(edit)
+        return edit
+
+    def clear(self):
+        while self.redo_entries:
+            self._drop(self.redo_entries.pop())
+        while self.undo_entries:
+            self._drop(self.undo_entries.pop())
+
+    def _drop(self, edit):
+        self.nbytes -= edit.nbytes
+        if isinstance(edit, Snapshot):
+            edit.release()
@@ -0,0 +1,40 @@
+import os
+import time
+
+# "full" draws every frame, "preview" at most preview_fps, "none" never (headless)
+DISPLAY_MODES = ("full", "preview", "none")
+DEFAULT_DISPLAY_MODE = os.environ.get("VIBE_DISPLAY", "full")
+DEFAULT_PREVIEW_FPS = float(os.environ.get("VIBE_PREVIEW_FPS", "10"))
+
+
+class DisplayThrottle:
+    """Decide which frames get drawn and shown.
+
+    Tracking and publishing never wait on this; it only gates the
+    landmark drawing, overlays and imshow calls, so in preview mode most
+    frames skip the drawing entirely and in headless mode no window is
+    ever created.
+    """
+
+    def __init__(self, mode: str = DEFAULT_DISPLAY_MODE, preview_fps: float = DEFAULT_PREVIEW_FPS):
+        if mode not in DISPLAY_MODES:
+            raise ValueError(f"Unknown display mode {mode!r}, expected one of {', '.join(DISPLAY_MODES)}")
+        self.mode = mode
+        self.interval = 1.0 / preview_fps if preview_fps > 0 else 0.0
+        self._last = 0.0
+
+    @property
+    def headless(self) -> bool:
+        return self.mode == "none"
+
+    def due(self, now: float = None) -> bool:
+        """Whether the current frame should be drawn"""
+        if self.mode == "full":
+            return True
+        if self.mode == "none":
+            return False
+        now = time.perf_counter() if now is None else now
+        if now - self._last >= self.interval:
+            self._last = now
+            return True
+        return False
@@ -0,0 +1,134 @@
+import os
+import json
+import math
+import time
+import logging
+
+# Defaults for normalised (0..1) image coordinates. They can be changed at
+# runtime with FingertipFilter.configure() or by editing the params file.
+DEFAULT_PARAMS = {
+    "enabled": True,
+    "min_cutoff": 1.5,     # Hz, smoothing when the hand is still (lower = smoother)
+    "beta": 3.0,           # Cutoff increase per unit/s of speed (higher = less lag when moving)
+    "d_cutoff": 1.0,       # Hz, smoothing of the velocity estimate
+    "prediction": 1.0,     # Fraction of the measured latency to extrapolate (0 = no prediction)
+    "latency": 0.05,       # Seconds assumed when the data carries no timestamp
+    "max_horizon": 0.12,   # Never extrapolate further than this (seconds)
+    "reset_after": 0.5,    # Forget a track after this long without new samples
+}
+PARAMS_ENV = "VIBE_FILTER_PARAMS"
+
+
+def _alpha(cutoff: float, dt: float) -> float:
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """One-Euro filter (Casiez et al.) for a single scalar signal"""
+
+    def __init__(self, params: dict):
+        self.params = params
+        self.value = None
+        self.velocity = 0.0
+        self._raw = None
+
+    def __call__(self, value: float, dt: float) -> float:
+        if self.value is None:
+            self.value = self._raw = value
+            return value
+        if dt <= 0:
+            return self.value
+        # Velocity from the raw samples, so it is not inflated by the filter's own lag
+        raw_velocity = (value - self._raw) / dt
+        self._raw = value
+        self.velocity += _alpha(self.params["d_cutoff"], dt) * (raw_velocity - self.velocity)
+        cutoff = self.params["min_cutoff"] + self.params["beta"] * abs(self.velocity)
+        self.value += _alpha(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class FingertipFilter:
+    """Per-fingertip One-Euro smoothing with latency-compensating prediction.
+
+    ``update(key, points, timestamp)`` takes a hand's fingertips as dicts
+    with x/y/z (other keys are passed through) and returns filtered copies
+    extrapolated along the filtered velocity by the age of the sample
+    (``now - timestamp``, i.e. the measured pipeline latency), so a
+    consumer draws where the hand is now rather than where it was when the
+    camera saw it. Calling update again with the same timestamp only
+    re-extrapolates, which keeps fast consumers moving between tracker
+    frames.
+
+    Parameters come from DEFAULT_PARAMS, then the JSON file named by
+    params_file (or $VIBE_FILTER_PARAMS), which is re-read whenever it
+    changes, then configure().
+    """
+
+    def __init__(self, params_file: str = None, **params):
+        self.params = dict(DEFAULT_PARAMS)
+        self.params_file = params_file or os.environ.get(PARAMS_ENV)
+        self._params_mtime = None
+        self._overrides = dict(params)
+        self._tracks = {}
+        self.reload_params()
+
+    def configure(self, **params):
+        """Change parameters at runtime (unknown names are ignored)"""
+        self._overrides.update({k: v for k, v in params.items() if k in DEFAULT_PARAMS})
+        self.params.update(self._overrides)
+
+    def reload_params(self):
+        """Re-read the params file if it changed since the last read"""
+        if self.params_file:
+            try:
+                mtime = os.path.getmtime(self.params_file)
+                if mtime != self._params_mtime:
+                    self._params_mtime = mtime
+                    with open(self.params_file, "r") as f:
+                        loaded = json.load(f)
+                    self.params.update({k: v for k, v in loaded.items() if k in DEFAULT_PARAMS})
+                    logging.info(f"Loaded fingertip filter params from {self.params_file}")
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not read fingertip filter params {self.params_file}: {e}")
+        self.params.update(self._overrides)
+
+    def reset(self, key: str = None):
+        if key is None:
+            self._tracks.clear()
+        else:
+            self._tracks.pop(key, None)
+
+    def update(self, key: str, points, timestamp: float = None, now: float = None) -> list:
+        if not points:
+            self._tracks.pop(key, None)
+            return []
+        if not self.params["enabled"]:
+            return [dict(p) for p in points]
+
+        now = time.time() if now is None else now
+        sample_time = now if timestamp is None else timestamp
+        track = self._tracks.get(key)
+        if (track is None or len(track["filters"]) != len(points)
+                or sample_time - track["time"] > self.params["reset_after"]):
+            track = {"time": None, "filters": [[OneEuroFilter(self.params) for _ in range(3)] for _ in points]}
+            self._tracks[key] = track
+
+        if sample_time != track["time"]:
+            dt = 0.0 if track["time"] is None else sample_time - track["time"]
+            for filters, point in zip(track["filters"], points):
+                for axis_filter, axis in zip(filters, ("x", "y", "z")):
+                    axis_filter(float(point.get(axis, 0.0)), dt)
+            track["time"] = sample_time
+
+        age = (now - timestamp) if timestamp is not None else self.params["latency"]
+        horizon = min(max(age, 0.0) * self.params["prediction"], self.params["max_horizon"])
+        result = []
+        for filters, point in zip(track["filters"], points):
+            filtered = dict(point)
+            for axis_filter, axis in zip(filters, ("x", "y", "z")):
+                filtered[axis] = axis_filter.value + axis_filter.velocity * horizon
+            result.append(filtered)
+        return result
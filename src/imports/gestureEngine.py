@@ -0,0 +1,133 @@
+import numpy as np
+
+# MediaPipe hand landmark indices
+WRIST = 0
+FINGER_NAMES = ["thumb", "index", "middle", "ring", "pinky"]
+FINGER_CHAINS = np.array([
+    [1, 2, 3, 4],      # thumb: CMC, MCP, IP, tip
+    [5, 6, 7, 8],      # index: MCP, PIP, DIP, tip
+    [9, 10, 11, 12],   # middle
+    [13, 14, 15, 16],  # ring
+    [17, 18, 19, 20],  # pinky
+])
+BASES = FINGER_CHAINS[:, 0]
+TIPS = FINGER_CHAINS[:, 3]
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+
+# Touch thresholds in normalised image units
+TOUCH_DISTANCE = 0.05
+THUMB_MIDDLE_DISTANCE = 0.08
+PINKY_PINKY_DISTANCE = 0.08
+SCALE_AXIS_MIN_OFFSET = 0.1
+
+
+def landmarks_to_array(hand_landmarks) -> np.ndarray:
+    """Return a hand's 21 MediaPipe landmarks as a (21, 3) float array"""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float64)
+
+
+class HandFeatures:
+    """Everything the gesture predicates need, computed once per hand per frame.
+
+    ``points`` are the 21 landmarks, ``tip_distances`` the 5x5 fingertip
+    distance matrix (thumb, index, middle, ring, pinky) and
+    ``joint_angles`` the bend at the two middle joints of every finger in
+    degrees (0 = straight).
+    """
+
+    def __init__(self, points: np.ndarray):
+        self.points = points
+        self.wrist = points[WRIST]
+        self.tips = points[TIPS]
+        self.bases = points[BASES]
+        delta = self.tips[:, None, :] - self.tips[None, :, :]
+        self.tip_distances = np.sqrt((delta * delta).sum(axis=-1))
+
+        chains = points[FINGER_CHAINS]                      # (5, 4, 3)
+        segments = np.diff(chains, axis=1)                  # (5, 3, 3)
+        norms = np.linalg.norm(segments, axis=-1) + 1e-9
+        cosines = (segments[:, :-1] * segments[:, 1:]).sum(axis=-1) / (norms[:, :-1] * norms[:, 1:])
+        self.joint_angles = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0)))  # (5, 2)
+
+    @classmethod
+    def from_landmarks(cls, hand_landmarks):
+        return cls(landmarks_to_array(hand_landmarks))
+
+    def wrist_rotation(self) -> float:
+        """Angle (degrees) of the wrist -> middle knuckle direction in the image"""
+        dx, dy = self.bases[MIDDLE, :2] - self.wrist[:2]
+        return float(np.degrees(np.arctan2(dy, dx)))
+
+    def scale_axis(self) -> str:
+        """Dominant axis of the wrist -> middle fingertip offset"""
+        offset = np.abs(self.tips[MIDDLE] - self.wrist)
+        if offset.max() < SCALE_AXIS_MIN_OFFSET:
+            return "XYZ"
+        return "XYZ"[int(offset.argmax())]
+
+    def midpoint(self, a: int, b: int) -> dict:
+        x, y, z = (self.tips[a] + self.tips[b]) / 2.0
+        return {"x": float(x), "y": float(y), "z": float(z)}
+
+
+# Gesture predicates over HandFeatures; adding one is a single vectorised lookup
+GESTURES = {
+    "thumb_index": lambda f: f.tip_distances[THUMB, INDEX] < TOUCH_DISTANCE,
+    "thumb_middle": lambda f: f.tip_distances[THUMB, MIDDLE] < THUMB_MIDDLE_DISTANCE,
+    "thumb_ring": lambda f: f.tip_distances[THUMB, RING] < TOUCH_DISTANCE,
+    "thumb_pinky": lambda f: f.tip_distances[THUMB, PINKY] < TOUCH_DISTANCE,
+    # Fingertips below (greater y than) their knuckles
+    "fist": lambda f: bool(np.all(f.tips[1:, 1] > f.bases[1:, 1])),
+    # Fingertips above both the wrist and their knuckles
+    "pointing_up": lambda f: bool(np.all((f.tips[1:, 1] <= f.wrist[1]) & (f.tips[1:, 1] <= f.bases[1:, 1]))),
+}
+
+
+def classify(features: HandFeatures) -> dict:
+    """Evaluate every gesture predicate for one hand"""
+    if features is None:
+        return {name: False for name in GESTURES}
+    return {name: bool(predicate(features)) for name, predicate in GESTURES.items()}
+
+
+def pinkies_touching(left: HandFeatures, right: HandFeatures) -> bool:
+    if left is None or right is None:
+        return False
+    return float(np.linalg.norm(left.tips[PINKY] - right.tips[PINKY])) < PINKY_PINKY_DISTANCE
+
+
+class HoldTimers:
+    """Hold-time state for every gesture of one hand.
+
+    ``update`` is called once per frame with the classified gestures and
+    starts or clears all timers in one pass; it returns the gestures that
+    were released this frame.
+    """
+
+    def __init__(self):
+        self._started = {}
+
+    def update(self, gestures: dict, now: float) -> list:
+        released = []
+        for name, active in gestures.items():
+            if active:
+                self._started.setdefault(name, now)
+            elif self._started.pop(name, None) is not None:
+                released.append(name)
+        return released
+
+    def started(self, name: str):
+        """Time the gesture started being held, or None"""
+        return self._started.get(name)
+
+    def held(self, name: str, now: float) -> float:
+        start = self._started.get(name)
+        return 0.0 if start is None else now - start
+
+    def restart(self, name: str, now: float):
+        """Start counting again (e.g. for gestures that repeat while held)"""
+        if name in self._started:
+            self._started[name] = now
+
+    def clear(self):
+        self._started.clear()
@@ -2,16 +2,44 @@ import cv2
 import time
 import json
 import os
+import queue
+import argparse
+import threading
 import mediapipe as mp
 from pathlib import Path
+from progressBus import ProgressPublisher
+from trackerStats import TrackerStats
+from roiInference import RoiHandTracker
+from fingertipFilter import FingertipFilter
+from sessionRecorder import SessionRecorder
+from adaptiveRate import AdaptiveRate, IDLE_RESOLUTION, GRAB_FAILURE_LIMIT
+from displayThrottle import DisplayThrottle, DISPLAY_MODES, DEFAULT_DISPLAY_MODE, DEFAULT_PREVIEW_FPS
 
 # Determine project root (two levels up from this file) and write output there
 BASE_DIR = Path(__file__).resolve().parents[2]
 OUTPUT_JSON = str(BASE_DIR / "output" / "live_hand_data.json")
+FILTER_PARAMS_FILE = str(BASE_DIR / "output" / "filter_params.json")
 
 # Window name and size
 WINDOW_NAME = "HandTracker"
 
+# Tracking state changes for the UI
+progress_bus = ProgressPublisher("tracker")
+
+# Console verbosity: 0 = periodic summary only, 1 = per-frame hand counts,
+# 2 = per-frame fingertips and JSON payload
+VERBOSITY = int(os.environ.get("VIBE_TRACKER_VERBOSE", "0"))
+SUMMARY_INTERVAL = 5.0  # Seconds between timing summaries
+
+# Per-stage timings, summarised every SUMMARY_INTERVAL seconds
+STAGES = ["capture", "convert", "inference", "draw", "serialize", "publish", "latency"]
+stats = TrackerStats(STAGES)
+
+def log(level, message):
+    """Print message if the verbosity is at least level"""
+    if VERBOSITY >= level:
+        print(message)
+
 # Initialize MediaPipe Hands
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(
@@ -32,98 +60,352 @@ def get_fingertips(hand_landmarks):
             for i, lm in enumerate(hand_landmarks.landmark) if i in indices]
 
 
+def put_latest(q, item):
+    """Put item into a bounded queue, discarding the oldest entry if full.
+
+    Returns True if a stale item was dropped to make room.
+    """
+    dropped = False
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped = True
+            except queue.Empty:
+                pass
+
+
+def write_text_atomic(path, text):
+    """Write text through a temp file and an atomic replace"""
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        f.write(text)
+    # Atomic replace with fallback for Windows file locks
+    try:
+        os.replace(tmp, path)
+    except PermissionError:
+        # If replace fails (file locked), delete target and rename
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        os.rename(tmp, path)
+
+
+class FrameGrabber(threading.Thread):
+    """Capture thread that only ever keeps the newest frame.
+
+    A frame the inference stage never picked up is simply overwritten, so
+    inference always works on the most recent image instead of a backlog.
+    """
+
+    def __init__(self, cap, stop_event, scheduler=None):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.stop_event = stop_event
+        self.scheduler = scheduler
+        self.wanted_resolution = None
+        self.failed = False
+        self.dropped = 0
+        self._frame = None
+        self._frame_id = 0
+        self._taken_id = 0
+        self._cond = threading.Condition()
+
+    def request_resolution(self, width, height):
+        """Ask the capture thread (the only one touching cap) to switch resolution"""
+        self.wanted_resolution = (width, height)
+
+    def run(self):
+        grab_failures = 0
+        while not self.stop_event.is_set():
+            if self.wanted_resolution:
+                width, height = self.wanted_resolution
+                self.wanted_resolution = None
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if self.scheduler and not self.scheduler.due():
+                # Idle: keep the driver's buffer fresh without decoding the frame
+                if self.cap.grab():
+                    grab_failures = 0
+                    continue
+                grab_failures += 1
+                if grab_failures < GRAB_FAILURE_LIMIT:
+                    # A lost camera fails at once; wait out the idle interval instead of spinning
+                    time.sleep(self.scheduler.remaining())
+                    continue
+                ret = False
+            else:
+                with stats.timed("capture"):
+                    ret, frame = self.cap.read()
+            if not ret:
+                print("Frame capture failed, stopping.")
+                progress_bus.error("Frame capture failed", stage="tracking")
+                self.failed = True
+                self.stop_event.set()
+                break
+            with self._cond:
+                if self._frame is not None and self._taken_id != self._frame_id:
+                    self.dropped += 1
+                    stats.drop("capture")
+                self._frame_id += 1
+                self._frame = (self._frame_id, time.time(), frame)
+                self._cond.notify()
+        with self._cond:
+            self._cond.notify_all()
+
+    def latest(self, timeout=0.5):
+        """Block until a frame newer than the last one taken is available"""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self.stop_event.is_set() or (self._frame and self._frame[0] != self._taken_id),
+                timeout
+            )
+            if not self._frame or self._frame[0] == self._taken_id:
+                return None
+            self._taken_id = self._frame[0]
+            return self._frame
+
+
+def inference_stage(grabber, roi_tracker, scheduler, stop_event, publish_queue, display_queue):
+    """Mirror, convert and run MediaPipe on the newest frame"""
+    while not stop_event.is_set():
+        item = grabber.latest()
+        if item is None:
+            continue
+        frame_id, timestamp, frame = item
+
+        with stats.timed("convert"):
+            # Keep original frame for detection, flip only for display
+            display_frame = cv2.flip(frame, 1)
+            # Crop around the last hands (or downsample the whole frame) and convert
+            model_input = roi_tracker.prepare(display_frame)
+        log(2, f"Frame size: {frame.shape}, {roi_tracker.mode} input: {model_input.shape}")
+
+        # Process frame with MediaPipe on the flipped display for aligned detection
+        with stats.timed("inference"):
+            results = roi_tracker.process(model_input)
+        scheduler.update(bool(results.multi_hand_landmarks))
+
+        if put_latest(publish_queue, (frame_id, timestamp, results)):
+            stats.drop("publish")
+        # Headless runs have no display queue at all
+        if display_queue is not None and put_latest(display_queue, (frame_id, display_frame, results)):
+            stats.drop("display")
+
+
+def publish_stage(stop_event, publish_queue, fingertip_filter=None, recorder=None):
+    """Turn inference results into live_hand_data.json
+
+    With a fingertip_filter the fingertips are smoothed and predicted for
+    the capture-to-publish latency here, and the payload is marked
+    "filtered" so consumers do not filter them again. With a recorder
+    every published payload is also appended to the session file.
+    """
+    last_num_hands = None
+    while not stop_event.is_set():
+        try:
+            frame_id, timestamp, results = publish_queue.get(timeout=0.5)
+        except queue.Empty:
+            continue
+
+        # Debug: print number of hands detected
+        num = len(results.multi_hand_landmarks) if results.multi_hand_landmarks else 0
+        log(1, f"Detected {num} hand(s)")
+        if num != last_num_hands:
+            progress_bus.progress("tracking", hands=num, message=f"{num} hand(s) detected")
+            last_num_hands = num
+
+        with stats.timed("serialize"):
+            # Initialize empty fingertip lists
+            left_fingertips = []
+            right_fingertips = []
+
+            if results.multi_hand_landmarks and results.multi_handedness:
+                for landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                    label = handedness.classification[0].label  # 'Left' or 'Right'
+                    tips = get_fingertips(landmarks)
+                    if label == 'Left':
+                        left_fingertips = tips
+                        log(2, f"Left hand detected with {len(tips)} fingertips")
+                    elif label == 'Right':
+                        right_fingertips = tips
+                        log(2, f"Right hand detected with {len(tips)} fingertips")
+
+            if fingertip_filter:
+                fingertip_filter.reload_params()
+                left_fingertips = fingertip_filter.update("left", left_fingertips, timestamp)
+                right_fingertips = fingertip_filter.update("right", right_fingertips, timestamp)
+
+            # Build JSON payload
+            data = {
+                "timestamp": timestamp,
+                "frame": frame_id,
+                "left_hand": {"fingertips": left_fingertips},
+                "right_hand": {"fingertips": right_fingertips}
+            }
+            if fingertip_filter:
+                data["filtered"] = True
+            text = json.dumps(data)
+
+        # Debug: log JSON data to be written
+        log(2, f"Writing JSON data: {text}")
+        try:
+            with stats.timed("publish"):
+                write_text_atomic(OUTPUT_JSON, text)
+            stats.record("latency", time.time() - timestamp)
+            stats.frame_done()
+        except Exception as e:
+            print(f"Error writing JSON: {e}")
+        if recorder:
+            recorder.record(data, timestamp)
+
+
+def draw_stats_overlay(frame):
+    """Draw the rolling timing figures in the corner of the debug window"""
+    for i, line in enumerate(stats.overlay_lines()):
+        cv2.putText(frame, line, (10, 20 + 18 * i), cv2.FONT_HERSHEY_PLAIN, 1.1, (0, 255, 0), 1, cv2.LINE_AA)
+
+
+def parse_args():
+    global VERBOSITY
+    parser = argparse.ArgumentParser(description="Write live fingertip positions for Blender")
+    parser.add_argument("-v", "--verbose", action="count", default=VERBOSITY,
+                        help="per-frame console output (-v hand counts, -vv full payloads)")
+    parser.add_argument("--overlay", action="store_true", help="draw timing figures in the debug window (toggle with 'o')")
+    parser.add_argument("--full-frame", action="store_true", help="always run inference on the whole frame (no hand crop)")
+    parser.add_argument("--filter", action="store_true",
+                        help="smooth and predict fingertips here instead of in the consumers")
+    parser.add_argument("--record", metavar="SESSION", help="also record the output to a session file")
+    parser.add_argument("--no-idle", action="store_true", help="keep the full frame rate when no hand is visible")
+    parser.add_argument("--idle-resolution", action="store_true",
+                        help="also lower the camera resolution while idle")
+    parser.add_argument("--display", choices=DISPLAY_MODES, default=DEFAULT_DISPLAY_MODE,
+                        help="debug window: every frame, a throttled preview, or none (headless)")
+    parser.add_argument("--preview-fps", type=float, default=DEFAULT_PREVIEW_FPS,
+                        help="frame rate of the debug window in preview mode")
+    args = parser.parse_args()
+    VERBOSITY = args.verbose
+    return args
+
+
 def main():
+    args = parse_args()
+    show_overlay = args.overlay
+
     # Open webcam
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
         print("Cannot open camera")
+        progress_bus.error("Cannot open camera", stage="tracking")
         return
     # Ensure output directory exists
     os.makedirs(os.path.dirname(OUTPUT_JSON), exist_ok=True)
 
-    # Create a window for exit key and debug display
-    cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
-    cv2.resizeWindow(WINDOW_NAME, 640, 480)
+    display = DisplayThrottle(args.display, args.preview_fps)
+    if not display.headless:
+        # Create a window for exit key and debug display
+        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(WINDOW_NAME, 640, 480)
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            print("Frame capture failed, stopping.")
-            break
-        # Debug: log frame size
-        print(f"Frame size: {frame.shape}")
+    progress_bus.stage_started("tracking")
 
-        # Keep original frame for detection, flip only for display
-        display_frame = cv2.flip(frame, 1)
+    # Pipeline: capture -> inference -> (publish, display). Each hand-off keeps
+    # only the newest item, so a slow stage drops frames instead of adding lag.
+    stop_event = threading.Event()
+    publish_queue = queue.Queue(maxsize=1)
+    display_queue = None if display.headless else queue.Queue(maxsize=1)
+    full_resolution = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
 
-        # Process frame with MediaPipe on the flipped display for aligned detection
-        rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb)
-        # Debug: print number of hands detected
-        num = len(results.multi_hand_landmarks) if results.multi_hand_landmarks else 0
-        print(f"Detected {num} hand(s)")
-
-        # Draw landmarks on the mirrored display for visual feedback
-        if results.multi_hand_landmarks:
-            for landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(
-                    display_frame,
-                    landmarks,
-                    mp_hands.HAND_CONNECTIONS,
-                    mp_drawing_styles.get_default_hand_landmarks_style(),
-                    mp_drawing_styles.get_default_hand_connections_style()
-                )
-
-        # Initialize empty fingertip lists
-        left_fingertips = []
-        right_fingertips = []
-
-        if results.multi_hand_landmarks and results.multi_handedness:
-            for landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                label = handedness.classification[0].label  # 'Left' or 'Right'
-                tips = get_fingertips(landmarks)
-                if label == 'Left':
-                    left_fingertips = tips
-                    print(f"Left hand detected with {len(tips)} fingertips")
-                elif label == 'Right':
-                    right_fingertips = tips
-                    print(f"Right hand detected with {len(tips)} fingertips")
-
-        # Build JSON payload
-        data = {
-            "left_hand": {"fingertips": left_fingertips},
-            "right_hand": {"fingertips": right_fingertips}
-        }
+    def on_idle_change(idle):
+        print("No hands, dropping to idle rate" if idle else "Hand detected, back to full rate")
+        progress_bus.progress("tracking", idle=idle)
+        if args.idle_resolution:
+            grabber.request_resolution(*(IDLE_RESOLUTION if idle else full_resolution))
 
-        # Debug: log JSON data to be written
-        print(f"Writing JSON data: {data}")
-        # Write atomically
-        tmp = OUTPUT_JSON + ".tmp"
-        with open(tmp, 'w') as f:
-            json.dump(data, f)
-        # Atomic replace with fallback for Windows file locks
-        try:
-            os.replace(tmp, OUTPUT_JSON)
-        except PermissionError:
-            # If replace fails (file locked), delete target and rename
-            try:
-                os.remove(OUTPUT_JSON)
-            except OSError:
-                pass
-            os.rename(tmp, OUTPUT_JSON)
-        except Exception as e:
-            print(f"Error writing JSON: {e}")
+    scheduler = AdaptiveRate(enabled=not args.no_idle, on_change=on_idle_change)
+    grabber = FrameGrabber(cap, stop_event, scheduler)
+    # Hand crops get their own instance, so each tracking graph only sees one kind of input
+    crop_hands = None if args.full_frame else mp_hands.Hands(
+        static_image_mode=False,
+        max_num_hands=2,
+        min_detection_confidence=0.3,
+        min_tracking_confidence=0.5
+    )
+    roi_tracker = RoiHandTracker(hands, max_hands=2, crop_hands=crop_hands)
+    fingertip_filter = FingertipFilter(params_file=FILTER_PARAMS_FILE) if args.filter else None
+    recorder = SessionRecorder(args.record) if args.record else None
+    workers = [
+        grabber,
+        threading.Thread(target=inference_stage, name="inference", daemon=True,
+                         args=(grabber, roi_tracker, scheduler, stop_event, publish_queue, display_queue)),
+        threading.Thread(target=publish_stage, name="publish", daemon=True,
+                         args=(stop_event, publish_queue, fingertip_filter, recorder)),
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Display stays on the main thread (HighGUI is not thread-safe). It only
+    # ever draws the newest frame, and only as often as the display mode asks.
+    next_summary = time.time() + SUMMARY_INTERVAL
+    try:
+        while not stop_event.is_set():
+            if display.headless:
+                stop_event.wait(0.1)
+            else:
+                display_frame = None
+                if display.due():
+                    try:
+                        frame_id, display_frame, results = display_queue.get(timeout=0.05)
+                    except queue.Empty:
+                        pass
+
+                if display_frame is not None:
+                    with stats.timed("draw"):
+                        # Draw landmarks on the mirrored display for visual feedback
+                        if results.multi_hand_landmarks:
+                            for landmarks in results.multi_hand_landmarks:
+                                mp_drawing.draw_landmarks(
+                                    display_frame,
+                                    landmarks,
+                                    mp_hands.HAND_CONNECTIONS,
+                                    mp_drawing_styles.get_default_hand_landmarks_style(),
+                                    mp_drawing_styles.get_default_hand_connections_style()
+                                )
+                        if show_overlay:
+                            draw_stats_overlay(display_frame)
+                    # Show minimal window (mirrored view)
+                    cv2.imshow(WINDOW_NAME, display_frame)
+
+                wait_ms = scheduler.wait_ms() if display.mode == "full" else max(scheduler.wait_ms(), 10)
+                key = cv2.waitKey(wait_ms) & 0xFF
+                if key == ord('q') or key == 27:
+                    break
+                if key == ord('o'):
+                    show_overlay = not show_overlay
 
-        # Show minimal window (mirrored view)
-        cv2.imshow(WINDOW_NAME, display_frame)
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord('q') or key == 27:
-            break
+            if time.time() >= next_summary:
+                print(stats.summary_line())
+                next_summary = time.time() + SUMMARY_INTERVAL
+    except KeyboardInterrupt:
+        pass
 
     # Cleanup
+    stop_event.set()
+    for worker in workers:
+        worker.join(timeout=2.0)
+    if recorder:
+        recorder.close()
+        print(f"Recorded {recorder.frames} frames to {args.record}")
     cap.release()
     cv2.destroyAllWindows()
     hands.close()
+    if crop_hands:
+        crop_hands.close()
+    progress_bus.stage_finished("tracking")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,158 @@
+import os
+import sys
+import struct
+import hashlib
+import logging
+import ctypes
+import ctypes.util
+from typing import NamedTuple, Optional
+
+# inotify event masks (see <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")
+HASH_CHUNK_SIZE = 1 << 16
+
+
+class FileSignature(NamedTuple):
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+def hash_file(path: str) -> str:
+    """Return a short content digest for a file"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _InotifyBackend:
+    """Non-blocking inotify watch on a single directory (Linux only)"""
+
+    def __init__(self, directory: str):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def touched_names(self) -> set:
+        """Drain pending events and return the file names they refer to"""
+        names = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 4096)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buf):
+                _wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(buf, offset)
+                offset += EVENT_HEADER.size
+                raw_name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if raw_name:
+                    names.add(os.fsdecode(raw_name))
+        return names
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class OptionImageWatcher:
+    """Detect real content changes of the A/B/C option images.
+
+    Each file is tracked by (mtime, size, content hash). The hash is only
+    recomputed when mtime or size moves, so an idle poll costs one stat per
+    image (or nothing at all when inotify reports no events).
+    """
+
+    def __init__(self, directory: str, names, use_inotify: Optional[bool] = None):
+        self.directory = directory
+        self.names = list(names)
+        self._signatures = {}
+        self._backend = None
+
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        if use_inotify and os.path.isdir(directory):
+            try:
+                self._backend = _InotifyBackend(directory)
+                logging.info(f"Watching {directory} with inotify")
+            except (OSError, AttributeError) as e:
+                logging.warning(f"inotify unavailable ({e}), falling back to stat polling")
+                self._backend = None
+        if self._backend is None:
+            logging.info(f"Watching {directory} with stat polling")
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._backend is not None
+
+    def _stat(self, name: str):
+        try:
+            st = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _signature(self, name: str, previous: Optional[FileSignature]) -> Optional[FileSignature]:
+        stat = self._stat(name)
+        if stat is None:
+            return None
+        mtime_ns, size = stat
+        if previous and previous.mtime_ns == mtime_ns and previous.size == size:
+            return previous
+        try:
+            digest = hash_file(os.path.join(self.directory, name))
+        except OSError as e:
+            logging.warning(f"Could not hash {name}: {e}")
+            return previous
+        return FileSignature(mtime_ns, size, digest)
+
+    def prime(self):
+        """Record the current state of every image without reporting changes"""
+        if self._backend:
+            self._backend.touched_names()
+        for name in self.names:
+            self._signatures[name] = self._signature(name, None)
+
+    def poll(self) -> list:
+        """Return the names of images whose content changed since the last poll"""
+        if self._backend:
+            candidates = [n for n in self._backend.touched_names() if n in self.names]
+        else:
+            candidates = self.names
+
+        changed = []
+        for name in candidates:
+            previous = self._signatures.get(name)
+            current = self._signature(name, previous)
+            self._signatures[name] = current
+            if current is None:
+                continue
+            if previous is None or current.digest != previous.digest:
+                changed.append(name)
+        return changed
+
+    def close(self):
+        if self._backend:
+            self._backend.close()
+            self._backend = None
@@ -0,0 +1,152 @@
+import os
+import time
+import queue
+import shutil
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Default time the main thread may spend running callbacks per drain
+DRAIN_BUDGET_SECONDS = 0.004
+
+
+class IOExecutor:
+    """Run blocking non-bpy work on worker threads.
+
+    Tasks must not touch bpy. Their results come back through a queue that
+    the owner drains from Blender's main thread (a bpy.app.timers function
+    or a modal TIMER event), which is where the optional callbacks run, so
+    callbacks may use bpy freely.
+
+    Tasks submitted with the same ``lane`` run one at a time, in
+    submission order (e.g. successive writes of the same file). Tasks
+    without a lane run on the shared pool in any order.
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "vibe-io"):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = None
+        self._lanes = {}
+        self._lanes_lock = threading.Lock()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Tasks submitted whose callbacks have not run yet"""
+        return self._pending
+
+    def _executor(self, lane: Optional[str]) -> ThreadPoolExecutor:
+        with self._lanes_lock:
+            if not lane:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+                return self._pool
+            executor = self._lanes.get(lane)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-{lane}")
+                self._lanes[lane] = executor
+            return executor
+
+    def submit(self, fn: Callable, *args, callback: Optional[Callable] = None,
+               error_callback: Optional[Callable] = None, lane: Optional[str] = None, **kwargs):
+        """Queue fn(*args, **kwargs) on a worker thread.
+
+        callback(result) or error_callback(exception) runs on the thread
+        that calls drain(). Errors without an error_callback are logged.
+        """
+        def task():
+            try:
+                result = fn(*args, **kwargs)
+                self._results.put((callback, result, None))
+            except Exception as e:
+                logging.error(f"Background task {getattr(fn, '__name__', fn)} failed: {e}")
+                logging.debug(traceback.format_exc())
+                self._results.put((error_callback, None, e))
+
+        with self._pending_lock:
+            self._pending += 1
+        return self._executor(lane).submit(task)
+
+    def drain(self, budget: float = DRAIN_BUDGET_SECONDS) -> int:
+        """Run queued callbacks on the calling (main) thread.
+
+        Stops once budget seconds have been spent so a burst of results
+        cannot stall a viewport frame; the rest run on the next drain.
+        Returns the number of results handled.
+        """
+        deadline = time.perf_counter() + budget
+        handled = 0
+        while True:
+            try:
+                callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._pending_lock:
+                self._pending -= 1
+            handled += 1
+            if callback:
+                try:
+                    callback(error if error is not None else result)
+                except Exception as e:
+                    logging.error(f"Background task callback failed: {e}")
+                    logging.error(traceback.format_exc())
+            if time.perf_counter() >= deadline:
+                break
+        return handled
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads; with wait, finish what is queued first.
+
+        The executor can still be used afterwards, new threads are started
+        on the next submit.
+        """
+        with self._lanes_lock:
+            executors = list(self._lanes.values())
+            if self._pool is not None:
+                executors.append(self._pool)
+            self._lanes.clear()
+            self._pool = None
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+
+# Small file helpers meant to be submitted to an IOExecutor
+
+def write_text_atomic(path: str, text: str, encoding: str = "utf-8") -> str:
+    """Write text to path through a temp file and an atomic rename"""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding=encoding) as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return path
+
+
+def copy_files(pairs) -> list:
+    """Copy (source, target) pairs, returning the targets that were written"""
+    copied = []
+    for source, target in pairs:
+        try:
+            shutil.copy2(source, target)
+            copied.append(target)
+        except OSError as e:
+            logging.error(f"Failed to copy {source} to {target}: {e}")
+    return copied
+
+
+def move_file(source: str, target: str) -> str:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.move(source, target)
+    return target
+
+
+def remove_file(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
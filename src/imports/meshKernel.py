@@ -0,0 +1,555 @@
+"""Array versions of the per-vertex mesh operations used by the Blender operator.
+
+Coordinates move between the mesh and NumPy with ``foreach_get`` /
+``foreach_set`` (one C-level copy each way), and everything in between is
+whole-array math, so a tick costs a handful of vector operations per finger
+instead of several Python passes over ``bm.verts``. Nothing here imports
+bpy: functions take mesh datablocks and matrices from the caller.
+
+Kernels whose cost grows with the whole mesh (volume, centroid, pull,
+cohesion, comparisons) run in fixed row chunks on ``kernel_pool``; NumPy
+releases the GIL inside each chunk, so large meshes use several cores.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Incremental volume updates before a full recompute clears accumulated rounding
+VOLUME_REFRESH_UPDATES = 1000
+# Worker threads for the chunked kernels (1 runs everything on the calling thread)
+KERNEL_THREADS = int(os.environ.get("VIBE_KERNEL_THREADS", min(4, os.cpu_count() or 1)))
+# Rows per chunk; anything smaller runs in one piece on the calling thread
+KERNEL_CHUNK = int(os.environ.get("VIBE_KERNEL_CHUNK", "65536"))
+
+
+class ChunkPool:
+    """Run a function over fixed row ranges, on a thread pool when there are several.
+
+    Chunk boundaries depend only on the chunk size, and ``map`` returns the
+    per-chunk results in chunk order (``sum`` adds them in that order), so
+    results are bit-for-bit the same for any number of threads.
+    """
+
+    def __init__(self, threads: int = KERNEL_THREADS, chunk: int = KERNEL_CHUNK):
+        self.threads = 1
+        self.chunk = KERNEL_CHUNK
+        self._executor = None
+        self.configure(threads, chunk)
+
+    def configure(self, threads: int = None, chunk: int = None):
+        """Change the thread count and/or chunk size (takes effect on the next call)"""
+        if threads is not None and max(int(threads), 1) != self.threads:
+            self.shutdown()
+            self.threads = max(int(threads), 1)
+        if chunk is not None:
+            self.chunk = max(int(chunk), 1)
+
+    def ranges(self, count: int) -> list:
+        return [(start, min(start + self.chunk, count)) for start in range(0, count, self.chunk)]
+
+    def map(self, func, count: int) -> list:
+        """[func(start, end) for every chunk of range(count)], in chunk order"""
+        ranges = self.ranges(count)
+        if self.threads == 1 or len(ranges) <= 1:
+            return [func(start, end) for start, end in ranges]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="meshKernel")
+        return list(self._executor.map(lambda bounds: func(*bounds), ranges))
+
+    def sum(self, func, count: int, initial=0.0):
+        total = initial
+        for part in self.map(func, count):
+            total = total + part
+        return total
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Shared by every kernel below
+kernel_pool = ChunkPool()
+
+
+def read_coords(mesh, out: np.ndarray = None) -> np.ndarray:
+    """Local vertex coordinates of a mesh as an (N, 3) float32 array"""
+    count = len(mesh.vertices)
+    if out is None or out.shape != (count, 3):
+        out = np.empty((count, 3), dtype=np.float32)
+    mesh.vertices.foreach_get("co", out.ravel())
+    return out
+
+
+def write_coords(mesh, coords: np.ndarray):
+    """Store (N, 3) local coordinates back into the mesh"""
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def read_edges(mesh) -> np.ndarray:
+    """Edge vertex indices as an (E, 2) int32 array"""
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    return edges.reshape(-1, 2)
+
+
+def read_triangles(mesh) -> np.ndarray:
+    """Vertex indices of the mesh's loop triangles as a (T, 3) int32 array"""
+    if hasattr(mesh, "calc_loop_triangles"):
+        mesh.calc_loop_triangles()
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", triangles)
+    return triangles.reshape(-1, 3)
+
+
+def matrix_to_array(matrix) -> np.ndarray:
+    """mathutils.Matrix (rows) to a float64 4x4 array"""
+    return np.array([tuple(row) for row in matrix], dtype=np.float64)
+
+
+def to_world(coords: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def tetra_volumes(coords: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Signed volume of the tetrahedron (origin, a, b, c) for every triangle"""
+    return _tetra_volumes(coords[triangles.ravel()].astype(np.float64).reshape(-1, 3, 3))
+
+
+def volume_sum(coords: np.ndarray, triangles: np.ndarray) -> float:
+    """Signed volume enclosed by triangles (sum of ``tetra_volumes``, chunked)"""
+    return float(kernel_pool.sum(lambda start, end: tetra_volumes(coords, triangles[start:end]).sum(),
+                                 len(triangles)))
+
+
+def coords_sum(coords: np.ndarray) -> np.ndarray:
+    """Sum of (N, 3) coordinates in float64, chunked"""
+    return kernel_pool.sum(lambda start, end: coords[start:end].sum(axis=0, dtype=np.float64),
+                           len(coords), np.zeros(3))
+
+
+def coords_equal(coords: np.ndarray, other: np.ndarray) -> bool:
+    if coords.shape != other.shape:
+        return False
+    return all(kernel_pool.map(lambda start, end: np.array_equal(coords[start:end], other[start:end]),
+                               len(coords)))
+
+
+def _tetra_volumes(corners: np.ndarray) -> np.ndarray:
+    a, b, c = corners[:, 0].T, corners[:, 1].T, corners[:, 2].T
+    return (a[0] * (b[1] * c[2] - b[2] * c[1])
+            + a[1] * (b[2] * c[0] - b[0] * c[2])
+            + a[2] * (b[0] * c[1] - b[1] * c[0])) / 6.0
+
+
+def mesh_center(coords: np.ndarray, triangles: np.ndarray = None, center: str = "VOLUME") -> np.ndarray:
+    """Local centre of the mesh: "VOLUME" (solid centroid), "BOUNDS" or "MEDIAN".
+
+    Like Blender's ORIGIN_CENTER_OF_VOLUME, a mesh without volume falls
+    back to the median.
+    """
+    if center == "BOUNDS":
+        return (coords.min(axis=0).astype(np.float64) + coords.max(axis=0)) / 2.0
+    median = coords_sum(coords) / max(len(coords), 1)
+    if center == "MEDIAN" or triangles is None or not len(triangles):
+        return median
+
+    def moments(start, end):
+        # Tetrahedra from the median rather than the origin for precision
+        corners = coords[triangles[start:end].ravel()].astype(np.float64).reshape(-1, 3, 3) - median
+        volumes = _tetra_volumes(corners)
+        return np.concatenate([[volumes.sum()], (volumes[:, None] * corners.sum(axis=1)).sum(axis=0)])
+
+    total, *weighted = kernel_pool.sum(moments, len(triangles), np.zeros(4))
+    if abs(total) < 1e-12:
+        return median
+    return median + np.array(weighted) / (4.0 * total)
+
+
+def set_origin(mesh, center: str = "VOLUME") -> np.ndarray:
+    """Move the mesh so the chosen centre is at its local origin; returns that centre.
+
+    The object's matrix_world has to be translated by the returned offset
+    (in local space) to keep the geometry where it was.
+    """
+    coords = read_coords(mesh)
+    offset = mesh_center(coords, read_triangles(mesh) if center == "VOLUME" else None, center)
+    write_coords(mesh, coords - offset)
+    return offset
+
+
+def transform_mesh(mesh, matrix) -> None:
+    """Bake a 3x3 (or 4x4) matrix into the mesh coordinates"""
+    matrix = np.array([tuple(row) for row in matrix], dtype=np.float64)
+    coords = read_coords(mesh).astype(np.float64) @ matrix[:3, :3].T
+    if matrix.shape[0] == 4:
+        coords += matrix[:3, 3]
+    write_coords(mesh, coords)
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray):
+    """(position in rows, entry) pairs for every CSR entry of rows"""
+    counts = indptr[rows + 1] - indptr[rows]
+    ends = np.cumsum(counts)
+    offsets = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts, counts)
+    positions = np.repeat(np.arange(len(rows)), counts)
+    return positions, indices[np.repeat(indptr[rows], counts) + offsets]
+
+
+def attraction(world: np.ndarray, targets, radius: float, strength: float, out: np.ndarray) -> np.ndarray:
+    """Add the (1 - (d/r)^2)^2 pull of each target towards itself to out"""
+    for target in targets:
+        to_target = np.asarray(tuple(target), dtype=np.float64) - world
+        dist = np.sqrt(np.einsum("ij,ij->i", to_target, to_target))
+        inside = np.flatnonzero(dist < radius)
+        if not len(inside):
+            continue
+        d = dist[inside]
+        falloff = (1.0 - (d / radius) ** 2) ** 2
+        # Divide by d to normalise; a vertex exactly on the target gets no push
+        scale = np.divide(falloff * strength, d, out=np.zeros_like(d), where=d > 0.0)
+        out[inside] += to_target[inside] * scale[:, None]
+    return out
+
+
+def clamp_lengths(vectors: np.ndarray, max_length: float, min_length: float = 0.0001) -> np.ndarray:
+    """Zero vectors no longer than min_length and shorten those over max_length, in place"""
+    length = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    vectors[length <= min_length] = 0.0
+    over = length > max_length
+    vectors[over] *= (max_length / length[over])[:, None]
+    return vectors
+
+
+class Adjacency:
+    """Vertex adjacency of a mesh in CSR form, built once per topology.
+
+    The neighbours of vertex v are ``indices[indptr[v]:indptr[v + 1]]``
+    and ``degree[v]`` is their count (its number of edges).
+    """
+
+    def __init__(self, edges: np.ndarray, count: int):
+        both = np.concatenate([edges, edges[:, ::-1]]).astype(np.int64)
+        order = np.argsort(both[:, 0], kind="stable")
+        self.indices = both[order, 1]
+        self.degree = np.bincount(both[:, 0], minlength=count)
+        self.indptr = np.concatenate([[0], np.cumsum(self.degree)])
+        # Per-vertex scratch buffers, all zero/False between calls
+        self._scratch = np.zeros((count, 3))
+        self._marks = np.zeros(count, dtype=bool)
+
+    def union(self, *index_arrays) -> np.ndarray:
+        """Sorted unique vertex indices of several index arrays"""
+        for indices in index_arrays:
+            self._marks[indices] = True
+        merged = np.flatnonzero(self._marks)
+        self._marks[merged] = False
+        return merged
+
+    def neighbours(self, rows: np.ndarray):
+        """(position in rows, neighbour index) pairs for every neighbour of rows"""
+        return _gather(self.indptr, self.indices, rows)
+
+    def cohesion(self, rows: np.ndarray, values: np.ndarray, factor: float):
+        """Blend per-vertex vectors towards the mean of their neighbours'.
+
+        values holds the vectors of the (sorted, unique) vertices in rows;
+        every other vertex counts as zero. Returns (vertices, blended) for
+        all vertices the result can be non-zero for: rows and their
+        neighbours. Vertices without edges keep their own vector.
+        """
+        affected = self.union(rows, self.neighbours(rows)[1])
+        scratch = self._scratch
+
+        def neighbour_totals(start, end):
+            positions, neighbours = self.neighbours(affected[start:end])
+            return np.stack([np.bincount(positions, weights=scratch[neighbours, axis], minlength=end - start)
+                             for axis in range(3)], axis=1)
+
+        scratch[rows] = values
+        try:
+            own = scratch[affected]
+            totals = np.concatenate(kernel_pool.map(neighbour_totals, len(affected)))
+        finally:
+            scratch[rows] = 0.0
+        degree = self.degree[affected]
+        connected = degree > 0
+        blended = own.copy()
+        blended[connected] += (totals[connected] / degree[connected, None] - own[connected]) * factor
+        return affected, blended
+
+
+class MeshVolume:
+    """Signed volume of a mesh from its loop triangles, updated incrementally.
+
+    Works in object space (the sum of origin-apex tetrahedra); the object
+    matrix is applied once as its determinant. ``move`` only evaluates the
+    triangles that touch the moved vertices, before and after the move, and
+    ``scale`` is exact for closed meshes, so neither needs per-triangle state.
+    """
+
+    def __init__(self, triangles: np.ndarray, count: int):
+        self.triangles = triangles
+        corners = triangles.ravel()
+        self._triangle_of = (np.argsort(corners, kind="stable") // 3).astype(np.int64)
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(corners, minlength=count))])
+        self._marks = np.zeros(len(triangles), dtype=bool)
+        self.total = 0.0
+        self._updates = 0
+
+    def compute(self, coords: np.ndarray) -> float:
+        """Full recompute from (N, 3) local coordinates"""
+        self.total = volume_sum(coords, self.triangles)
+        self._updates = 0
+        return self.total
+
+    def move(self, coords: np.ndarray, moved: np.ndarray, step: np.ndarray) -> float:
+        """Apply ``coords[moved] += step`` and update the total to match"""
+        self._marks[_gather(self._indptr, self._triangle_of, moved)[1]] = True
+        touched = np.flatnonzero(self._marks)
+        self._marks[touched] = False
+        touched = self.triangles[touched]
+        before = volume_sum(coords, touched)
+        coords[moved] += step
+        self._updates += 1
+        if self._updates >= VOLUME_REFRESH_UPDATES:
+            return self.compute(coords)
+        self.total += volume_sum(coords, touched) - before
+        return self.total
+
+    def scale(self, factor: float) -> float:
+        """Account for a uniform scale of the whole (closed) mesh about any point"""
+        self.total *= factor ** 3
+        return self.total
+
+    def world_volume(self, matrix_world) -> float:
+        """Absolute volume in world space"""
+        return abs(self.total * np.linalg.det(matrix_to_array(matrix_world)[:3, :3]))
+
+
+class VertexGrid:
+    """Uniform grid over vertex positions for radius queries.
+
+    Vertices are bucketed by cell once (a sort) and a query only visits the
+    cells overlapping the query sphere. The grid is not updated as vertices
+    move: callers report how far they moved things with ``moved()`` and the
+    query radius grows by that slack until a rebuild is due.
+    """
+
+    def __init__(self, cell_size: float, rebuild_distance: float = None):
+        self.cell_size = float(cell_size)
+        self.rebuild_distance = 0.5 * self.cell_size if rebuild_distance is None else rebuild_distance
+        self.slack = 0.0
+        self.count = 0
+        self._origin = np.zeros(3)
+        self._dims = np.ones(3, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._keys = np.empty(0, dtype=np.int64)
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+
+    @property
+    def stale(self) -> bool:
+        return self.slack > self.rebuild_distance
+
+    def build(self, coords: np.ndarray):
+        self.count = len(coords)
+        self.slack = 0.0
+        if not self.count:
+            self._order = self._keys = self._starts = self._ends = np.empty(0, dtype=np.int64)
+            return
+        self._origin = coords.min(axis=0).astype(np.float64)
+        cells = self._cells(coords)
+        self._dims = cells.max(axis=0) + 1
+        keys = self._linear(cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys, self._starts, counts = np.unique(keys[self._order], return_index=True, return_counts=True)
+        self._ends = self._starts + counts
+
+    def translate(self, offset):
+        """Follow a rigid shift of every vertex (cell membership is unchanged)"""
+        self._origin = self._origin + np.asarray(offset, dtype=np.float64)
+
+    def moved(self, distance: float):
+        """Record that no vertex moved further than distance since the last call"""
+        self.slack += float(distance)
+
+    def query(self, center, radius: float) -> np.ndarray:
+        """Indices of all vertices that may lie within radius of center (a superset)"""
+        radius += self.slack
+        center = np.asarray(center, dtype=np.float64)
+        low = np.maximum(self._cells(center - radius), 0)
+        high = np.minimum(self._cells(center + radius), self._dims - 1)
+        if not self.count or np.any(high < low):
+            return np.empty(0, dtype=np.int64)
+        axes = [np.arange(low[k], high[k] + 1) for k in range(3)]
+        cells = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        keys = self._linear(cells)
+        slots = np.searchsorted(self._keys, keys)
+        found = slots < len(self._keys)
+        found[found] = self._keys[slots[found]] == keys[found]
+        slots = slots[found]
+        if not len(slots):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._order[self._starts[k]:self._ends[k]] for k in slots])
+
+    def _cells(self, points):
+        return np.floor((points - self._origin) / self.cell_size).astype(np.int64)
+
+    def _linear(self, cells):
+        return (cells[..., 0] * self._dims[1] + cells[..., 1]) * self._dims[2] + cells[..., 2]
+
+
+class MeshDeformer:
+    """Finger/anchor deformation of one mesh, keeping per-mesh state between ticks.
+
+    The Adjacency and MeshVolume are rebuilt only when the topology changes (another mesh
+    datablock, or a different vertex/edge/face count after a remesh, join,
+    boolean or import). The VertexGrid (in local space) is reused while the
+    mesh only changes through ``deform``; if anything else moves vertices
+    the coordinates no longer match what was last written and it is
+    rebuilt. Only vertices near a finger or anchor are tested against it,
+    and only those and their neighbours are blended and moved.
+    """
+
+    def __init__(self, *, radius: float, strength: float, anchor_radius: float, anchor_strength: float,
+                 max_displacement: float, cohesion_factor: float, timestep: float,
+                 volume_limits=(0.0, float("inf")), rebuild_distance: float = None):
+        self.radius = radius
+        self.strength = strength
+        self.anchor_radius = anchor_radius
+        self.anchor_strength = anchor_strength
+        self.max_displacement = max_displacement
+        self.cohesion_factor = cohesion_factor
+        self.timestep = timestep
+        self.volume_limits = volume_limits
+        self.last_correction = None
+        self.grid = VertexGrid(max(radius, anchor_radius), rebuild_distance)
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget the cached mesh state (rebuilt on the next tick)"""
+        self.adjacency = None
+        self.volume = None
+        self._topology = None
+        self._coords = None
+
+    def _sync(self, mesh) -> np.ndarray:
+        topology = (mesh.as_pointer(), len(mesh.vertices), len(mesh.edges), len(mesh.polygons))
+        if topology != self._topology:
+            self._topology = topology
+            self.adjacency = Adjacency(read_edges(mesh), len(mesh.vertices))
+            self.volume = MeshVolume(read_triangles(mesh), len(mesh.vertices))
+            self._coords = None
+        coords = read_coords(mesh)
+        if self._coords is None or not coords_equal(coords, self._coords):
+            self.grid.build(coords)
+            self.volume.compute(coords)
+        elif self.grid.stale:
+            self.grid.build(coords)
+        return coords
+
+    def owns(self, mesh) -> bool:
+        """Whether mesh is the datablock the cached state belongs to"""
+        return self._topology is not None and self._topology[0] == mesh.as_pointer()
+
+    def recenter(self, mesh, center: str = "VOLUME") -> np.ndarray:
+        """``set_origin`` using (and keeping) the cached state"""
+        coords = self._sync(mesh)
+        offset = mesh_center(coords, self.volume.triangles if center == "VOLUME" else None, center)
+        coords -= offset
+        write_coords(mesh, coords)
+        self.grid.translate(-offset)
+        # A closed mesh's volume does not depend on where its origin is
+        self._coords = coords
+        return offset
+
+    def world_volume(self, matrix_world) -> float:
+        """World-space volume of the mesh as of the last ``deform`` (no mesh access)"""
+        return self.volume.world_volume(matrix_world) if self.volume else 0.0
+
+    def candidates(self, inverse: np.ndarray, targets) -> np.ndarray:
+        """Vertices that may be within reach of any (world point, radius) target"""
+        # A world-space sphere is at most this much larger in local space
+        local_scale = np.linalg.norm(inverse[:3, :3], 2)
+        found = [self.grid.query(inverse[:3, :3] @ np.asarray(tuple(point), dtype=np.float64) + inverse[:3, 3],
+                                 radius * local_scale)
+                 for point, radius in targets]
+        return self.adjacency.union(*found)
+
+    def deform(self, mesh, matrix_world, finger_points, anchor_points, reference_volume: float = None) -> int:
+        """Apply one tick to the mesh; returns the number of vertices moved.
+
+        Points are in world space. Each vertex is pulled by the (1 - (d/r)^2)^2
+        falloff of every finger/anchor in reach, the summed pull is clamped,
+        blended with its edge neighbours' and applied for one timestep. If a
+        reference volume is given the result is then kept within
+        volume_limits of it (see ``correct_volume``). The mesh is read and
+        written once.
+        """
+        coords = self._sync(mesh)
+        moved = self._pull(coords, matrix_to_array(matrix_world), finger_points, anchor_points)
+        self.last_correction = None
+        if reference_volume:
+            self.correct_volume(coords, matrix_world, reference_volume)
+        if moved or self.last_correction:
+            write_coords(mesh, coords)
+        self._coords = coords
+        return moved
+
+    def _pull(self, coords: np.ndarray, matrix: np.ndarray, finger_points, anchor_points) -> int:
+        inverse = np.linalg.inv(matrix)
+        targets = ([(p, self.radius) for p in finger_points]
+                   + [(p, self.anchor_radius) for p in anchor_points])
+        near = self.candidates(inverse, targets)
+        if not len(near):
+            return 0
+
+        def pull(start, end):
+            world = to_world(coords[near[start:end]].astype(np.float64), matrix)
+            pulled = np.zeros_like(world)
+            attraction(world, finger_points, self.radius, self.strength, pulled)
+            attraction(world, anchor_points, self.anchor_radius, self.anchor_strength, pulled)
+            return clamp_lengths(pulled, self.max_displacement)
+
+        pulled = np.concatenate(kernel_pool.map(pull, len(near)))
+        pulling = pulled.any(axis=1)
+        if not pulling.any():
+            return 0
+        moved, displacements = self.adjacency.cohesion(near[pulling], pulled[pulling], self.cohesion_factor)
+        keep = displacements.any(axis=1)
+        moved, displacements = moved[keep], displacements[keep]
+
+        # Move in world space and map back: local += inverse(M[:3,:3]) @ (d * dt)
+        step = (displacements * self.timestep) @ inverse[:3, :3].T
+        self.volume.move(coords, moved, step)
+        self.grid.moved(np.sqrt(np.einsum("ij,ij->i", step, step)).max())
+        return len(moved)
+
+    def correct_volume(self, coords: np.ndarray, matrix_world, reference_volume: float) -> float:
+        """Scale coords about their centroid so the volume ratio is back within limits.
+
+        Volume goes with the cube of a uniform scale, so the factor and the
+        corrected volume follow directly from the current ratio. Returns
+        the scale factor (1.0 if no correction was needed) and records
+        (ratio before, factor) in ``last_correction``.
+        """
+        lower, upper = self.volume_limits
+        ratio = self.world_volume(matrix_world) / reference_volume
+        if ratio <= 0.0 or lower <= ratio <= upper:
+            return 1.0
+        target = lower if ratio < lower else upper
+        factor = (target / ratio) ** (1.0 / 3.0)
+        centroid = coords_sum(coords) / len(coords)
+
+        def scale(start, end):
+            offsets = coords[start:end] - centroid
+            coords[start:end] = centroid + offsets * factor
+            return np.einsum("ij,ij->i", offsets, offsets).max()
+
+        self.volume.scale(factor)
+        self.grid.moved(abs(1.0 - factor) * np.sqrt(max(kernel_pool.map(scale, len(coords)))))
+        self.last_correction = (ratio, factor)
+        return factor
@@ -0,0 +1,263 @@
+import cv2
+import sys
+import math
+import json
+import time
+import queue
+import argparse
+import multiprocessing
+from pathlib import Path
+
+from ioExecutor import write_text_atomic
+from trackerStats import TrackerStats
+from progressBus import ProgressPublisher
+from adaptiveRate import AdaptiveRate, GRAB_FAILURE_LIMIT
+
+# Same output channel as handTracker.py
+BASE_DIR = Path(__file__).resolve().parents[2]
+OUTPUT_JSON = str(BASE_DIR / "output" / "live_hand_data.json")
+
+FINGERTIP_INDICES = [4, 8, 12, 16, 20]
+HAND_LABELS = ("Left", "Right")
+
+# Estimates older than this (seconds) are left out of the fusion
+FUSION_WINDOW = 0.1
+# Do not rewrite the output file more often than this
+MIN_PUBLISH_INTERVAL = 1.0 / 60.0
+SUMMARY_INTERVAL = 5.0
+
+# How much each camera role is trusted per output axis. A front camera sees
+# x/y directly but only MediaPipe's weak monocular z; a side camera sees the
+# user's depth as its own horizontal axis. A side camera's x/y are in another
+# frame than the front camera's, so they only count once a calibration file
+# gives them a weight.
+ROLE_WEIGHTS = {
+    "front": {"x": 1.0, "y": 1.0, "z": 0.3},
+    "side": {"x": 0.0, "y": 0.0, "z": 1.0},
+    "side-flipped": {"x": 0.0, "y": 0.0, "z": 1.0},
+}
+# (scale, offset) per axis into the front camera's frame for uncalibrated cameras.
+# Side depth is measured from the wrist in image widths, like MediaPipe's z.
+DEFAULT_AXES = ((1.0, 0.0), (1.0, 0.0), (1.0, 0.0))
+
+
+def parse_source(spec: str):
+    """'0', '1:side', 'clip.mp4:front' -> (source, role); digits mean a camera index"""
+    source, role = spec, "front"
+    head, sep, tail = spec.rpartition(":")
+    if sep and tail in ROLE_WEIGHTS:
+        source, role = head, tail
+    return (int(source) if source.isdigit() else source), role
+
+
+def camera_worker(cam_id, source, results, stop_event, max_hands=2, use_roi=True, adaptive=True):
+    """Capture and run MediaPipe for one source in its own process"""
+    import mediapipe as mp
+    from roiInference import RoiHandTracker
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        results.put((cam_id, None, 0.0, None))
+        return
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=max_hands,
+                                     min_detection_confidence=0.3, min_tracking_confidence=0.5)
+    # Hand crops get their own instance, so each tracking graph only sees one kind of input
+    crop_hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=max_hands,
+                                          min_detection_confidence=0.3,
+                                          min_tracking_confidence=0.5) if use_roi else None
+    roi_tracker = RoiHandTracker(hands, max_hands=max_hands, crop_hands=crop_hands)
+    # Cameras that see no hand drop to a few frames per second
+    scheduler = AdaptiveRate(enabled=adaptive and isinstance(source, int))
+    frame_id = 0
+    grab_failures = 0
+    try:
+        while not stop_event.is_set():
+            if not scheduler.due():
+                if cap.grab():
+                    grab_failures = 0
+                    continue
+                grab_failures += 1
+                if grab_failures >= GRAB_FAILURE_LIMIT:
+                    break
+                # A lost camera fails at once; wait out the idle interval instead of spinning
+                time.sleep(scheduler.remaining())
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timestamp = time.time()
+            frame_id += 1
+            detected = roi_tracker.detect(cv2.flip(frame, 1))
+
+            found = {}
+            if detected.multi_hand_landmarks and detected.multi_handedness:
+                for landmarks, handedness in zip(detected.multi_hand_landmarks, detected.multi_handedness):
+                    label = handedness.classification[0].label
+                    wrist = landmarks.landmark[0]
+                    found[label] = {
+                        "score": float(handedness.classification[0].score),
+                        "wrist": (wrist.x, wrist.y, wrist.z),
+                        "tips": [(lm.x, lm.y, lm.z) for i, lm in enumerate(landmarks.landmark)
+                                 if i in FINGERTIP_INDICES],
+                    }
+            scheduler.update(bool(found))
+            try:
+                results.put_nowait((cam_id, frame_id, timestamp, found))
+            except queue.Full:
+                pass  # The fuser is behind; it only wants the newest estimate anyway
+    finally:
+        results.put((cam_id, None, 0.0, None))
+        cap.release()
+        hands.close()
+        if crop_hands:
+            crop_hands.close()
+
+
+def load_calibration(path):
+    """Per-camera calibration from a JSON file, keyed by camera number (order on the command line):
+    ``{"1": {"z": [scale, offset], "weights": {"x": 0.2}}}``. Axes and weights left out keep the defaults."""
+    if not path:
+        return {}
+    with open(path, "r") as f:
+        raw = json.load(f)
+    return {int(cam_id): {"axes": tuple(tuple(entry.get(axis, default)) for axis, default in zip("xyz", DEFAULT_AXES)),
+                          "weights": entry.get("weights", {})}
+            for cam_id, entry in raw.items()}
+
+
+def _axis_values(role, tip, wrist, axes=DEFAULT_AXES):
+    """Map one camera's fingertip to (x, y, z) in the front camera's frame"""
+    if role == "front":
+        values = tip
+    else:
+        # Side cameras: their horizontal offset from the wrist is the user's depth
+        depth = tip[0] - wrist[0]
+        if role == "side-flipped":
+            depth = -depth
+        values = (tip[0], tip[1], depth)
+    return tuple(value * scale + offset for value, (scale, offset) in zip(values, axes))
+
+
+def fuse(estimates: dict, roles: dict, now: float, window: float = FUSION_WINDOW, calibration: dict = None):
+    """Fuse the latest per-camera estimates into one payload.
+
+    Every axis is a weighted mean over the cameras that see the hand, with
+    weight = handedness score x role trust (or calibrated weight) x freshness.
+    A hand no camera places in x/y (only side cameras see it) is left out.
+    """
+    calibration = calibration or {}
+    data = {"left_hand": {"fingertips": []}, "right_hand": {"fingertips": []}}
+    stamps, stamp_weights, sources = 0.0, 0.0, set()
+    for label in HAND_LABELS:
+        views = []
+        for cam_id, (timestamp, found) in estimates.items():
+            age = now - timestamp
+            if age > window or label not in found:
+                continue
+            cam = calibration.get(cam_id, {})
+            role_weights = {**ROLE_WEIGHTS[roles[cam_id]], **cam.get("weights", {})}
+            views.append((cam_id, timestamp, found[label], math.exp(-age / window),
+                          role_weights, cam.get("axes", DEFAULT_AXES)))
+        if not any(role_weights["x"] > 0 and role_weights["y"] > 0 for *_, role_weights, _ in views):
+            continue
+
+        for cam_id, timestamp, hand, freshness, _, _ in views:
+            stamps += timestamp * hand["score"] * freshness
+            stamp_weights += hand["score"] * freshness
+            sources.add(cam_id)
+
+        tips = []
+        for i in range(len(FINGERTIP_INDICES)):
+            fused = {}
+            for axis_index, axis in enumerate(("x", "y", "z")):
+                total = weight_sum = 0.0
+                for cam_id, _, hand, freshness, role_weights, axes in views:
+                    w = hand["score"] * freshness * role_weights[axis]
+                    total += w * _axis_values(roles[cam_id], hand["tips"][i], hand["wrist"], axes)[axis_index]
+                    weight_sum += w
+                fused[axis] = total / weight_sum if weight_sum > 0 else 0.0
+            tips.append(fused)
+        key = "left_hand" if label == "Left" else "right_hand"
+        data[key] = {"fingertips": tips, "confidence": max(hand["score"] * freshness for _, _, hand, freshness, _, _ in views)}
+
+    data["timestamp"] = stamps / stamp_weights if stamp_weights else now
+    data["sources"] = sorted(sources)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track hands with several cameras and fuse the results")
+    parser.add_argument("sources", nargs="*", default=["0"],
+                        help="camera index or video path, optionally with :front/:side/:side-flipped")
+    parser.add_argument("--full-frame", action="store_true", help="disable the hand crop in the workers")
+    parser.add_argument("--no-idle", action="store_true", help="keep every camera at full rate without hands")
+    parser.add_argument("--calibration", default=None,
+                        help="JSON file with per-camera [scale, offset] per axis and optional axis weights")
+    args = parser.parse_args()
+
+    specs = [parse_source(spec) for spec in args.sources]
+    roles = {cam_id: role for cam_id, (_, role) in enumerate(specs)}
+    calibration = load_calibration(args.calibration)
+    progress_bus = ProgressPublisher("tracker")
+    stats = TrackerStats(["fuse", "publish"])
+
+    results = multiprocessing.Queue(maxsize=8 * len(specs))
+    stop_event = multiprocessing.Event()
+    workers = []
+    for cam_id, (source, role) in enumerate(specs):
+        worker = multiprocessing.Process(target=camera_worker, name=f"camera-{cam_id}", daemon=True,
+                                         args=(cam_id, source, results, stop_event, 2, not args.full_frame,
+                                               not args.no_idle))
+        worker.start()
+        workers.append(worker)
+        print(f"Camera {cam_id}: {source} ({role})")
+
+    Path(OUTPUT_JSON).parent.mkdir(parents=True, exist_ok=True)
+    progress_bus.stage_started("tracking", sources=len(specs))
+    estimates = {}
+    frames = {cam_id: 0 for cam_id in roles}
+    running = set(roles)
+    last_publish = 0.0
+    next_summary = time.time() + SUMMARY_INTERVAL
+    try:
+        while running:
+            try:
+                cam_id, frame_id, timestamp, found = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if frame_id is None:
+                print(f"Camera {cam_id} stopped")
+                running.discard(cam_id)
+                estimates.pop(cam_id, None)
+                continue
+            estimates[cam_id] = (timestamp, found)
+            frames[cam_id] += 1
+
+            now = time.time()
+            if now - last_publish >= MIN_PUBLISH_INTERVAL:
+                with stats.timed("fuse"):
+                    data = fuse(estimates, roles, now, calibration=calibration)
+                with stats.timed("publish"):
+                    write_text_atomic(OUTPUT_JSON, json.dumps(data))
+                stats.frame_done()
+                last_publish = now
+
+            if now >= next_summary:
+                per_camera = " ".join(f"cam{c}={n / SUMMARY_INTERVAL:.1f}" for c, n in frames.items())
+                print(f"{stats.summary_line()} | {per_camera} fps")
+                frames = {c: 0 for c in frames}
+                next_summary = now + SUMMARY_INTERVAL
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                worker.terminate()
+        progress_bus.stage_finished("tracking")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
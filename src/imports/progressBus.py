@@ -0,0 +1,292 @@
+import os
+import json
+import time
+import queue
+import atexit
+import socket
+import logging
+import selectors
+import threading
+from typing import Callable, Optional
+
+# Local endpoint of the progress bus (hosted by the UI)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("VIBE_PROGRESS_PORT", "8766"))
+
+# Event types
+STAGE_STARTED = "stage_started"
+STAGE_FINISHED = "stage_finished"
+PROGRESS = "progress"
+NODE_EXECUTING = "node_executing"
+ARTIFACT_READY = "artifact_ready"
+ERROR = "error"
+JOB_FINISHED = "job_finished"
+
+SUBSCRIBE_MESSAGE = b'{"op": "subscribe"}\n'
+RECONNECT_INTERVAL = 2.0
+
+
+def _encode(event: dict) -> bytes:
+    return json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class ProgressPublisher:
+    """Fire-and-forget publisher of typed progress events.
+
+    ``publish`` never blocks: events go into a bounded queue (oldest
+    dropped when full) and a daemon thread sends them as JSON lines. When
+    no bus is listening events are discarded, so publishing is safe from
+    Blender's main thread or a tight capture loop.
+    """
+
+    def __init__(self, source: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_queue: int = 256, job: Optional[str] = None):
+        self.source = source
+        self.host = host
+        self.port = port
+        # Jobs started by the UI pass their id through the environment
+        self.job = job or os.environ.get("VIBE_PROGRESS_JOB")
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._sock = None
+        self._next_attempt = 0.0
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def publish(self, event_type: str, **fields):
+        """Queue an event; fields such as stage, percent, node, path, message"""
+        event = {"type": event_type, "source": self.source, "ts": time.time()}
+        if self.job and "job" not in fields:
+            event["job"] = self.job
+        event.update({k: v for k, v in fields.items() if v is not None})
+
+        self._ensure_thread()
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    pass
+
+    def stage_started(self, stage: str, **fields):
+        self.publish(STAGE_STARTED, stage=stage, **fields)
+
+    def stage_finished(self, stage: str, success: bool = True, **fields):
+        self.publish(STAGE_FINISHED, stage=stage, success=success, **fields)
+
+    def progress(self, stage: str, percent: float = None, **fields):
+        self.publish(PROGRESS, stage=stage, percent=percent, **fields)
+
+    def node_executing(self, node, **fields):
+        self.publish(NODE_EXECUTING, node=node, **fields)
+
+    def artifact_ready(self, path: str, **fields):
+        self.publish(ARTIFACT_READY, path=path, **fields)
+
+    def error(self, message: str, **fields):
+        self.publish(ERROR, message=message, **fields)
+
+    def job_finished(self, success: bool, message: str = "", **fields):
+        self.publish(JOB_FINISHED, success=success, message=message, **fields)
+
+    def flush(self, timeout: float = 1.0):
+        """Wait (up to timeout) for queued events to be sent or dropped"""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"progress-{self.source}", daemon=True)
+                self._thread.start()
+                # Short-lived scripts exit right after their last event
+                atexit.register(self.flush)
+
+    def _connect(self) -> bool:
+        if self._sock is not None:
+            return True
+        if time.time() < self._next_attempt:
+            return False
+        try:
+            self._sock = socket.create_connection((self.host, self.port), timeout=0.5)
+            self._sock.settimeout(1.0)
+            return True
+        except OSError:
+            self._next_attempt = time.time() + RECONNECT_INTERVAL
+            return False
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if self._connect():
+                    self._sock.sendall(_encode(event))
+            except OSError:
+                try:
+                    self._sock.close()
+                except OSError:
+                    pass
+                self._sock = None
+                self._next_attempt = time.time() + RECONNECT_INTERVAL
+            finally:
+                self._queue.task_done()
+
+
+class ProgressBroker:
+    """In-process hub of the progress bus.
+
+    Publishers connect and write JSON lines; connections that first send
+    ``{"op": "subscribe"}`` receive every event. Local listeners are
+    called on the broker thread, so a Qt UI should forward them through a
+    signal.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._listeners = []
+        self._selector = None
+        self._server = None
+        self._buffers = {}
+        self._subscribers = set()
+        self._running = False
+        self._thread = None
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        self._listeners.append(listener)
+
+    def start(self) -> bool:
+        """Bind and start serving; False if the port is already taken"""
+        try:
+            self._server = socket.create_server((self.host, self.port))
+        except OSError as e:
+            logging.warning(f"Progress bus port {self.port} unavailable: {e}")
+            return False
+        self._server.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="progress-broker", daemon=True)
+        self._thread.start()
+        logging.info(f"Progress bus listening on {self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        while self._running:
+            for key, _ in self._selector.select(timeout=0.2):
+                if key.fileobj is self._server:
+                    self._accept()
+                else:
+                    self._read(key.fileobj)
+        for conn in list(self._buffers):
+            self._drop(conn)
+        self._selector.close()
+        self._server.close()
+
+    def _accept(self):
+        try:
+            conn, _ = self._server.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        self._buffers[conn] = b""
+        self._selector.register(conn, selectors.EVENT_READ)
+
+    def _drop(self, conn):
+        self._subscribers.discard(conn)
+        self._buffers.pop(conn, None)
+        try:
+            self._selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        conn.close()
+
+    def _read(self, conn):
+        try:
+            data = conn.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(conn)
+            return
+
+        *lines, rest = (self._buffers[conn] + data).split(b"\n")
+        self._buffers[conn] = rest
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("op") == "subscribe":
+                self._subscribers.add(conn)
+                continue
+            self._dispatch(event, line + b"\n")
+
+    def _dispatch(self, event: dict, raw: bytes):
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logging.error(f"Progress listener failed: {e}")
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.sendall(raw)
+            except OSError:
+                # Too slow or gone; it can reconnect and subscribe again
+                self._drop(subscriber)
+
+
+class ProgressSubscriber:
+    """Receive bus events from a broker hosted by another process"""
+
+    def __init__(self, on_event: Callable[[dict], None], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.on_event = on_event
+        self.host = host
+        self.port = port
+        self.connected = False
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="progress-subscriber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    def _run(self):
+        while self._running:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=1.0) as sock:
+                    sock.sendall(SUBSCRIBE_MESSAGE)
+                    sock.settimeout(None)
+                    self.connected = True
+                    with sock.makefile("rb") as stream:
+                        for line in stream:
+                            if not self._running:
+                                break
+                            try:
+                                self.on_event(json.loads(line))
+                            except ValueError:
+                                continue
+            except OSError:
+                pass
+            self.connected = False
+            time.sleep(RECONNECT_INTERVAL)
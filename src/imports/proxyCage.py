@@ -0,0 +1,178 @@
+"""Coarse cage standing in for a dense mesh while it is being deformed.
+
+Generated meshes have far more vertices than hand deformation can use.
+The cage is a vertex-clustered copy of the mesh (one vertex per occupied
+grid cell, at the mean of the vertices in it), and every dense vertex is
+bound to the closest cage triangle around its own cluster with three
+barycentric weights. The deformer then only ever touches the cage, and
+``transfer`` carries the accumulated cage displacement over to the dense
+coordinates in one gather when the caller decides it is time (at a lower
+rate than the deformation, or when the hands stop).
+
+Like meshKernel, nothing here imports bpy.
+"""
+import numpy as np
+
+from meshKernel import read_coords, read_triangles, volume_sum, kernel_pool, _gather
+
+# Cage size aimed for; meshes much smaller than this are not worth a cage
+CAGE_VERTICES = 3000
+
+
+def cluster_vertices(coords: np.ndarray, cell_size: float):
+    """Label every vertex with its grid cell; returns (labels, cell count)"""
+    cells = np.floor((coords - coords.min(axis=0)) / cell_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    _, labels = np.unique(keys, return_inverse=True)
+    labels = labels.reshape(-1)
+    return labels, int(labels.max()) + 1 if len(labels) else 0
+
+
+def cluster_means(coords: np.ndarray, labels: np.ndarray, count: int) -> np.ndarray:
+    """Mean position of the vertices of every cluster, (count, 3) float32"""
+    sizes = np.maximum(np.bincount(labels, minlength=count), 1)
+    return np.stack([np.bincount(labels, coords[:, k], minlength=count) / sizes
+                     for k in range(3)], axis=1).astype(np.float32)
+
+
+def collapse_triangles(triangles: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Map triangles onto clusters, dropping degenerate and duplicate ones.
+
+    Duplicates are compared with their winding, so two opposite faces that
+    collapse onto each other both stay and still cancel out in the volume.
+    """
+    cage = labels[triangles]
+    cage = cage[(cage[:, 0] != cage[:, 1]) & (cage[:, 1] != cage[:, 2]) & (cage[:, 0] != cage[:, 2])]
+    # Rotate each triangle so its smallest index comes first (keeps the winding)
+    first = cage.argmin(axis=1)
+    cage = cage[np.arange(len(cage))[:, None], (first[:, None] + np.arange(3)) % 3]
+    return np.unique(cage, axis=0).astype(np.int32)
+
+
+def closest_barycentric(points: np.ndarray, corners: np.ndarray):
+    """Barycentric weights of the point of each triangle nearest to each point (approximately:
+    the plane projection, clamped into the triangle) and the distance to it"""
+    a = corners[:, 0]
+    v0 = corners[:, 1] - a
+    v1 = corners[:, 2] - a
+    v2 = points - a
+    d00 = np.einsum("ij,ij->i", v0, v0)
+    d01 = np.einsum("ij,ij->i", v0, v1)
+    d11 = np.einsum("ij,ij->i", v1, v1)
+    d20 = np.einsum("ij,ij->i", v2, v0)
+    d21 = np.einsum("ij,ij->i", v2, v1)
+    denom = d00 * d11 - d01 * d01
+    valid = denom > 1e-20
+    denom = np.where(valid, denom, 1.0)
+    weights = np.empty((len(points), 3))
+    weights[:, 1] = np.where(valid, (d11 * d20 - d01 * d21) / denom, 0.0)
+    weights[:, 2] = np.where(valid, (d00 * d21 - d01 * d20) / denom, 0.0)
+    weights[:, 0] = 1.0 - weights[:, 1] - weights[:, 2]
+    np.maximum(weights, 0.0, out=weights)
+    weights /= weights.sum(axis=1, keepdims=True)
+    nearest = np.einsum("ij,ijk->ik", weights, corners)
+    return weights, np.linalg.norm(points - nearest, axis=1)
+
+
+class ProxyCage:
+    """Cage of one dense mesh plus the binding of the dense vertices to it.
+
+    ``coords`` and ``dense`` are the rest states both were last in sync at;
+    ``transfer(cage)`` returns the dense coordinates for a deformed cage and
+    ``rebase`` makes that the new rest state.
+    """
+
+    def __init__(self, coords: np.ndarray, triangles: np.ndarray, cage_vertices: int = CAGE_VERTICES):
+        self.key = None
+        self.pending = False
+        self.last_transfer = 0.0
+        self.dense = np.array(coords, dtype=np.float32)
+        self.labels, count = cluster_vertices(self.dense, self._cell_size(self.dense, triangles, cage_vertices))
+        self.coords = cluster_means(self.dense, self.labels, count)
+        self.triangles = collapse_triangles(triangles, self.labels)
+        self.indices, self.weights = self._bind(triangles)
+        dense_volume = volume_sum(self.dense, triangles)
+        cage_volume = volume_sum(self.coords, self.triangles)
+        # Cage volume per unit of dense volume, to translate volume limits
+        self.volume_ratio = cage_volume / dense_volume if abs(dense_volume) > 1e-12 else 1.0
+
+    @classmethod
+    def from_mesh(cls, mesh, cage_vertices: int = CAGE_VERTICES):
+        cage = cls(read_coords(mesh), read_triangles(mesh), cage_vertices)
+        cage.key = cls.mesh_key(mesh)
+        return cage
+
+    @staticmethod
+    def mesh_key(mesh) -> tuple:
+        return (mesh.as_pointer(), len(mesh.vertices), len(mesh.edges), len(mesh.polygons))
+
+    def owns(self, mesh) -> bool:
+        """Whether mesh is the (unchanged) dense mesh this cage was built for"""
+        return self.key is not None and self.key == self.mesh_key(mesh)
+
+    @staticmethod
+    def _cell_size(coords: np.ndarray, triangles: np.ndarray, cage_vertices: int) -> float:
+        # A surface of area A clustered with cell size s occupies about A / s^2 cells
+        corners = coords[triangles.ravel()].astype(np.float64).reshape(-1, 3, 3)
+        area = 0.5 * np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1).sum()
+        if area <= 0.0:
+            area = float(np.square(coords.max(axis=0) - coords.min(axis=0)).sum())
+        return max(np.sqrt(area / max(cage_vertices, 1)), 1e-6)
+
+    def _bind(self, triangles: np.ndarray):
+        """Three cage vertices and barycentric weights for every dense vertex"""
+        count = len(self.dense)
+        indices = np.repeat(self.labels[:, None], 3, axis=1).astype(np.int32)
+        weights = np.zeros((count, 3), dtype=np.float32)
+        weights[:, 0] = 1.0
+        if not len(self.triangles):
+            return indices, weights
+        # Cage triangles around every cage vertex (CSR)
+        corners = self.triangles.ravel()
+        triangle_of = (np.argsort(corners, kind="stable") // 3).astype(np.int64)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(corners, minlength=len(self.coords)))])
+        cage = self.coords.astype(np.float64)
+
+        def bind(start, end):
+            # Chunks write disjoint rows, so they can run side by side
+            rows = np.arange(start, end)
+            owner, candidates = _gather(indptr, triangle_of, self.labels[rows])
+            if not len(owner):
+                return
+            tris = self.triangles[candidates]
+            pair_weights, distances = closest_barycentric(self.dense[rows[owner]].astype(np.float64), cage[tris])
+            # Nearest candidate per dense vertex: first entry of each owner after sorting by distance
+            order = np.lexsort((distances, owner))
+            first = order[np.flatnonzero(np.diff(owner[order], prepend=-1))]
+            indices[rows[owner[first]]] = tris[first]
+            weights[rows[owner[first]]] = pair_weights[first]
+
+        kernel_pool.map(bind, count)
+        return indices, weights
+
+    def transfer(self, cage: np.ndarray) -> np.ndarray:
+        """Dense coordinates following the cage from its rest state to cage"""
+        offsets = np.subtract(cage, self.coords, dtype=np.float32)
+        dense = np.empty_like(self.dense)
+
+        def follow(start, end):
+            np.einsum("ij,ijk->ik", self.weights[start:end], offsets[self.indices[start:end]], out=dense[start:end])
+            dense[start:end] += self.dense[start:end]
+
+        kernel_pool.map(follow, len(self.dense))
+        return dense
+
+    def rebase(self, dense: np.ndarray, cage: np.ndarray):
+        """Take dense and cage (in sync with each other) as the new rest state"""
+        self.dense = np.array(dense, dtype=np.float32)
+        self.coords = np.array(cage, dtype=np.float32)
+        self.pending = False
+
+    def refit(self, dense: np.ndarray) -> np.ndarray:
+        """Rebuild the cage positions after the dense mesh was changed directly
+        (undo, applied scale, rotation); the binding still holds. Returns the cage."""
+        self.dense = np.array(dense, dtype=np.float32)
+        self.coords = cluster_means(self.dense, self.labels, len(self.coords))
+        self.pending = False
+        return self.coords
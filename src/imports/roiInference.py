@@ -0,0 +1,163 @@
+import cv2
+
+# Side (px) of the square crop MediaPipe sees while a hand is tracked
+ROI_SIZE = 256
+# Longest side (px) of the downsampled frame used for full-frame searches
+SEARCH_SIZE = 640
+# Padding around the landmark bounding box, as a fraction of its larger side
+ROI_PADDING = 0.6
+# While fewer hands than max_hands are tracked, search the full frame this often
+SEARCH_INTERVAL = 15
+# The crop window stays put until the hands come this close to its edge (fraction of its side)
+EDGE_MARGIN = 0.1
+
+
+class RoiHandTracker:
+    """Run MediaPipe Hands on a small crop around the hands seen last frame.
+
+    While tracking, the model input is a square, padded window around the
+    previous landmarks resized to ROI_SIZE, so inference cost no longer
+    depends on the camera resolution. When tracking is lost (or now and
+    then, to pick up a second hand) the whole frame is searched at
+    SEARCH_SIZE instead. Landmarks are mapped back to normalised
+    coordinates of the full frame, so callers see the same results as
+    with ``hands.process`` on the full image.
+
+    Full frames go to ``hands`` and crops to ``crop_hands``, a second
+    video-mode instance, so each graph only ever sees one kind of input and
+    keeps tracking (no palm detection) between frames. The crop window is
+    held still while the hands stay clear of its edges and only moved or
+    resized when they near one, so the crop graph sees the hands move the
+    way they really do. Without ``crop_hands`` every frame is searched in full.
+
+    Use either ``detect(frame)`` or ``prepare(frame)`` followed by
+    ``process(image)`` (to time conversion and inference separately).
+    Frames are BGR, as read from OpenCV.
+    """
+
+    def __init__(self, hands, max_hands: int = 2, roi_size: int = ROI_SIZE, search_size: int = SEARCH_SIZE,
+                 padding: float = ROI_PADDING, search_interval: int = SEARCH_INTERVAL, enabled: bool = True,
+                 crop_hands=None, edge_margin: float = EDGE_MARGIN):
+        self.hands = hands
+        self.crop_hands = crop_hands
+        self.max_hands = max_hands
+        self.roi_size = roi_size
+        self.search_size = search_size
+        self.padding = padding
+        self.search_interval = search_interval
+        self.edge_margin = edge_margin
+        self.enabled = enabled and crop_hands is not None
+        self.mode = "full"
+        self._boxes = []        # Pixel bounding boxes of the hands found last frame
+        self._since_search = 0
+        self._frame = None
+        self._window = None
+        self._held = None       # Crop window kept while the hands stay inside it
+        self._shape = None
+
+    def reset(self):
+        self._boxes = []
+        self._held = None
+
+    def detect(self, frame):
+        return self.process(self.prepare(frame))
+
+    def prepare(self, frame):
+        """Crop/downsample frame and convert it to the RGB model input"""
+        if frame.shape[:2] != self._shape:
+            # Camera resolution changed, old pixel boxes are meaningless
+            self._shape = frame.shape[:2]
+            self._boxes = []
+            self._held = None
+        self._frame = frame
+        self._window = self._roi_window(frame.shape[1], frame.shape[0])
+        self.mode = "roi" if self._window else "full"
+        return self._model_input(frame, self._window)
+
+    def process(self, image):
+        """Run the model on a prepared image (one inference per frame; hands lost
+        from the crop are searched for in the full frame on the next one)"""
+        frame, window = self._frame, self._window
+        results = (self.crop_hands if window else self.hands).process(image)
+
+        height, width = frame.shape[:2]
+        self._remap(results, window, width, height)
+        found = len(results.multi_hand_landmarks) if results.multi_hand_landmarks else 0
+        if window is None:
+            self._since_search = 0
+        elif found < len(self._boxes):
+            # A hand left the crop: look for it in the full frame next time
+            self._since_search = self.search_interval
+        else:
+            self._since_search += 1
+        self._boxes = self._bounding_boxes(results, width, height)
+        self._frame = None
+        return results
+
+    def _roi_window(self, width, height):
+        """Square (x0, y0, side) around the previous hands, or None for a full search"""
+        if not self.enabled or not self._boxes or (
+                len(self._boxes) < self.max_hands and self._since_search >= self.search_interval):
+            self._held = None
+            return None
+
+        x0 = min(box[0] for box in self._boxes)
+        y0 = min(box[1] for box in self._boxes)
+        x1 = max(box[2] for box in self._boxes)
+        y1 = max(box[3] for box in self._boxes)
+        side = int(max(x1 - x0, y1 - y0) * (1.0 + 2.0 * self.padding))
+        if side >= min(width, height):
+            self._held = None
+            return None  # Hands fill the frame, a crop would not help
+
+        if self._held:
+            # Keep the window while the hands are clear of its edges and not much smaller than it
+            left, top, held_side = self._held
+            margin = held_side * self.edge_margin
+            if (held_side / 2 <= side <= held_side and x0 >= left + margin and y0 >= top + margin
+                    and x1 <= left + held_side - margin and y1 <= top + held_side - margin):
+                return self._held
+
+        # Centre the square on the hands, shifted (not clipped) to stay inside the frame
+        cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+        left = int(min(max(cx - side / 2.0, 0), width - side))
+        top = int(min(max(cy - side / 2.0, 0), height - side))
+        self._held = (left, top, side)
+        return self._held
+
+    def _model_input(self, frame, window):
+        if window:
+            left, top, side = window
+            crop = frame[top:top + side, left:left + side]
+            interpolation = cv2.INTER_AREA if side > self.roi_size else cv2.INTER_LINEAR
+            crop = cv2.resize(crop, (self.roi_size, self.roi_size), interpolation=interpolation)
+        else:
+            height, width = frame.shape[:2]
+            scale = self.search_size / float(max(width, height))
+            if scale < 1.0:
+                crop = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+            else:
+                crop = frame
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+
+    @staticmethod
+    def _remap(results, window, width, height):
+        """Convert crop-normalised landmarks to full-frame normalised ones in place"""
+        if not window or not results.multi_hand_landmarks:
+            return
+        left, top, side = window
+        for hand in results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = (left + lm.x * side) / width
+                lm.y = (top + lm.y * side) / height
+                # z shares the x scale (relative to image width)
+                lm.z = lm.z * side / width
+
+    @staticmethod
+    def _bounding_boxes(results, width, height):
+        boxes = []
+        for hand in results.multi_hand_landmarks or []:
+            xs = [lm.x * width for lm in hand.landmark]
+            ys = [lm.y * height for lm in hand.landmark]
+            boxes.append((min(xs), min(ys), max(xs), max(ys)))
+        return boxes
@@ -0,0 +1,181 @@
+"""Record the hand-tracking stream to a file and replay it.
+
+Recordings are gzip-compressed JSON lines: a header line, then one
+``{"t": seconds_since_start, "data": payload}`` line per frame, where
+payload is exactly what the tracker wrote to live_hand_data.json
+(fingertips, anchors, command, gesture fields, timestamp, ...).
+
+The replayer writes the frames back to live_hand_data.json, so the Blender
+consumers (update_finger_orbs, REALTIME_OT_update_mesh) cannot tell a
+replay from a live session. Usage:
+
+    python sessionRecorder.py record session.jsonl.gz [--duration 30]
+    python sessionRecorder.py replay session.jsonl.gz [--speed 2 | --fast] [--loop]
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+from pathlib import Path
+
+from ioExecutor import write_text_atomic
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+LIVE_DATA_FILE = str(BASE_DIR / "output" / "live_hand_data.json")
+
+SESSION_FORMAT = "vibe-hand-session"
+SESSION_VERSION = 1
+POLL_INTERVAL = 0.005  # Seconds between checks of the live file while recording
+
+
+class SessionRecorder:
+    """Append tracker payloads to a compressed session file.
+
+    Extra keyword arguments (e.g. the source video) are stored in the header.
+    """
+
+    def __init__(self, path: str, **metadata):
+        self.path = path
+        self.frames = 0
+        self._start = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        header = dict(metadata, format=SESSION_FORMAT, version=SESSION_VERSION, created=time.time())
+        self._file.write(json.dumps(header) + "\n")
+
+    def record(self, data: dict, t: float = None):
+        """Store one payload; t defaults to its capture timestamp (or now)"""
+        if t is None:
+            t = data.get("timestamp") or time.time()
+        if self._start is None:
+            self._start = t
+        line = {"t": round(t - self._start, 6), "data": data}
+        self._file.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self.frames += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_session(path: str):
+    """Yield (t, payload) for every frame of a recording"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != SESSION_FORMAT:
+            raise ValueError(f"{path} is not a hand-tracking session")
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                frame = json.loads(line)
+            except ValueError:
+                break  # Truncated by an interrupted recording
+            yield frame["t"], frame["data"]
+
+
+def record_live_file(path: str, source: str = LIVE_DATA_FILE, duration: float = None):
+    """Record every new version of the live JSON file until Ctrl+C or duration"""
+    last_text = None
+    end = time.time() + duration if duration else None
+    with SessionRecorder(path) as recorder:
+        print(f"Recording {source} to {path} (Ctrl+C to stop)")
+        try:
+            while end is None or time.time() < end:
+                try:
+                    with open(source, "r") as f:
+                        text = f.read()
+                except OSError:
+                    text = None
+                if text and text != last_text:
+                    last_text = text
+                    try:
+                        data = json.loads(text)
+                    except ValueError:
+                        data = None  # Caught mid-write, next poll gets it
+                    if data is not None:
+                        recorder.record(data, data.get("timestamp") or time.time())
+                time.sleep(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+        print(f"Recorded {recorder.frames} frames")
+
+
+class SessionReplayer:
+    """Feed a recording into the live data file.
+
+    speed 1.0 replays in real time, N replays N times faster, and 0 (or
+    None) writes frames back to back as fast as possible. Timestamps are
+    rewritten to the replay clock so latency prediction in the consumers
+    behaves as it would live.
+    """
+
+    def __init__(self, path: str, output: str = LIVE_DATA_FILE, speed: float = 1.0):
+        self.path = path
+        self.output = output
+        self.speed = speed
+
+    def frames(self):
+        return read_session(self.path)
+
+    def run(self, loop: bool = False, on_frame=None) -> int:
+        """Replay (optionally forever) and return the number of frames written"""
+        os.makedirs(os.path.dirname(self.output), exist_ok=True)
+        written = 0
+        while True:
+            start = time.perf_counter()
+            for t, data in self.frames():
+                if self.speed:
+                    delay = start + t / self.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                data = dict(data, timestamp=time.time(), replay=True)
+                write_text_atomic(self.output, json.dumps(data))
+                written += 1
+                if on_frame:
+                    on_frame(t, data)
+            if not loop:
+                return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay hand-tracking sessions")
+    sub = parser.add_subparsers(dest="action", required=True)
+    rec = sub.add_parser("record", help="record the live hand data file")
+    rec.add_argument("session")
+    rec.add_argument("--source", default=LIVE_DATA_FILE)
+    rec.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    rep = sub.add_parser("replay", help="replay a session into the live hand data file")
+    rep.add_argument("session")
+    rep.add_argument("--output", default=LIVE_DATA_FILE)
+    rep.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier")
+    rep.add_argument("--fast", action="store_true", help="replay as fast as possible")
+    rep.add_argument("--loop", action="store_true")
+    args = parser.parse_args()
+
+    if args.action == "record":
+        record_live_file(args.session, args.source, args.duration)
+        return 0
+
+    replayer = SessionReplayer(args.session, args.output, 0 if args.fast else args.speed)
+    start = time.perf_counter()
+    try:
+        written = replayer.run(loop=args.loop)
+    except KeyboardInterrupt:
+        return 0
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {written} frames in {elapsed:.2f}s ({written / max(elapsed, 1e-6):.1f} fps)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
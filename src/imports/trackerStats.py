@@ -0,0 +1,90 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# Samples kept per stage (a few seconds at camera rate)
+WINDOW_SIZE = 300
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class TrackerStats:
+    """Rolling per-stage timings, frame rate and drop counters.
+
+    Stages record durations from any thread; the summary is computed over
+    the last WINDOW_SIZE samples of each stage and the drops since the
+    previous summary.
+    """
+
+    def __init__(self, stages, window: int = WINDOW_SIZE):
+        self.stages = list(stages)
+        self._samples = {stage: deque(maxlen=window) for stage in self.stages}
+        self._frames = deque(maxlen=window)
+        self._drops = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self._frames.maxlen)
+                self.stages.append(stage)
+            samples.append(seconds)
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def frame_done(self):
+        """Mark one frame as fully published (drives the fps figure)"""
+        with self._lock:
+            self._frames.append(time.perf_counter())
+
+    def drop(self, stage: str, count: int = 1):
+        with self._lock:
+            self._drops[stage] = self._drops.get(stage, 0) + count
+
+    def fps(self) -> float:
+        with self._lock:
+            if len(self._frames) < 2:
+                return 0.0
+            span = self._frames[-1] - self._frames[0]
+            return (len(self._frames) - 1) / span if span > 0 else 0.0
+
+    def snapshot(self) -> dict:
+        """Return {stage: (p50_ms, p95_ms)} for every stage with samples"""
+        with self._lock:
+            samples = {stage: sorted(self._samples[stage]) for stage in self.stages if self._samples[stage]}
+        return {stage: (percentile(values, 0.5) * 1000.0, percentile(values, 0.95) * 1000.0)
+                for stage, values in samples.items()}
+
+    def take_drops(self) -> dict:
+        """Return and reset the drop counters"""
+        with self._lock:
+            drops, self._drops = self._drops, {}
+        return drops
+
+    def summary_line(self) -> str:
+        """One line: fps, p50/p95 per stage in ms, drops since the last summary"""
+        parts = [f"fps {self.fps():5.1f}"]
+        parts += [f"{stage} {p50:.1f}/{p95:.1f}" for stage, (p50, p95) in self.snapshot().items()]
+        drops = self.take_drops()
+        parts.append("drops " + (" ".join(f"{stage}={count}" for stage, count in drops.items()) if drops else "0"))
+        return " | ".join(parts) + "  (ms p50/p95)"
+
+    def overlay_lines(self) -> list:
+        """Short lines for drawing onto the debug window"""
+        lines = [f"FPS {self.fps():.1f}"]
+        lines += [f"{stage:<10}{p50:6.1f} {p95:6.1f} ms" for stage, (p50, p95) in self.snapshot().items()]
+        return lines
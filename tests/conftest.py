@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The add-on modules are imported by bare name, as blenderMain does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "imports"))
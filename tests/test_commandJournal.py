@@ -0,0 +1,111 @@
+import json
+
+import commandJournal
+from commandJournal import CommandJournal, JournalReader
+
+
+def _journal(tmp_path):
+    return CommandJournal(str(tmp_path / "journal" / "commands.jsonl"))
+
+
+def _consume(reader, count=None):
+    records = reader.pending()[:count]
+    for record in records:
+        reader.commit(record)
+    return [record["seq"] for record in records]
+
+
+def test_compaction_keeps_offsets_of_both_readers(tmp_path, monkeypatch):
+    monkeypatch.setattr(commandJournal, "COMPACT_BYTES", 1)
+    journal = _journal(tmp_path)
+    blender = JournalReader(journal, "blender")
+    ui = JournalReader(journal, "ui")
+    for i in range(10):
+        journal.append("tick", {"i": i}, key=f"k{i}")
+
+    assert _consume(blender, 6) == [1, 2, 3, 4, 5, 6]
+    assert _consume(ui, 3) == [1, 2, 3]
+    # The next append compacts up to the slower reader only
+    journal.append("tick", {"i": 10}, key="k10")
+
+    with open(journal.path, "rb") as f:
+        header = json.loads(f.readline())
+    assert header == {"base": ui.offset, "base_seq": 3}
+    assert journal.base_seq == 3
+    # Keys of dropped records (k0-k2) are forgotten, later ones still deduplicate
+    assert not journal.contains("k2")
+    assert journal.get("k3")["seq"] == 4 and journal.get("k10")["seq"] == 11
+
+    assert [r["seq"] for r in blender.pending()] == [7, 8, 9, 10, 11]
+    assert [r["seq"] for r in ui.pending()] == [4, 5, 6, 7, 8, 9, 10, 11]
+    assert [r["payload"]["i"] for r in ui.pending()][:2] == [3, 4]
+
+    # A fresh process sees the same logical offsets and keeps counting
+    reopened = _journal(tmp_path)
+    assert reopened.base_seq == 3 and reopened.last_seq == 11
+    assert [r["seq"] for r in JournalReader(reopened, "blender").pending()] == [7, 8, 9, 10, 11]
+    assert reopened.append("tick", key="k11")["seq"] == 12
+    assert _consume(JournalReader(reopened, "ui")) == [4, 5, 6, 7, 8, 9, 10, 11, 12]
+
+
+def test_compaction_waits_for_every_reader(tmp_path, monkeypatch):
+    monkeypatch.setattr(commandJournal, "COMPACT_BYTES", 1)
+    journal = _journal(tmp_path)
+    blender = JournalReader(journal, "blender")
+    ui = JournalReader(journal, "ui")
+    for i in range(3):
+        journal.append("tick", key=f"k{i}")
+    _consume(blender)
+    _consume(ui, 1)
+    journal.append("tick", key="k3")
+    assert journal.base_seq == 1 and not journal.contains("k0") and journal.contains("k1")
+
+
+def test_duplicate_key_retry_returns_stored_record(tmp_path):
+    journal = _journal(tmp_path)
+    first = journal.append("submit", {"prompt": "tower"}, key="retry")
+    size = journal.end_offset()
+
+    assert journal.append("submit", {"prompt": "changed"}, key="retry") == first
+    # Another process (or a restarted one) retrying the same command
+    assert _journal(tmp_path).append("submit", {"prompt": "tower"}, key="retry") == first
+    assert journal.end_offset() == size
+
+    batch = journal.append_batch([{"kind": "a", "key": "x"}, {"kind": "b", "key": "x"}, {"kind": "c", "key": "retry"}])
+    assert batch[0] is batch[1] and batch[0]["seq"] == 2 and batch[2] == first
+    assert [r["seq"] for r in JournalReader(journal, "blender").pending()] == [1, 2]
+
+
+def test_torn_final_line_is_repaired_by_next_append(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append("tick", key="k0")
+    with open(journal.path, "ab") as f:
+        f.write(b'{"seq":2,"key":"half')
+
+    records, end = journal.read_from(0)
+    assert [r["seq"] for r, _ in records] == [1]
+    assert end < journal.end_offset()
+    reader = JournalReader(journal, "blender")
+    assert _consume(reader) == [1]
+
+    record = journal.append("tick", key="k1")
+    assert record["seq"] == 2
+    assert [r["key"] for r in reader.pending()] == ["k1"]
+    assert [r["seq"] for r in JournalReader(_journal(tmp_path), "ui").pending()] == [1, 2]
+
+
+def test_reader_rereads_a_journal_that_shrank(tmp_path):
+    journal = _journal(tmp_path)
+    for i in range(3):
+        journal.append("tick", key=f"k{i}")
+    reader = JournalReader(journal, "blender")
+    _consume(reader)
+
+    # The journal was replaced by a shorter one (e.g. deleted and started over)
+    fresh_path = tmp_path / "fresh" / "commands.jsonl"
+    fresh = CommandJournal(str(fresh_path))
+    fresh.append("tick", key="new")
+    with open(fresh_path, "rb") as src, open(journal.path, "wb") as dst:
+        dst.write(src.read())
+
+    assert [r["key"] for r in JournalReader(journal, "blender").pending()] == ["new"]
@@ -0,0 +1,76 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from deformHistory import UNDO_TOLERANCE, UndoStack, VertexDelta  # noqa: E402
+
+
+def _edit(rng, count=2000, moved=300, scale=0.01):
+    before = rng.uniform(-2.0, 2.0, (count, 3)).astype(np.float32)
+    after = before.copy()
+    rows = rng.choice(count, moved, replace=False)
+    after[rows] += rng.normal(0.0, scale, (moved, 3)).astype(np.float32)
+    return before, after, rows
+
+
+def test_quantized_delta_round_trips_within_tolerance():
+    rng = np.random.default_rng(1)
+    before, after, rows = _edit(rng)
+    delta = VertexDelta("deform", before, after, ("m0",), ("m1",))
+    assert delta.step > 0.0 and delta.moved == len(rows)
+
+    coords = after.copy()
+    assert delta.undo(coords) == ("m0",)
+    assert np.abs(coords - before).max() <= UNDO_TOLERANCE
+    unmoved = np.setdiff1d(np.arange(len(before)), rows)
+    assert np.array_equal(coords[unmoved], before[unmoved])
+
+    assert delta.redo(coords) == ("m1",)
+    assert np.abs(coords - after).max() <= UNDO_TOLERANCE
+    assert np.array_equal(coords[unmoved], after[unmoved])
+
+
+def test_large_offsets_are_stored_exactly():
+    rng = np.random.default_rng(2)
+    before, after, _ = _edit(rng, scale=1.0)
+    delta = VertexDelta("grab", before, after)
+    assert delta.step == 0.0
+
+    coords = after.copy()
+    delta.undo(coords)
+    np.testing.assert_allclose(coords, before, rtol=0, atol=1e-6)
+    delta.redo(coords)
+    np.testing.assert_allclose(coords, after, rtol=0, atol=1e-6)
+
+
+def test_repeated_undo_redo_does_not_drift():
+    rng = np.random.default_rng(3)
+    before, after, _ = _edit(rng)
+    delta = VertexDelta("deform", before, after)
+    coords = after.copy()
+    for _ in range(50):
+        delta.undo(coords)
+        delta.redo(coords)
+    assert np.abs(coords - after).max() <= UNDO_TOLERANCE
+
+
+def test_empty_delta_is_not_pushed():
+    coords = np.ones((10, 3), dtype=np.float32)
+    stack = UndoStack()
+    assert VertexDelta("noop", coords, coords.copy()).empty
+    assert not stack.push(VertexDelta("noop", coords, coords.copy()))
+    assert not stack.can_undo
+
+
+def test_push_drops_redo_and_budget_evicts_oldest():
+    rng = np.random.default_rng(4)
+    deltas = [VertexDelta(str(i), *_edit(rng)[:2]) for i in range(4)]
+    stack = UndoStack(memory_budget=deltas[0].nbytes * 2 + deltas[1].nbytes // 2)
+    for delta in deltas[:3]:
+        stack.push(delta)
+    assert [d.label for d in stack.undo_entries] == ["1", "2"]
+
+    assert stack.undo() is deltas[2] and stack.can_redo
+    stack.push(deltas[3])
+    assert not stack.can_redo
+    assert [d.label for d in stack.undo_entries][-1] == "3"
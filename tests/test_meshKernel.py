@@ -0,0 +1,169 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from meshKernel import MeshDeformer, kernel_pool  # noqa: E402
+
+RADIUS = 0.6
+STRENGTH = 1.5
+ANCHOR_MULTIPLIER = 3.0
+MAX_DISPLACEMENT = 0.1
+COHESION = 0.3
+TIMESTEP = 0.05
+
+
+class _Collection:
+    """Stand-in for a bpy_prop_collection holding one flat attribute"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def foreach_get(self, attr, out):
+        out[:] = self.data.ravel()
+
+    def foreach_set(self, attr, values):
+        self.data[:] = np.asarray(values).reshape(self.data.shape)
+
+
+class FakeMesh:
+    """The parts of a bpy.types.Mesh that meshKernel uses"""
+
+    def __init__(self, coords, edges, triangles):
+        self.vertices = _Collection(np.array(coords, dtype=np.float32))
+        self.edges = _Collection(np.array(edges, dtype=np.int32))
+        self.loop_triangles = _Collection(np.array(triangles, dtype=np.int32))
+        self.polygons = self.loop_triangles
+
+    def as_pointer(self):
+        return id(self)
+
+    def update(self):
+        pass
+
+
+def uv_sphere(rings=8, segments=12):
+    """Closed triangulated sphere plus one loose vertex (which has no edges)"""
+    coords = [(0.0, 0.0, 1.0)]
+    for ring in range(1, rings):
+        theta = math.pi * ring / rings
+        for seg in range(segments):
+            phi = 2.0 * math.pi * seg / segments
+            coords.append((math.sin(theta) * math.cos(phi), math.sin(theta) * math.sin(phi), math.cos(theta)))
+    coords.append((0.0, 0.0, -1.0))
+    bottom = len(coords) - 1
+    coords.append((1.3, 0.0, 0.0))
+
+    def at(ring, seg):
+        return 1 + (ring - 1) * segments + seg % segments
+
+    triangles = []
+    for seg in range(segments):
+        triangles.append((0, at(1, seg), at(1, seg + 1)))
+        triangles.append((bottom, at(rings - 1, seg + 1), at(rings - 1, seg)))
+        for ring in range(1, rings - 1):
+            a, b = at(ring, seg), at(ring, seg + 1)
+            c, d = at(ring + 1, seg + 1), at(ring + 1, seg)
+            triangles += [(a, d, c), (a, c, b)]
+    edges = sorted({tuple(sorted((t[i], t[(i + 1) % 3]))) for t in triangles for i in range(3)})
+    return coords, edges, triangles
+
+
+def world_matrix():
+    angle = 0.4
+    rotation = np.array([[math.cos(angle), -math.sin(angle), 0.0],
+                         [math.sin(angle), math.cos(angle), 0.0],
+                         [0.0, 0.0, 1.0]])
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation @ np.diag([1.5, 0.8, 1.2])
+    matrix[:3, 3] = (0.3, -0.2, 0.5)
+    return matrix
+
+
+def old_deform(coords, edges, matrix, finger_points, anchor_points):
+    """The per-vertex loop the operator ran before meshKernel, in plain Python"""
+    def smooth_falloff(distance, radius):
+        if distance >= radius:
+            return 0.0
+        return (1.0 - (distance / radius) ** 2) ** 2
+
+    def pull(v_world, targets, radius, strength, total):
+        for target in targets:
+            to_target = np.asarray(target) - v_world
+            dist = np.linalg.norm(to_target)
+            if dist < radius and dist > 0.0:
+                total = total + to_target / dist * smooth_falloff(dist, radius) * strength
+        return total
+
+    neighbours = {i: [] for i in range(len(coords))}
+    for a, b in edges:
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+    inverse = np.linalg.inv(matrix)
+    world = [matrix[:3, :3] @ co + matrix[:3, 3] for co in np.asarray(coords, dtype=np.float64)]
+
+    displacements = []
+    for v_world in world:
+        net = pull(v_world, finger_points, RADIUS, STRENGTH, np.zeros(3))
+        net = pull(v_world, anchor_points, RADIUS * 1.2, STRENGTH * ANCHOR_MULTIPLIER, net)
+        length = np.linalg.norm(net)
+        if length > 0.0001:
+            displacements.append(net / length * MAX_DISPLACEMENT if length > MAX_DISPLACEMENT else net)
+        else:
+            displacements.append(np.zeros(3))
+
+    result = []
+    for i, v_world in enumerate(world):
+        own = displacements[i]
+        if neighbours[i]:
+            average = sum(displacements[n] for n in neighbours[i]) / len(neighbours[i])
+            own = own + (average - own) * COHESION
+        moved = v_world + own * TIMESTEP
+        result.append(inverse[:3, :3] @ moved + inverse[:3, 3])
+    return np.array(result)
+
+
+@pytest.fixture(params=[(1, 65536), (3, 7)], ids=["single", "chunked"])
+def pool(request):
+    threads, chunk = kernel_pool.threads, kernel_pool.chunk
+    kernel_pool.configure(*request.param)
+    yield kernel_pool
+    kernel_pool.configure(threads, chunk)
+
+
+def test_deform_matches_per_vertex_loop(pool):
+    coords, edges, triangles = uv_sphere()
+    mesh = FakeMesh(coords, edges, triangles)
+    matrix = world_matrix()
+    deformer = MeshDeformer(radius=RADIUS, strength=STRENGTH, anchor_radius=RADIUS * 1.2,
+                            anchor_strength=STRENGTH * ANCHOR_MULTIPLIER, max_displacement=MAX_DISPLACEMENT,
+                            cohesion_factor=COHESION, timestep=TIMESTEP)
+    to_world = lambda co: tuple(matrix[:3, :3] @ np.asarray(co) + matrix[:3, 3])  # noqa: E731
+    # One finger on the sphere, one next to the loose vertex, an anchor on the far side
+    fingers = [to_world((0.2, 0.3, 1.1)), to_world((1.35, 0.05, 0.0))]
+    anchors = [to_world((-0.9, -0.2, -0.4))]
+
+    current = np.array(coords, dtype=np.float64)
+    for _ in range(5):
+        expected = old_deform(current, edges, matrix, fingers, anchors)
+        moved = deformer.deform(mesh, matrix, fingers, anchors)
+        changed = np.flatnonzero(np.any(np.abs(expected - current) > 1e-7, axis=1))
+        assert 0 < len(changed) <= moved < len(coords)
+        np.testing.assert_allclose(mesh.vertices.data, expected, rtol=0, atol=1e-5)
+        current = mesh.vertices.data.astype(np.float64)
+    # The loose vertex was pulled on its own, without any blending
+    assert not np.allclose(mesh.vertices.data[-1], coords[-1])
+
+
+def test_deform_outside_reach_leaves_mesh_alone(pool):
+    coords, edges, triangles = uv_sphere()
+    mesh = FakeMesh(coords, edges, triangles)
+    deformer = MeshDeformer(radius=RADIUS, strength=STRENGTH, anchor_radius=RADIUS * 1.2,
+                            anchor_strength=STRENGTH * ANCHOR_MULTIPLIER, max_displacement=MAX_DISPLACEMENT,
+                            cohesion_factor=COHESION, timestep=TIMESTEP)
+    assert deformer.deform(mesh, world_matrix(), [(10.0, 10.0, 10.0)], []) == 0
+    assert np.array_equal(mesh.vertices.data, np.array(coords, dtype=np.float32))